@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import os
 import sys
-import json
 import argparse
 from datetime import datetime
 from dotenv import load_dotenv
@@ -11,7 +10,11 @@ from nl_formatter.update_index import NewsletterIndexUpdater
 
 from nl_generator.newsletter_generator import NewsletterGenerator
 from nl_article_processor.article_group_processor import ArticleGroupProcessor
-from nl_article_processor.clustering_strategies import AgglomerativeClusteringStrategy
+from nl_article_processor.clustering_strategies import (
+    AgglomerativeClusteringStrategy,
+    KNNGraphClusteringStrategy,
+    OnlineClusteringStrategy
+)
 from nl_article_processor.similarity_strategies import (
     JaccardSimilarity,
     LSASimilarity,
@@ -26,6 +29,11 @@ from nl_sender.process_unsubscribes import SubscriberManager
 from nl_sender.send_newsletter import NewsletterSender
 
 from nl_utils.date_utils import get_yesterday_date
+from nl_utils.file_handler import FileHandler, FileType
+from nl_utils.llm_client import LLMClient
+from nl_utils.pipeline_context import PipelineContext
+from nl_utils.pipeline_runner import PipelineRunner, select_stages
+from nl_utils.stage import Stage
 from nl_utils.logger_config import setup_logger
 
 # Add src to Python path
@@ -39,7 +47,7 @@ load_dotenv()
 logger = setup_logger(name=__name__, configure_debug=False)
 
 # LSA similarity configuration
-lsa_similarity_params = {'n_components': 80}
+lsa_similarity_params = dict(LSASimilarity.DEFAULT_PARAMS)
 lsa_similarity_strategy = LSASimilarity(params=lsa_similarity_params)
 
 # Jaccard similarity configuration
@@ -89,122 +97,109 @@ similarity_strategies = {
     }
 }
 
+clustering_strategies = {
+    'agglomerative': AgglomerativeClusteringStrategy,
+    'knn_graph': KNNGraphClusteringStrategy,
+    'online': OnlineClusteringStrategy
+}
+
 
 def is_running_in_github_actions():
     """Checks if the script is likely running inside a GitHub Actions environment."""
     return 'GITHUB_ACTIONS' in os.environ
 
 
-def main():
-    """Main automation function."""
-    try:
-        # Set up argument parser
-        parser = argparse.ArgumentParser(description='Newsletter automation script')
-        parser.add_argument('--test', action='store_true', help='Run in test mode with all process flags set to false')
-        parser.add_argument('--date', type=str, help='Date to process (YYYY-MM-DD format)')
-        parser.add_argument('--verbose', action='store_true', help='Enable verbose logging')
-        parser.add_argument('--sources', nargs='+', default=['visir', 'mbl', 'vb', 'ruv'],
-                            help='News sources to scrape')
-        args = parser.parse_args()
-
-        # Control which processes run
-        if is_running_in_github_actions():
-            dev_mode_flag = False
-        else:
-            dev_mode_flag = True
-
-        if args.test:
-            yesterday = args.date if args.date else datetime.now().strftime('%Y-%m-%d')
-            process_flags = {
-                'unsubscribes': False,
-                'scraping': False,
-                'article_groups': False,
-                'total_generation': False,
-                'generation': False,
-                'matching': False,
-                'impacts': False,
-                'formatting': False,
-                'index_update': False,
-                'sending': False
-            }
-        elif dev_mode_flag:
-            yesterday = '2025-05-19'
-            process_flags = {
-                'unsubscribes': False,
-                'scraping': False,
-                'article_groups': False,
-                'total_generation': False,
-                'generation': False,
-                'matching': False,
-                'impacts': False,
-                'formatting': False,
-                'index_update': True,
-                'sending': False
-            }
-        else:
-            yesterday = get_yesterday_date()
-            process_flags = {
-                'unsubscribes': True,
-                'scraping': True,
-                'article_groups': True,
-                'total_generation': True,
-                'generation': True,
-                'matching': True,
-                'impacts': False,
-                'formatting': True,
-                'index_update': True,
-                'sending': True
-            }
+# Stages that contact subscribers, only run by default in GitHub Actions
+SUBSCRIBER_STAGES = ['unsubscribes', 'sending']
+
+# Stages run outside GitHub Actions when --only is not given
+DEV_STAGES = ['index_update']
+
+
+def require(result, message: str):
+    """Raise if a step returned no result, as the steps report failure with None."""
+    if not result:
+        raise RuntimeError(message)
+    return result
+
+
+def build_stages(date_str: str, sources: list, verbose: bool, dev_mode: bool,
+                 context: PipelineContext = None) -> list:
+    """Build the pipeline stages for a date.
+
+    Args:
+        date_str (str): Date string in YYYY-MM-DD format.
+        sources (list): News sources to scrape.
+        verbose (bool): Whether to enable verbose logging in the stages.
+        dev_mode (bool): Whether running outside GitHub Actions.
+        context (PipelineContext): Context the stages hand their outputs through.
+
+    Returns:
+        list: The stages, each declaring the files it reads and writes.
+    """
+    context_params = {'context': context}
+    file_handler = FileHandler(context_params)
+    articles_path = file_handler.get_file_path(
+        FileType.ARTICLES, date_str=date_str, base_name="articles")
+    article_groups_path = file_handler.get_file_path(
+        FileType.ARTICLE_GROUPS, date_str=date_str, base_name="article_groups")
+    unprocessed_path = file_handler.get_file_path(
+        FileType.UNPROCESSED_NEWSLETTER, date_str=date_str, base_name="newsletter_unprocessed")
+    processed_path = file_handler.get_file_path(
+        FileType.PROCESSED_NEWSLETTER, date_str=date_str, base_name="newsletter_processed")
+    formatted_path = file_handler.get_file_path(
+        FileType.FORMATTED_NEWSLETTER, date_str=date_str, base_name="newsletter_formatted")
+    sent_path = file_handler.get_file_path(
+        FileType.STAGE_MANIFEST, date_str=date_str, base_name="sent")
+    index_updater = NewsletterIndexUpdater()
+
+    # Similarity and clustering configuration
+    sim_strat_choice = 'lsa'
+    similarity_strategy = similarity_strategies[sim_strat_choice]['strategy']
+    similarity_params = similarity_strategies[sim_strat_choice]['params']
+    # 'knn_graph' scales to multi-day corpora, 'agglomerative' needs a dense matrix,
+    # 'online' keeps stable story IDs across days
+    clust_strat_choice = 'agglomerative'
+    clustering_params = {
+        'n_clusters': None,
+        'distance_threshold': 0.67,
+        'n_neighbors': 10
+    }
 
-        # Convert args to the expected format
-        args = type('Args', (), {
-            'date': yesterday,
-            'verbose': args.verbose,
-            'sources': args.sources,
-        })
-
-        logger.info("Starting newsletter automation pipeline")
-        logger.info("Process flags: %s", process_flags)
-
-        # Step 1: Process unsubscribes
-        logger.info("Step 1/6: Processing unsubscribes")
-        manager = SubscriberManager()
-        manager.process_unsubscribes(ignore=not process_flags['unsubscribes'])
-        logger.info("✓ Unsubscribe processing completed")
-
-        # Get yesterday's date
-        logger.info("Processing newsletter for date: %s", yesterday)
-
-        # Step 2: Scrape news articles
-        logger.info("Step 2/6: Starting news scraping")
-
-        # Initialize master scraper
-        master_scraper = MasterScraper(debug_mode=args.verbose)
-
-        # Run the scraper
-        logger.info("Running news scraper...")
-        output_file = master_scraper.run_scraper(
-            date=datetime.strptime(yesterday, '%Y-%m-%d'),
-            sources=args.sources,
-            ignore=not process_flags['scraping']
-        )
+    # Generation configuration
+    # 'map_reduce' summarizes each group with a cheap model before the final composition
+    generation_mode = 'single'
+    generator_params = {
+        'prompt_params': {
+            'summarize_groups': generation_mode == 'map_reduce'
+        },
+        # Match finished sections while later ones are still streaming
+        'stream': False,
+        'processor_params': {
+            # Write impacts with concurrent LLM requests instead of group summaries
+            'impact_params': {'use_llm': False}
+        }
+    }
+    ignore_impacts = True
 
-        if not output_file:
-            logger.error("✗ Failed to scrape articles")
-            return
-        logger.info("✓ News scraping completed")
+    def run_unsubscribes():
+        SubscriberManager().process_unsubscribes()
 
-        # Step 3: Process article groups
-        logger.info("Step 3/6: Processing article groups")
+    def run_scraping():
+        master_scraper = MasterScraper(debug_mode=verbose, params=context_params)
+        require(master_scraper.run_scraper(
+            date=datetime.strptime(date_str, '%Y-%m-%d'),
+            sources=sources
+        ), "Failed to scrape articles")
 
-        sim_strat_choice = 'lsa'
-        similarity_strategy = similarity_strategies[sim_strat_choice]['strategy']
-        similarity_params = similarity_strategies[sim_strat_choice]['params']
+    def count_articles():
+        return len(file_handler.load_file(
+            FileType.ARTICLES, date_str=date_str, base_name="articles"))
 
-        clustering_strategy = AgglomerativeClusteringStrategy(
+    def run_article_groups():
+        clustering_strategy = clustering_strategies[clust_strat_choice](
             params={
-                'n_clusters': None,
-                'distance_threshold': 0.67,
+                **clustering_params,
                 'similarity_strategy': similarity_strategy,
                 'similarity_params': similarity_params
             }
@@ -212,85 +207,152 @@ def main():
         article_processor = ArticleGroupProcessor(
             params={
                 'clustering_strategy': clustering_strategy,
-                'similarity_strategy': similarity_strategy
+                'similarity_strategy': similarity_strategy,
+                **context_params
             },
-            debug_mode=args.verbose
+            debug_mode=verbose
         )
-        article_groups_file = article_processor.run_processor(
-            yesterday, ignore=not process_flags['article_groups'])
-        if not article_groups_file:
-            logger.error("✗ Failed to process article groups")
-            return
-        logger.info("✓ Article group processing completed")
+        require(article_processor.run_processor(date_str),
+                "Failed to process article groups")
 
-        # Log article groups in dev mode
-        if dev_mode_flag and process_flags['article_groups']:
+        if dev_mode:
+            # Log article groups and save similarity logs
             logger.info("Article Groups Summary:")
-            with open(article_groups_file, 'r', encoding='utf-8') as f:
-                article_groups = json.load(f)
-                for group in article_groups['groups']:
-                    logger.info("Group: %s", group['details']['group_name'])
-                    logger.info("Articles:")
-                    for article in group['details']['articles']:
-                        logger.info("- %s", article['title'])
-
-        # Save similarity logs
-        if dev_mode_flag:
-            logger.info("Saving similarity logs...")
+            article_groups = file_handler.load_file(
+                FileType.ARTICLE_GROUPS, date_str=date_str, base_name="article_groups")
+            for group in article_groups['groups']:
+                logger.info("Group: %s", group['details']['group_name'])
+                logger.info("Articles:")
+                for article in group['details']['articles']:
+                    logger.info("- %s", article['title'])
             similarity_strategy.save_similarity_log()
             logger.info("✓ Similarity logs saved")
 
-        # Step 4: Generate newsletter or run matching
-        logger.info("Step 4/6: Starting newsletter processing")
-        generator = NewsletterGenerator(debug_mode=args.verbose)
-
-        # Run full generation process
-        logger.info("Running newsletter generator...")
-        output_file = generator.run_generator(
-            date_str=yesterday,
-            ignore=not process_flags['total_generation'],
-            ignore_generation=not process_flags['generation'],
-            ignore_impacts=not process_flags['impacts'],
-            ignore_matching=not process_flags['matching']
-        )
+    def count_article_groups():
+        return len(file_handler.load_file(
+            FileType.ARTICLE_GROUPS, date_str=date_str, base_name="article_groups")['groups'])
+
+    def run_newsletter():
+        generator = NewsletterGenerator(
+            debug_mode=verbose, params={**generator_params, **context_params})
+        require(generator.run_generator(date_str=date_str, ignore_impacts=ignore_impacts),
+                "Failed to process newsletter")
+
+    def count_news_items():
+        newsletter = file_handler.load_file(
+            FileType.PROCESSED_NEWSLETTER, date_str=date_str, base_name="newsletter_processed")
+        return sum(len(value) for value in newsletter.values() if isinstance(value, list))
+
+    def run_formatting():
+        require(NewsletterFormatter(context_params).format_newsletter(date_str=date_str),
+                "Failed to format newsletter")
+
+    def run_index_update():
+        index_updater.update_index()
+
+    def run_sending():
+        require(NewsletterSender(dev_mode=dev_mode, params=context_params).send_newsletter(
+            date=date_str), "Failed to send newsletter")
+        # Marks the date as sent, so re-runs do not send the newsletter again
+        file_handler.save_file(
+            {'date': date_str, 'sent_at': datetime.now().isoformat(timespec='seconds')},
+            FileType.STAGE_MANIFEST, date_str=date_str, base_name="sent")
+
+    return [
+        Stage('unsubscribes', run_unsubscribes, cacheable=False),
+        Stage('scraping', run_scraping, outputs=[articles_path],
+              config={'sources': sorted(sources)}, rows=count_articles),
+        Stage('article_groups', run_article_groups, inputs=[articles_path],
+              outputs=[article_groups_path],
+              config={'similarity': [sim_strat_choice, similarity_params],
+                      'clustering': [clust_strat_choice, clustering_params]},
+              rows=count_article_groups),
+        Stage('newsletter', run_newsletter, inputs=[articles_path, article_groups_path],
+              outputs=[unprocessed_path, processed_path],
+              config={'generator': generator_params, 'ignore_impacts': ignore_impacts},
+              rows=count_news_items),
+        Stage('formatting', run_formatting, inputs=[processed_path, article_groups_path],
+              outputs=[formatted_path]),
+        # The index lists every formatted newsletter, so it is always rebuilt
+        Stage('index_update', run_index_update, inputs=[formatted_path],
+              outputs=[index_updater.index_path], cacheable=False),
+        # Sending is recorded by its marker, not by the formatted newsletter, so a re-run
+        # or a reformatted newsletter does not send it again unless forced with --force sending
+        Stage('sending', run_sending, outputs=[sent_path], after=['formatting', 'unsubscribes'])
+    ]
 
-        if not output_file:
-            logger.error("✗ Failed to process newsletter")
-            return
-        logger.info("✓ Newsletter processing completed")
-
-        # Step 5: Format the newsletter
-        logger.info("Step 5/6: Formatting newsletter")
-        formatter = NewsletterFormatter()
-        output_file = formatter.format_newsletter(
-            date_str=yesterday,
-            file_path=None,  # Let it find the most recent file
-            ignore=not process_flags['formatting']
-        )
-        if not output_file:
-            logger.error("✗ Failed to format newsletter")
+
+def main():
+    """Main automation function."""
+    # Hands stage outputs to the next stage in memory and writes them in the background
+    context = PipelineContext()
+    try:
+        # Set up argument parser
+        parser = argparse.ArgumentParser(description='Newsletter automation script')
+        parser.add_argument('--test', action='store_true',
+                            help='Show the stages and whether they are up to date without running them')
+        parser.add_argument('--date', type=str, help='Date to process (YYYY-MM-DD format)')
+        parser.add_argument('--verbose', action='store_true', help='Enable verbose logging')
+        parser.add_argument('--sources', nargs='+', default=['visir', 'mbl', 'vb', 'ruv'],
+                            help='News sources to scrape')
+        parser.add_argument('--only', nargs='+', default=None,
+                            help='Run only these stages, trusting existing outputs of the others. '
+                                 f'Outside GitHub Actions defaults to {DEV_STAGES}')
+        parser.add_argument('--skip', nargs='+', default=[],
+                            help='Stages not to run')
+        parser.add_argument('--force', nargs='+', default=[],
+                            help='Stages to run even if their outputs are up to date')
+        args = parser.parse_args()
+
+        dev_mode_flag = not is_running_in_github_actions()
+        date_str = args.date or get_yesterday_date()
+
+        # Created first so the LLM stages share a client whose cache goes through the context
+        LLMClient.shared({'context': context})
+        stages = build_stages(date_str, args.sources, args.verbose, dev_mode_flag, context)
+        names = [stage.name for stage in stages]
+        selected = (args.only or []) + args.skip + args.force
+        unknown = [name for name in selected if name not in names]
+        if unknown:
+            parser.error(f"Unknown stages: {unknown}. Stages: {names}")
+
+        # Local runs only update the index unless stages are named, and subscribers
+        # are only contacted from GitHub Actions unless asked for explicitly
+        only = args.only
+        skip = list(args.skip)
+        if dev_mode_flag:
+            only = only or DEV_STAGES
+            skip += [name for name in SUBSCRIBER_STAGES if name not in only]
+        stages = select_stages(stages, only, skip)
+
+        runner = PipelineRunner(date_str, stages, params={'force': args.force, 'context': context})
+
+        logger.info("Starting newsletter automation pipeline for date: %s", date_str)
+        if args.test:
+            for name, dependencies, up_to_date in runner.plan():
+                logger.info("Stage %-16s after %-40s %s", name, dependencies or '-',
+                            'up to date' if up_to_date else 'would run')
             return
-        logger.info("✓ Newsletter formatting completed")
-
-        # Step 6: Update the index
-        logger.info("Step 6/6: Updating newsletter index")
-        index_updater = NewsletterIndexUpdater()
-        index_updater.update_index(ignore=not process_flags['index_update'])
-        logger.info("✓ Index update completed")
-
-        # Step 7: Send the newsletter
-        logger.info("Step 7/7: Sending newsletter")
-        # Always use dev mode in automation
-        sender = NewsletterSender(dev_mode=dev_mode_flag)
-        sender.send_newsletter(
-            date=yesterday, ignore=not process_flags['sending'])
-        logger.info("✓ Newsletter sending completed")
 
+        succeeded = runner.run()
+
+        # Log LLM requests, tokens and latency per stage
+        LLMClient.shared().log_metrics()
+
+        # Fail the run if any stage output could not be written
+        context.flush()
+
+        if not succeeded:
+            logger.error("✗ Newsletter automation pipeline failed")
+            sys.exit(1)
         logger.info("✓ Newsletter automation pipeline completed successfully")
 
     except Exception as e:
         logger.error("✗ Error in newsletter automation: %s", str(e))
         sys.exit(1)
+    finally:
+        # Write errors were already logged or raised above
+        context.close(raise_errors=False)
 
 
 if __name__ == "__main__":
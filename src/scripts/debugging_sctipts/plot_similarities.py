@@ -4,6 +4,7 @@ import os
 import glob
 from datetime import datetime
 
+import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -16,17 +17,18 @@ def get_newest_similarity_log():
     """
     log_dir = 'src/outputs/logs/similarity_logs/'
 
-    # Get all JSON files in the similarity logs directory
-    log_files = glob.glob(os.path.join(log_dir, 'similarity_log_*.json'))
+    # Get all NPZ summaries and legacy JSON logs in the similarity logs directory
+    log_files = glob.glob(os.path.join(log_dir, 'similarity_log_*.npz'))
+    log_files += glob.glob(os.path.join(log_dir, 'similarity_log_*.json'))
 
     if not log_files:
         raise FileNotFoundError("No similarity log files found")
 
     # Extract timestamps from filenames and find the newest
     def get_timestamp_from_filename(filename):
-        # Filename format: similarity_log_STRATEGY_YYYYMMDD_HHMMSS.json
-        timestamp_str = os.path.basename(filename).split(
-            '_')[-2] + os.path.basename(filename).split('_')[-1].replace('.json', '')
+        # Filename format: similarity_log_STRATEGY_YYYYMMDD_HHMMSS.npz
+        stem = os.path.splitext(os.path.basename(filename))[0]
+        timestamp_str = stem.split('_')[-2] + stem.split('_')[-1]
         return datetime.strptime(timestamp_str, '%Y%m%d%H%M%S')
 
     # Sort files by timestamp in filename (newest first)
@@ -35,35 +37,78 @@ def get_newest_similarity_log():
     return newest_file
 
 
+def load_similarity_summary(log_file):
+    """Load a similarity summary from a log file.
+
+    Args:
+        log_file (str): Path to an NPZ summary or a legacy JSON log.
+
+    Returns:
+        dict: Histogram and statistics of the similarity scores.
+    """
+    if log_file.endswith('.npz'):
+        with np.load(log_file) as data:
+            return {
+                'bin_edges': data['bin_edges'],
+                'bin_counts': data['bin_counts'],
+                'count': int(data['count']),
+                'mean': float(data['mean']),
+                'std': float(data['std']),
+                'min': float(data['min']),
+                'max': float(data['max']),
+                'quantiles': dict(zip(data['quantile_levels'].tolist(),
+                                      data['quantile_values'].tolist()))
+            }
+
+    # Legacy logs store every similarity score
+    with open(log_file, 'r', encoding='utf-8') as f:
+        similarities = np.array([entry['similarity'] for entry in json.load(f)])
+    bin_counts, bin_edges = np.histogram(similarities, bins=50)
+    levels = [0.05, 0.5, 0.95]
+    return {
+        'bin_edges': bin_edges,
+        'bin_counts': bin_counts,
+        'count': len(similarities),
+        'mean': float(similarities.mean()),
+        'std': float(similarities.std()),
+        'min': float(similarities.min()),
+        'max': float(similarities.max()),
+        'quantiles': dict(zip(levels, np.quantile(similarities, levels).tolist()))
+    }
+
+
 def plot_similarity_distribution(log_file):
     """Plot the distribution of similarity scores from a log file.
 
     Args:
         log_file (str): Path to the similarity log file.
     """
-    # Load the similarity log
-    with open(log_file, 'r', encoding='utf-8') as f:
-        log_data = json.load(f)
-
-    # Extract similarity scores
-    similarities = [entry['similarity'] for entry in log_data]
+    # Load the similarity summary
+    summary = load_similarity_summary(log_file)
 
     # Get strategy name from filename
     strategy_name = os.path.basename(log_file).split('_')[2]
 
-    # Create a histogram
+    # Create a histogram from the stored bins
     plt.figure(figsize=(10, 6))
-    sns.histplot(similarities, bins=50)
+    sns.histplot(x=summary['bin_edges'][:-1], weights=summary['bin_counts'],
+                 bins=summary['bin_edges'])
     plt.title(f'Distribution of Article Similarities ({strategy_name})')
     plt.xlabel('Similarity Score')
     plt.ylabel('Count')
 
     # Add statistics as text
+    quantiles_text = '\n'.join(
+        f'P{level * 100:g}: {value:.3f}'
+        for level, value in summary['quantiles'].items()
+        if level in (0.05, 0.5, 0.95))
     stats_text = (
-        f'Mean: {sum(similarities)/len(similarities):.3f}\n'
-        f'Min: {min(similarities):.3f}\n'
-        f'Max: {max(similarities):.3f}\n'
-        f'Count: {len(similarities)}'
+        f'Mean: {summary["mean"]:.3f}\n'
+        f'Std: {summary["std"]:.3f}\n'
+        f'Min: {summary["min"]:.3f}\n'
+        f'Max: {summary["max"]:.3f}\n'
+        f'{quantiles_text}\n'
+        f'Count: {summary["count"]}'
     )
     plt.text(0.95, 0.95, stats_text,
              transform=plt.gca().transAxes,
@@ -95,7 +140,7 @@ def main():
     """Main function to plot similarity distributions."""
     try:
         newest_log = get_newest_similarity_log()
-        # newest_log = 'src/outputs/logs/similarity_logs/similarity_log_BERTSimilarity_20240321_143022.json'
+        # newest_log = 'src/outputs/logs/similarity_logs/similarity_log_BERTSimilarity_20240321_143022.npz'
         print(f"Loading similarity log: {newest_log}")
         plot_similarity_distribution(newest_log)
     except FileNotFoundError as e:
@@ -3,63 +3,15 @@
 Module for processing news articles into article groups.
 """
 import hashlib
-import os
 from pathlib import Path
-from typing import List, Dict, Optional, Any
-
-from openai import OpenAI
-from dotenv import load_dotenv
+from typing import List, Dict, Optional, Any, Tuple
 
 from nl_utils.logger_config import get_logger, get_module_name
 from nl_utils.file_handler import FileHandler, FileType
+from nl_utils.article_index import ArticleIndex
 from .clustering_strategies import ClusteringStrategy
 from .similarity_strategies import SimilarityStrategy
-
-
-def create_group_name(article_titles: List[str], article_descriptions: List[str], prompt_template: str) -> str:
-    """Create a concise title for a group of related articles using OpenAI.
-
-    Args:
-        article_titles (List[str]): List of article titles in the group
-        article_descriptions (List[str]): List of article descriptions in the group
-
-    Returns:
-        str: A concise title in Icelandic describing the main story
-    """
-    try:
-        # Load environment variables and initialize OpenAI client
-        load_dotenv()
-        client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-
-        # Format article titles and descriptions
-        titles_text = "\n".join(
-            [f"- {title}" for title in article_titles if title])
-        descriptions_text = "\n".join(
-            [f"- {desc}" for desc in article_descriptions if desc])
-
-        # Format the prompt
-        prompt = prompt_template.format(
-            article_titles=titles_text,
-            article_descriptions=descriptions_text
-        )
-
-        # Generate the group name using OpenAI
-        response = client.chat.completions.create(
-            model="gpt-4.1-nano",
-            messages=[{"role": "system", "content": prompt}],
-            temperature=0.1,
-            max_tokens=50
-        )
-
-        # Extract and clean the response
-        group_name = response.choices[0].message.content.strip()
-        return group_name
-
-    except Exception as e:
-        logger = get_logger(get_module_name(__name__))
-        logger.error("Error creating group name: %s", str(e))
-        # Return a fallback name if generation fails
-        return "Fréttir um sömu atburði"
+from .group_namer import GroupNamer, FALLBACK_GROUP_NAME
 
 
 class ArticleGroupProcessor:
@@ -73,13 +25,55 @@ class ArticleGroupProcessor:
                 Must contain:
                 - clustering_strategy (ClusteringStrategy): Strategy for clustering articles.
                 - similarity_strategy (SimilarityStrategy): Strategy for calculating article similarity.
+                May contain:
+                - naming_params (Dict[str, Any]): Parameters for the GroupNamer.
+                - min_llm_group_size (int): Smallest group named by the model. Smaller
+                  groups are named locally from their article title. Defaults to 2,
+                  use 1 to name every group with the model.
+                - context (PipelineContext): Context that hands stage outputs between stages.
             debug_mode (bool): Whether to run in debug mode.
         """
         self.logger = get_logger(get_module_name(__name__))
         self.debug_mode = debug_mode
-        self.file_handler: FileHandler = FileHandler()
+        self.file_handler: FileHandler = FileHandler({'context': params.get('context')})
         self.clustering_strategy: ClusteringStrategy = params['clustering_strategy']
         self.similarity_strategy: SimilarityStrategy = params['similarity_strategy']
+        self.group_namer = GroupNamer(params.get('naming_params'))
+        self.min_llm_group_size = params.get('min_llm_group_size', 2)
+
+    def name_groups(self, naming_inputs: List[Tuple[List[str], List[str]]], prompt_template: str) -> List[str]:
+        """Name article groups according to the naming policy.
+
+        Groups smaller than min_llm_group_size are named locally from their
+        article title, and only the remaining groups are sent to the model.
+
+        Args:
+            naming_inputs (List[Tuple[List[str], List[str]]]): (article_titles, article_descriptions)
+                for each group.
+            prompt_template (str): Template for the group naming prompt.
+
+        Returns:
+            List[str]: Group names in the same order as the groups.
+        """
+        group_names = [None] * len(naming_inputs)
+        llm_indices = []
+        for i, (article_titles, _) in enumerate(naming_inputs):
+            if len(article_titles) >= self.min_llm_group_size:
+                llm_indices.append(i)
+            else:
+                group_names[i] = next(
+                    (title.strip() for title in article_titles if title and title.strip()),
+                    FALLBACK_GROUP_NAME)
+
+        self.logger.info(
+            "Naming %d groups locally and %d with the model",
+            len(naming_inputs) - len(llm_indices), len(llm_indices))
+        llm_names = self.group_namer.name_groups(
+            [naming_inputs[i] for i in llm_indices], prompt_template)
+        for i, group_name in zip(llm_indices, llm_names):
+            group_names[i] = group_name
+
+        return group_names
 
     def process_articles(self, articles: List[Dict], date_str: str) -> Optional[Dict]:
         """Process articles into article groups.
@@ -95,18 +89,20 @@ class ArticleGroupProcessor:
             self.logger.info(
                 "Processing %d articles into groups", len(articles))
 
+            # Index articles once for the lookups while building groups
+            article_index = ArticleIndex.for_date(date_str, articles)
+
             # Extract lemmas from articles
             articles_lemmas = {
                 article['article_id']: article['article_lemmas']
                 for article in articles
             }
-            articles_corpus = [' '.join(list(article_lemmas))
-                               for article_lemmas in articles_lemmas.values()]
-            # print(articles_corpus)
+            articles_corpus = self.similarity_strategy.build_corpus(articles)
             self.similarity_strategy.set_corpus(articles_corpus)
-            self.similarity_strategy.fit()
+            self.similarity_strategy.fit_cached(date_str)
 
             # Cluster similar articles
+            self.clustering_strategy.set_date(date_str)
             groups = self.clustering_strategy.cluster_articles(
                 articles_lemmas
             )
@@ -124,8 +120,9 @@ class ArticleGroupProcessor:
             )
 
             # Convert groups to the required format
+            naming_inputs = []
             for group in groups:
-                group_hash = hashlib.sha256(
+                group_hash = self.clustering_strategy.get_cluster_id(group) or hashlib.sha256(
                     str(group).encode()).hexdigest()[:8]
                 group_data = {
                     "urls": [],
@@ -142,8 +139,7 @@ class ArticleGroupProcessor:
                 article_titles = []
                 article_descriptions = []
                 for article_id, lemmas in group:
-                    article = next(
-                        (a for a in articles if a.get('article_id') == article_id), None)
+                    article = article_index.get(article_id)
                     if article:
                         # Add URL to the URLs list
                         group_data["urls"].append(
@@ -164,12 +160,14 @@ class ArticleGroupProcessor:
                         article_descriptions.append(
                             article.get('article_description', None))
                         group_data["details"]["articles"].append(article_info)
-                group_name = create_group_name(
-                    article_titles, article_descriptions, prompt_template)
-                group_data["details"]["group_name"] = group_name
-
+                naming_inputs.append((article_titles, article_descriptions))
                 article_groups["groups"].append(group_data)
 
+            # Name trivial groups locally and the rest concurrently with the model
+            group_names = self.name_groups(naming_inputs, prompt_template)
+            for group_data, group_name in zip(article_groups["groups"], group_names):
+                group_data["details"]["group_name"] = group_name
+
             # Sort groups by article count in descending order
             article_groups["groups"].sort(
                 key=lambda x: x["details"]["article_count"], reverse=True)
@@ -1,8 +1,12 @@
 """Clustering strategies for article grouping."""
 from .base_clustering import ClusteringStrategy
 from .agglomerative_clustering import AgglomerativeClusteringStrategy
+from .knn_graph_clustering import KNNGraphClusteringStrategy
+from .online_clustering import OnlineClusteringStrategy
 
 __all__ = [
     'ClusteringStrategy',
-    'AgglomerativeClusteringStrategy'
+    'AgglomerativeClusteringStrategy',
+    'KNNGraphClusteringStrategy',
+    'OnlineClusteringStrategy'
 ]
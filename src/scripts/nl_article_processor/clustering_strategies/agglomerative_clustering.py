@@ -49,38 +49,46 @@ class AgglomerativeClusteringStrategy(ClusteringStrategy):
         article_sets = self._convert_to_sets(articles_lemmas)
         article_ids = list(article_sets.keys())
 
-        # Create similarity matrix
-        n_articles = len(article_ids)
-        similarity_matrix = np.zeros((n_articles, n_articles))
-
-        for i, id1 in enumerate(article_ids):
-            for j, id2 in enumerate(article_ids):
-                if i != j:
-                    similarity = self.similarity_strategy.calculate_similarity(
-                        article_sets[id1], article_sets[id2])
-                    similarity_matrix[i, j] = similarity
-
-        # Convert similarity to distance
-        distance_matrix = 1 - similarity_matrix
-
-        # Apply Agglomerative clustering
-        if self.n_clusters is None:
-            # Use distance threshold
-            clusterer = AgglomerativeClustering(
-                n_clusters=None,
-                distance_threshold=self.distance_threshold,
-                metric='precomputed',
-                linkage='average'
-            )
-        else:
-            # Use fixed number of clusters
-            clusterer = AgglomerativeClustering(
-                n_clusters=self.n_clusters,
-                metric='precomputed',
-                linkage='average'
-            )
-
-        labels = clusterer.fit_predict(distance_matrix)
+        try:
+            # Create distance matrix in blocks from article vectors when possible.
+            # sklearn reads a precomputed matrix fully into memory, so it is not
+            # spilled to disk; the k-NN graph strategy bounds memory instead.
+            vectors = self._transform_articles(article_sets)
+            if vectors is not None:
+                distance_matrix = self.matrix_builder.compute(
+                    vectors, distance=True,
+                    metrics=self.similarity_strategy.similarity_metrics, spill=False)
+            else:
+                n_articles = len(article_ids)
+                distance_matrix = np.zeros((n_articles, n_articles), dtype=np.float32)
+
+                for i, id1 in enumerate(article_ids):
+                    for j, id2 in enumerate(article_ids):
+                        if i != j:
+                            similarity = self.similarity_strategy.calculate_similarity(
+                                article_sets[id1], article_sets[id2])
+                            distance_matrix[i, j] = max(1 - similarity, 0)
+
+            # Apply Agglomerative clustering
+            if self.n_clusters is None:
+                # Use distance threshold
+                clusterer = AgglomerativeClustering(
+                    n_clusters=None,
+                    distance_threshold=self.distance_threshold,
+                    metric='precomputed',
+                    linkage='average'
+                )
+            else:
+                # Use fixed number of clusters
+                clusterer = AgglomerativeClustering(
+                    n_clusters=self.n_clusters,
+                    metric='precomputed',
+                    linkage='average'
+                )
+
+            labels = clusterer.fit_predict(distance_matrix)
+        finally:
+            self.matrix_builder.cleanup()
 
         # Group articles by cluster
         clusters = {}
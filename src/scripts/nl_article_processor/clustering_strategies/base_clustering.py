@@ -1,8 +1,9 @@
 """Base class for clustering strategies."""
 from abc import ABC, abstractmethod
-from typing import Dict, List, Set, Tuple, Any
+from typing import Dict, List, Set, Tuple, Any, Optional
 
 from nl_utils.logger_config import get_logger
+from ..similarity_matrix import SimilarityMatrixBuilder
 
 
 class ClusteringStrategy(ABC):
@@ -15,12 +16,24 @@ class ClusteringStrategy(ABC):
             params (Dict[str, Any]): Dictionary of parameters for the clustering strategy.
                 Must contain:
                 - similarity_strategy (SimilarityStrategy): Strategy for calculating article similarity.
+                May contain:
+                - matrix_params (Dict[str, Any]): Parameters for the SimilarityMatrixBuilder.
         """
         self.params = params
         self.logger = get_logger(
             f'clustering_strategy_{self.__class__.__name__}')
         self.similarity_strategy = params['similarity_strategy']
         self.similarity_params = params['similarity_params']
+        self.date_str = None
+        self.matrix_builder = SimilarityMatrixBuilder(params.get('matrix_params'))
+
+    def set_date(self, date_str: str):
+        """Set the date of the articles being clustered.
+
+        Args:
+            date_str (str): Date string in YYYY-MM-DD format.
+        """
+        self.date_str = date_str
 
     @abstractmethod
     def cluster_articles(
@@ -37,6 +50,17 @@ class ClusteringStrategy(ABC):
             (article_id, lemmas) tuples.
         """
 
+    def get_cluster_id(self, cluster: List[Tuple[str, List[str]]]) -> Optional[str]:
+        """Get a stable ID for a cluster from the last clustering run.
+
+        Args:
+            cluster (List[Tuple[str, List[str]]]): Cluster of (article_id, lemmas) tuples.
+
+        Returns:
+            Optional[str]: Stable cluster ID, or None if the strategy does not provide one.
+        """
+        return None
+
     def log_stats_after_clustering(self, clusters: List[List[Tuple[str, List[str]]]]):
         """Log out the distribution of clusters by size."""
         # Count clusters of each size
@@ -52,6 +76,21 @@ class ClusteringStrategy(ABC):
                 "Number of clusters with size %d: %d",
                 size, count)
 
+    def _transform_articles(self, article_sets: Dict[str, Set[str]]) -> Optional[Any]:
+        """Transform articles into vectors if the similarity strategy supports it.
+
+        Args:
+            article_sets (Dict[str, Set[str]]): Dictionary mapping article IDs to their lemma sets.
+
+        Returns:
+            Optional[Any]: Vectors with one row per article, or None if not supported.
+        """
+        try:
+            return self.similarity_strategy.transform_documents(
+                list(article_sets.values()))
+        except NotImplementedError:
+            return None
+
     def _convert_to_sets(self, articles_lemmas: Dict[str, List[str]]) -> Dict[str, Set[str]]:
         """Convert lemma lists to sets for faster comparison.
 
@@ -0,0 +1,173 @@
+"""Sparse k-nearest-neighbour graph clustering strategy implementation."""
+from typing import Dict, Iterable, List, Tuple, Any
+
+import numpy as np
+from scipy import sparse
+from scipy.sparse.csgraph import connected_components
+
+from .base_clustering import ClusteringStrategy
+
+
+class KNNGraphClusteringStrategy(ClusteringStrategy):
+    """Clustering on a sparse top-k nearest-neighbour similarity graph.
+
+    Article vectors are compared in row blocks, and only the k most similar
+    neighbours above the similarity threshold are kept for each article. The
+    resulting graph is clustered with connected components, so memory scales
+    with the number of articles times k instead of the number of pairs.
+    """
+
+    def __init__(self, params: Dict[str, Any]):
+        """Initialize k-NN graph clustering strategy.
+
+        Args:
+            params (Dict[str, Any]): Dictionary of parameters for the clustering strategy.
+                Must contain:
+                - distance_threshold (float): Maximum distance (1 - similarity) for an edge.
+                May contain:
+                - n_neighbors (int): Number of neighbours kept per article.
+                - block_size (int): Rows compared per block, derived from the memory budget if None.
+                - mutual (bool): Only keep edges where both articles are in each other's top k.
+        """
+        super().__init__(params)
+        if self.params.get('distance_threshold') is None:
+            self.logger.error(
+                "Missing required parameter 'distance_threshold'")
+            raise ValueError(
+                "Missing required parameter 'distance_threshold'")
+        self.distance_threshold = self.params.get('distance_threshold')
+        self.n_neighbors = self.params.get('n_neighbors', 10)
+        self.block_size = self.params.get('block_size')
+        self.mutual = self.params.get('mutual', False)
+
+    def build_knn_graph(self, blocks: Iterable[Tuple[int, int, np.ndarray]],
+                        n_articles: int) -> sparse.csr_matrix:
+        """Build a sparse top-k similarity graph from similarity row blocks.
+
+        Args:
+            blocks (Iterable[Tuple[int, int, np.ndarray]]): (start, stop, block) similarity
+                row blocks, e.g. from SimilarityMatrixBuilder.iter_blocks.
+            n_articles (int): Number of articles.
+
+        Returns:
+            sparse.csr_matrix: Symmetric N x N graph holding similarities of kept edges.
+        """
+        n_neighbors = min(self.n_neighbors, n_articles - 1)
+        similarity_threshold = 1 - self.distance_threshold
+
+        rows, cols, values = [], [], []
+        if n_neighbors > 0:
+            for start, stop, block in blocks:
+                # Exclude self-similarity before recording and ranking
+                block_rows = np.arange(stop - start)
+                block[block_rows, block_rows + start] = -np.inf
+                self.similarity_strategy.similarity_metrics.add_many(
+                    block[np.isfinite(block)])
+
+                top_k = np.argpartition(-block, n_neighbors - 1, axis=1)[:, :n_neighbors]
+                top_values = np.take_along_axis(block, top_k, axis=1)
+                keep = top_values >= similarity_threshold
+
+                rows.append(np.repeat(block_rows + start, n_neighbors)[keep.ravel()])
+                cols.append(top_k[keep])
+                values.append(top_values[keep])
+
+        if rows:
+            rows = np.concatenate(rows)
+            cols = np.concatenate(cols)
+            # Keep non-positive similarities as edges when the threshold allows them
+            values = np.clip(np.concatenate(values), 1e-6, None).astype(np.float32)
+        graph = sparse.csr_matrix(
+            (values, (rows, cols)), shape=(n_articles, n_articles))
+
+        # Symmetrize the directed k-NN graph
+        if self.mutual:
+            return graph.minimum(graph.T)
+        return graph.maximum(graph.T)
+
+    def cluster_articles(
+        self,
+        articles_lemmas: Dict[str, List[str]],
+    ) -> List[List[Tuple[str, List[str]]]]:
+        """Cluster articles using connected components of the k-NN graph.
+
+        Args:
+            articles_lemmas (Dict[str, List[str]]): Dictionary mapping article IDs to their lemmas.
+
+        Returns:
+            List[List[Tuple[str, List[str]]]]: List of clusters, where each cluster is a list of
+            (article_id, lemmas) tuples.
+        """
+        self.logger.info(
+            "Starting k-NN graph clustering with parameters: n_neighbors=%s, distance_threshold=%s, mutual=%s",
+            self.n_neighbors, self.distance_threshold, self.mutual)
+        article_sets = self._convert_to_sets(articles_lemmas)
+        article_ids = list(article_sets.keys())
+        if not article_ids:
+            return []
+
+        vectors = self.similarity_strategy.transform_documents(
+            [article_sets[article_id] for article_id in article_ids])
+        graph = self.build_knn_graph(
+            self.matrix_builder.iter_blocks(vectors, self.block_size),
+            len(article_ids))
+        return self._group_by_components(articles_lemmas, article_ids, graph)
+
+    def cluster_similarity_matrix(
+        self,
+        articles_lemmas: Dict[str, List[str]],
+        similarity_matrix: np.ndarray,
+    ) -> List[List[Tuple[str, List[str]]]]:
+        """Cluster articles from a precomputed, possibly memory-mapped, similarity matrix.
+
+        The matrix is read one row block at a time, so a np.memmap from
+        SimilarityMatrixBuilder.compute is never fully loaded into RAM.
+
+        Args:
+            articles_lemmas (Dict[str, List[str]]): Dictionary mapping article IDs to their lemmas,
+                in the same order as the matrix rows.
+            similarity_matrix (np.ndarray): N x N cosine similarity matrix.
+
+        Returns:
+            List[List[Tuple[str, List[str]]]]: List of clusters, where each cluster is a list of
+            (article_id, lemmas) tuples.
+        """
+        article_ids = list(articles_lemmas.keys())
+        graph = self.build_knn_graph(
+            self.matrix_builder.iter_matrix_blocks(similarity_matrix, self.block_size),
+            len(article_ids))
+        return self._group_by_components(articles_lemmas, article_ids, graph)
+
+    def _group_by_components(
+        self,
+        articles_lemmas: Dict[str, List[str]],
+        article_ids: List[str],
+        graph: sparse.csr_matrix,
+    ) -> List[List[Tuple[str, List[str]]]]:
+        """Group articles by the connected components of the k-NN graph.
+
+        Args:
+            articles_lemmas (Dict[str, List[str]]): Dictionary mapping article IDs to their lemmas.
+            article_ids (List[str]): Article IDs in graph row order.
+            graph (sparse.csr_matrix): Symmetric k-NN graph.
+
+        Returns:
+            List[List[Tuple[str, List[str]]]]: List of clusters, where each cluster is a list of
+            (article_id, lemmas) tuples.
+        """
+        self.logger.info(
+            "Built k-NN graph with %d articles and %d edges",
+            len(article_ids), graph.nnz // 2)
+
+        _, labels = connected_components(graph, directed=False)
+
+        # Group articles by cluster
+        clusters = {}
+        for i, label in enumerate(labels):
+            if label not in clusters:
+                clusters[label] = []
+            clusters[label].append(
+                (article_ids[i], articles_lemmas[article_ids[i]]))
+
+        # Convert clusters to list format
+        return list(clusters.values())
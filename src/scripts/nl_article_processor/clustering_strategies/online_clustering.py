@@ -0,0 +1,260 @@
+"""Online clustering strategy implementation."""
+import hashlib
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple, Any, Optional
+
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+from nl_utils.file_handler import FileHandler, FileType
+from .base_clustering import ClusteringStrategy
+
+
+class OnlineClusteringStrategy(ClusteringStrategy):
+    """Online clustering that absorbs new articles into stories from earlier runs.
+
+    Each story keeps a lemma profile that is persisted between runs. On every
+    run the profiles are projected into the current similarity space, so the
+    centroids stay comparable even when the similarity strategy is refit on a
+    new corpus. Each article joins the most similar story above the threshold
+    or opens a new one, and story IDs stay stable across days.
+    """
+
+    def __init__(self, params: Dict[str, Any]):
+        """Initialize online clustering strategy.
+
+        Args:
+            params (Dict[str, Any]): Dictionary of parameters for the clustering strategy.
+                Must contain:
+                - distance_threshold (float): Maximum distance (1 - similarity) to join a story.
+                May contain:
+                - max_age_days (int): Days without new articles before a story is dropped.
+                - max_profile_lemmas (int): Number of lemmas kept in each story profile.
+                - state_name (str): Base name of the persisted state file.
+        """
+        super().__init__(params)
+        if self.params.get('distance_threshold') is None:
+            self.logger.error(
+                "Missing required parameter 'distance_threshold'")
+            raise ValueError(
+                "Missing required parameter 'distance_threshold'")
+        self.distance_threshold = self.params.get('distance_threshold')
+        self.max_age_days = self.params.get('max_age_days', 7)
+        self.max_profile_lemmas = self.params.get('max_profile_lemmas', 200)
+        self.state_name = self.params.get('state_name', 'online_clustering_state')
+        self.file_handler = FileHandler()
+        self.cluster_ids = {}
+
+    def get_cluster_id(self, cluster: List[Tuple[str, List[str]]]) -> Optional[str]:
+        """Get the stable story ID of a cluster from the last run.
+
+        Args:
+            cluster (List[Tuple[str, List[str]]]): Cluster of (article_id, lemmas) tuples.
+
+        Returns:
+            Optional[str]: Story ID of the cluster.
+        """
+        return self.cluster_ids.get(cluster[0][0]) if cluster else None
+
+    def _load_state(self) -> Dict[str, Any]:
+        """Load the persisted story state.
+
+        Returns:
+            Dict[str, Any]: Story state, empty if no state has been saved yet.
+        """
+        try:
+            return self.file_handler.load_file(
+                FileType.JSON, base_name=self.state_name)
+        except FileNotFoundError:
+            self.logger.info("No online clustering state found, starting fresh")
+            return {'stories': {}}
+
+    def _prune_stories(self, stories: Dict[str, Dict], run_date: str) -> Dict[str, Dict]:
+        """Drop stories that had not received articles recently as of the run date.
+
+        Nothing is dropped when backfilling a date older than the newest story, so
+        a past run does not lose stories that are still live now.
+
+        Args:
+            stories (Dict[str, Dict]): Stories keyed by story ID.
+            run_date (str): Date of the current run in YYYY-MM-DD format.
+
+        Returns:
+            Dict[str, Dict]: Stories to keep.
+        """
+        newest = max((story['last_seen'] for story in stories.values()), default=run_date)
+        if run_date < newest:
+            return dict(stories)
+        cutoff = (datetime.strptime(run_date, '%Y-%m-%d')
+                  - timedelta(days=self.max_age_days)).strftime('%Y-%m-%d')
+        return {
+            story_id: story for story_id, story in stories.items()
+            if story['last_seen'] >= cutoff
+        }
+
+    def _active_story_ids(self, stories: Dict[str, Dict], run_date: str) -> List[str]:
+        """Get the stories new articles of the run date can join.
+
+        Args:
+            stories (Dict[str, Dict]): Stories keyed by story ID.
+            run_date (str): Date of the current run in YYYY-MM-DD format.
+
+        Returns:
+            List[str]: IDs of stories with articles within max_age_days before the run date.
+        """
+        cutoff = (datetime.strptime(run_date, '%Y-%m-%d')
+                  - timedelta(days=self.max_age_days)).strftime('%Y-%m-%d')
+        return [
+            story_id for story_id, story in stories.items()
+            if story['last_seen'] >= cutoff
+        ]
+
+    def _update_profile(self, story: Dict, lemma_sets: List[set]):
+        """Add article lemmas to a story profile and keep the most frequent ones.
+
+        Args:
+            story (Dict): Story to update.
+            lemma_sets (List[set]): Lemma sets of the articles joining the story.
+        """
+        profile = Counter(story.get('lemmas', {}))
+        for lemmas in lemma_sets:
+            profile.update(lemmas)
+        story['lemmas'] = dict(profile.most_common(self.max_profile_lemmas))
+
+    def cluster_articles(
+        self,
+        articles_lemmas: Dict[str, List[str]],
+    ) -> List[List[Tuple[str, List[str]]]]:
+        """Assign articles to existing stories or open new ones.
+
+        Args:
+            articles_lemmas (Dict[str, List[str]]): Dictionary mapping article IDs to their lemmas.
+
+        Returns:
+            List[List[Tuple[str, List[str]]]]: List of clusters, where each cluster is a list of
+            (article_id, lemmas) tuples.
+        """
+        self.logger.info(
+            "Starting online clustering with parameters: distance_threshold=%s, max_age_days=%s",
+            self.distance_threshold, self.max_age_days)
+        article_sets = self._convert_to_sets(articles_lemmas)
+        article_ids = list(article_sets.keys())
+        self.cluster_ids = {}
+        if not article_ids:
+            return []
+
+        run_date = self.date_str or datetime.now().strftime('%Y-%m-%d')
+        state = self._load_state()
+        stored_stories = state.get('stories', {})
+        stories = self._prune_stories(stored_stories, run_date)
+        story_ids = self._active_story_ids(stories, run_date)
+        known_articles = {
+            article_id: story_id
+            for story_id, story in stored_stories.items()
+            for article_id in story.get('article_ids', [])
+        }
+        self.logger.info("Loaded %d active stories", len(story_ids))
+
+        # Project article vectors and story profiles into the current space
+        article_vectors = self.similarity_strategy.transform_documents(
+            [article_sets[article_id] for article_id in article_ids])
+        article_vectors = normalize(article_vectors)
+        if sparse.issparse(article_vectors):
+            article_vectors = article_vectors.toarray()
+
+        # Room for every article to open a story, so new stories need no reallocation
+        capacity = len(story_ids) + len(article_ids)
+        centroids = np.zeros((capacity, article_vectors.shape[1]))
+        weights = np.zeros(capacity)
+        if story_ids:
+            profile_vectors = self.similarity_strategy.transform_documents(
+                [set(stories[story_id]['lemmas']) for story_id in story_ids])
+            profile_vectors = normalize(profile_vectors)
+            if sparse.issparse(profile_vectors):
+                profile_vectors = profile_vectors.toarray()
+            centroids[:len(story_ids)] = profile_vectors
+            weights[:len(story_ids)] = [stories[story_id]['article_count'] for story_id in story_ids]
+
+        similarity_threshold = 1 - self.distance_threshold
+        assignments = {}
+        new_members = {}
+        for i, article_id in enumerate(article_ids):
+            vector = article_vectors[i]
+
+            # Articles seen in an earlier run keep their story
+            if article_id in known_articles:
+                story_id = known_articles[article_id]
+                stories.setdefault(story_id, stored_stories[story_id])
+                assignments[article_id] = story_id
+                continue
+
+            count = len(story_ids)
+            best = -1
+            if count:
+                norms = np.linalg.norm(centroids[:count], axis=1)
+                similarities = centroids[:count] @ vector / np.where(norms > 0, norms, 1)
+                self.similarity_strategy.similarity_metrics.add_many(similarities)
+                best = int(np.argmax(similarities))
+                if similarities[best] < similarity_threshold:
+                    best = -1
+
+            if best == -1:
+                # IDs must not collide with any stored story, active or not
+                story_id = hashlib.sha256(article_id.encode()).hexdigest()[:8]
+                while story_id in stories or story_id in stored_stories:
+                    story_id = hashlib.sha256(story_id.encode()).hexdigest()[:8]
+                stories[story_id] = {
+                    'lemmas': {},
+                    'article_ids': [],
+                    'article_count': 0,
+                    'first_seen': run_date,
+                    'last_seen': run_date
+                }
+                story_ids.append(story_id)
+                centroids[count] = vector
+                weights[count] = 1
+            else:
+                story_id = story_ids[best]
+                # Running mean of the members in the current space
+                centroids[best] = (centroids[best] * weights[best] + vector) / (weights[best] + 1)
+                weights[best] += 1
+
+            assignments[article_id] = story_id
+            new_members.setdefault(story_id, []).append(article_id)
+
+        # Update and persist the story profiles
+        for story_id, member_ids in new_members.items():
+            story = stories[story_id]
+            self._update_profile(story, [article_sets[a] for a in member_ids])
+            story['article_ids'] = story['article_ids'] + member_ids
+            story['article_count'] += len(member_ids)
+            story['last_seen'] = max(story.get('last_seen', run_date), run_date)
+            story['first_seen'] = min(story.get('first_seen', run_date), run_date)
+
+        try:
+            self.file_handler.save_file(
+                {'stories': stories}, FileType.JSON, base_name=self.state_name, indent=None)
+        except Exception as e:
+            self.logger.error("Failed to save online clustering state: %s", str(e))
+
+        self.logger.info(
+            "Assigned %d articles to %d stories (%d new)",
+            len(article_ids), len(set(assignments.values())),
+            len(set(assignments.values()) - set(stored_stories)))
+
+        # Group articles by story
+        clusters = {}
+        for article_id in article_ids:
+            story_id = assignments[article_id]
+            if story_id not in clusters:
+                clusters[story_id] = []
+            clusters[story_id].append(
+                (article_id, articles_lemmas[article_id]))
+
+        for story_id, cluster in clusters.items():
+            self.cluster_ids[cluster[0][0]] = story_id
+
+        # Convert clusters to list format
+        return list(clusters.values())
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Precomputed per-date index of article group vectors.
+"""
+import hashlib
+import json
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+from nl_utils.logger_config import get_logger, get_module_name
+from nl_utils.file_handler import FileHandler, FileType
+from nl_utils.article_index import ArticleIndex
+
+
+class GroupIndex:
+    """Index of article groups with aggregated term vectors and centroids.
+
+    For each group the index keeps the lemma counts over all of its articles
+    and the unit-length centroid of the group in the space of a fitted
+    similarity strategy, projected from the aggregated lemmas. It is built
+    once per date and stored next to the article groups file, keyed by the
+    groups and the similarity model, so matching and later analytics query
+    it instead of rebuilding group vectors from the raw articles.
+    """
+
+    def __init__(self, date_str: str, key: str, group_ids: List[str],
+                 terms: List[Dict[str, int]], centroids: np.ndarray):
+        """Initialize the GroupIndex.
+
+        Args:
+            date_str (str): Date string in YYYY-MM-DD format.
+            key (str): Hash of the groups and the similarity model the index was built from.
+            group_ids (List[str]): Group IDs in row order.
+            terms (List[Dict[str, int]]): Lemma counts of each group.
+            centroids (np.ndarray): Unit-length group centroids, one row per group.
+        """
+        self.logger = get_logger(get_module_name(__name__))
+        self.date_str = date_str
+        self.key = key
+        self.group_ids = group_ids
+        self.terms = terms
+        self.centroids = centroids
+        self.positions = {group_id: i for i, group_id in enumerate(group_ids)}
+
+    @staticmethod
+    def index_key(article_groups: Dict, similarity_strategy: Any) -> str:
+        """Get the key identifying the groups and the similarity model.
+
+        Args:
+            article_groups (Dict): The article groups.
+            similarity_strategy (Any): Fitted similarity strategy.
+
+        Returns:
+            str: Hex digest of the group memberships and the strategy corpus hash.
+        """
+        memberships = [
+            [group.get('details', {}).get('group_number'), group.get('article_ids', [])]
+            for group in article_groups.get('groups', [])
+        ]
+        digest = hashlib.sha256(json.dumps(memberships).encode())
+        digest.update(similarity_strategy.get_corpus_hash().encode())
+        return digest.hexdigest()
+
+    @classmethod
+    def build(cls, article_groups: Dict, similarity_strategy: Any,
+              key: Optional[str] = None,
+              file_handler: Optional[FileHandler] = None) -> 'GroupIndex':
+        """Build the index from the article groups and the day's articles.
+
+        Args:
+            article_groups (Dict): The article groups.
+            similarity_strategy (Any): Fitted similarity strategy used for the centroids.
+            key (Optional[str]): Precomputed index key.
+            file_handler (Optional[FileHandler]): File handler to load the articles with.
+
+        Returns:
+            GroupIndex: The built index.
+        """
+        date_str = article_groups.get('date')
+        article_index = ArticleIndex.for_date(date_str, file_handler=file_handler)
+
+        group_ids = []
+        terms = []
+        for group in article_groups.get('groups', []):
+            group_id = group.get('details', {}).get('group_number')
+            counts = Counter()
+            for article_id in group.get('article_ids', []):
+                article = article_index.get(article_id)
+                if article:
+                    counts.update(article.get('article_lemmas', []))
+            if group_id and counts:
+                group_ids.append(group_id)
+                terms.append(dict(counts))
+
+        centroids = np.zeros((0, 0), dtype=np.float32)
+        if terms:
+            centroids = normalize(similarity_strategy.transform_documents(
+                [set(group_terms) for group_terms in terms]))
+            if sparse.issparse(centroids):
+                centroids = centroids.toarray()
+            centroids = np.asarray(centroids, dtype=np.float32)
+
+        return cls(date_str, key or cls.index_key(article_groups, similarity_strategy),
+                   group_ids, terms, centroids)
+
+    @classmethod
+    def for_date(cls, article_groups: Dict, similarity_strategy: Any,
+                 file_handler: Optional[FileHandler] = None) -> 'GroupIndex':
+        """Load the stored index for the groups' date, building and storing it if needed.
+
+        Args:
+            article_groups (Dict): The article groups.
+            similarity_strategy (Any): Fitted similarity strategy used for the centroids.
+            file_handler (Optional[FileHandler]): File handler to load and store with, so
+                articles held in its pipeline context are found.
+
+        Returns:
+            GroupIndex: Index matching the groups and the similarity model.
+        """
+        logger = get_logger(get_module_name(__name__))
+        file_handler = file_handler or FileHandler()
+        date_str = article_groups.get('date')
+        base_name = f"group_index_{similarity_strategy.__class__.__name__}"
+        key = cls.index_key(article_groups, similarity_strategy)
+
+        if file_handler.file_exists(FileType.GROUP_INDEX, date_str=date_str, base_name=base_name):
+            try:
+                stored = file_handler.load_file(
+                    FileType.GROUP_INDEX, date_str=date_str, base_name=base_name)
+                if stored.get('key') == key:
+                    return cls(date_str, key, stored['group_ids'],
+                               stored['terms'], stored['centroids'])
+                logger.info("Article groups or model changed, rebuilding group index")
+            except Exception as e:
+                logger.warning("Could not load group index: %s", str(e))
+
+        index = cls.build(article_groups, similarity_strategy, key, file_handler)
+        try:
+            file_handler.save_file(
+                {
+                    'key': key,
+                    'group_ids': index.group_ids,
+                    'terms': index.terms,
+                    'centroids': index.centroids
+                },
+                FileType.GROUP_INDEX, date_str=date_str, base_name=base_name)
+        except Exception as e:
+            logger.warning("Could not save group index: %s", str(e))
+        logger.info("Built group index with %d groups for %s", len(index), date_str)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.group_ids)
+
+    def __contains__(self, group_id: str) -> bool:
+        return group_id in self.positions
+
+    def get_centroid(self, group_id: str) -> Optional[np.ndarray]:
+        """Get the centroid of a group.
+
+        Args:
+            group_id (str): ID of the group.
+
+        Returns:
+            Optional[np.ndarray]: Unit-length centroid, or None if the group is not indexed.
+        """
+        position = self.positions.get(group_id)
+        return None if position is None else self.centroids[position]
+
+    def get_terms(self, group_id: str) -> Dict[str, int]:
+        """Get the aggregated lemma counts of a group.
+
+        Args:
+            group_id (str): ID of the group.
+
+        Returns:
+            Dict[str, int]: Lemma counts over the group's articles, empty if not indexed.
+        """
+        position = self.positions.get(group_id)
+        return {} if position is None else self.terms[position]
+
+    def score(self, vectors: Any) -> np.ndarray:
+        """Compute cosine similarities between vectors and all group centroids.
+
+        Args:
+            vectors (Any): Dense array or sparse matrix in the same space, one row per query.
+
+        Returns:
+            np.ndarray: Queries x groups similarity matrix, columns in group_ids order.
+        """
+        vectors = normalize(vectors)
+        if sparse.issparse(vectors):
+            vectors = vectors.toarray()
+        if not len(self):
+            return np.zeros((vectors.shape[0], 0))
+        return np.asarray(vectors, dtype=np.float64) @ self.centroids.T.astype(np.float64)
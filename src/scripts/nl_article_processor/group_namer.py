@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Module for naming article groups using OpenAI.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+
+from nl_utils.logger_config import get_logger, get_module_name
+from nl_utils.llm_client import LLMClient
+
+# Name used when the model cannot name a group
+FALLBACK_GROUP_NAME = "Fréttir um sömu atburði"
+
+
+def create_group_name(article_titles: List[str], article_descriptions: List[str], prompt_template: str,
+                      client: Optional[LLMClient] = None, model: str = "gpt-4.1-nano") -> str:
+    """Create a concise title for a group of related articles using OpenAI.
+
+    Args:
+        article_titles (List[str]): List of article titles in the group
+        article_descriptions (List[str]): List of article descriptions in the group
+        prompt_template (str): Template for the group naming prompt
+        client (Optional[LLMClient]): LLM client, the shared client if None
+        model (str): Model used to name the group
+
+    Returns:
+        str: A concise title in Icelandic describing the main story
+    """
+    try:
+        if client is None:
+            client = LLMClient.shared()
+
+        # Format article titles and descriptions
+        titles_text = "\n".join(
+            [f"- {title}" for title in article_titles if title])
+        descriptions_text = "\n".join(
+            [f"- {desc}" for desc in article_descriptions if desc])
+
+        # Format the prompt
+        prompt = prompt_template.format(
+            article_titles=titles_text,
+            article_descriptions=descriptions_text
+        )
+
+        # Generate the group name using OpenAI
+        response = client.complete(
+            model=model,
+            messages=[{"role": "system", "content": prompt}],
+            label='group_name',
+            temperature=0.1,
+            max_tokens=50
+        )
+
+        # Extract and clean the response
+        group_name = response['content'].strip()
+        return group_name
+
+    except Exception as e:
+        logger = get_logger(get_module_name(__name__))
+        logger.error("Error creating group name: %s", str(e))
+        # Return a fallback name if generation fails
+        return FALLBACK_GROUP_NAME
+
+
+class GroupNamer:
+    """Class for naming article groups with concurrent OpenAI requests.
+
+    Responses are cached by the LLMClient, so re-runs and stories that persist
+    across days only call the API for groups that have not been named before.
+    """
+
+    def __init__(self, params: Optional[Dict[str, Any]] = None):
+        """Initialize the GroupNamer.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Parameters for the group namer.
+                May contain:
+                - model (str): Model used to name groups.
+                - max_workers (int): Maximum number of concurrent naming requests.
+        """
+        params = params or {}
+        self.logger = get_logger(get_module_name(__name__))
+        self.model = params.get('model', "gpt-4.1-nano")
+        self.max_workers = params.get('max_workers', 8)
+        self._client = None
+
+    @property
+    def client(self) -> LLMClient:
+        """LLM client shared by all naming requests."""
+        if self._client is None:
+            self._client = LLMClient.shared()
+        return self._client
+
+    def name_groups(self, groups: List[Tuple[List[str], List[str]]], prompt_template: str) -> List[str]:
+        """Name several article groups concurrently.
+
+        Args:
+            groups (List[Tuple[List[str], List[str]]]): (article_titles, article_descriptions)
+                for each group.
+            prompt_template (str): Template for the group naming prompt.
+
+        Returns:
+            List[str]: Group names in the same order as the groups.
+        """
+        if not groups:
+            return []
+
+        self.logger.info(
+            "Naming %d groups with up to %d concurrent requests", len(groups), self.max_workers)
+
+        try:
+            client = self.client
+        except Exception as e:
+            self.logger.error("Error initializing LLM client: %s", str(e))
+            return [FALLBACK_GROUP_NAME] * len(groups)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(
+                lambda group: create_group_name(
+                    group[0], group[1], prompt_template, client, self.model),
+                groups
+            ))
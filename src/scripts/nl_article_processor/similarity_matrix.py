@@ -0,0 +1,166 @@
+"""Module for computing article similarity matrices in memory-bounded blocks."""
+import os
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.preprocessing import normalize
+
+from nl_utils.logger_config import get_logger, get_module_name
+
+
+class SimilarityMatrixBuilder:
+    """Class for computing cosine similarity matrices in row blocks.
+
+    Blocks are sized to stay within a memory budget and use float32. When the
+    full N x N matrix does not fit in the budget it is written to a
+    memory-mapped file instead of being held in RAM, for consumers that read
+    it back one row block at a time.
+    """
+
+    def __init__(self, params: Optional[Dict[str, Any]] = None):
+        """Initialize the SimilarityMatrixBuilder.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Parameters for the builder.
+                May contain:
+                - memory_budget_mb (float): Memory budget for blocks and in-memory matrices.
+                - spill_dir (str): Directory for memory-mapped matrices, system temp by default.
+        """
+        params = params or {}
+        self.logger = get_logger(get_module_name(__name__))
+        self.memory_budget = int(params.get('memory_budget_mb', 256) * 1024 ** 2)
+        self.spill_dir = params.get('spill_dir')
+        self.dtype = np.float32
+        self.spilled_files: List[str] = []
+
+    def rows_per_block(self, n_columns: int) -> int:
+        """Get the number of rows per block that fits in the memory budget.
+
+        Args:
+            n_columns (int): Number of columns in each block.
+
+        Returns:
+            int: Number of rows per block.
+        """
+        # Leave room for the block itself plus one temporary of the same size
+        row_bytes = max(n_columns, 1) * np.dtype(self.dtype).itemsize * 2
+        return max(1, self.memory_budget // row_bytes)
+
+    def iter_blocks(self, vectors: Any, rows_per_block: Optional[int] = None
+                    ) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """Compute cosine similarities between all vectors one row block at a time.
+
+        Args:
+            vectors (Any): Dense array or sparse matrix with one row per document.
+            rows_per_block (Optional[int]): Rows per block, derived from the budget if None.
+
+        Yields:
+            Tuple[int, int, np.ndarray]: Start row, stop row and the similarity block.
+        """
+        vectors = normalize(vectors).astype(self.dtype)
+        n_rows = vectors.shape[0]
+        rows_per_block = rows_per_block or self.rows_per_block(n_rows)
+        vectors_t = vectors.T.tocsr() if sparse.issparse(vectors) else vectors.T
+
+        for start in range(0, n_rows, rows_per_block):
+            stop = min(start + rows_per_block, n_rows)
+            block = vectors[start:stop] @ vectors_t
+            if sparse.issparse(block):
+                block = block.toarray()
+            yield start, stop, np.asarray(block, dtype=self.dtype)
+
+    def iter_matrix_blocks(self, matrix: np.ndarray, rows_per_block: Optional[int] = None
+                           ) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """Read an existing, possibly memory-mapped, matrix one row block at a time.
+
+        Args:
+            matrix (np.ndarray): Square matrix, e.g. a np.memmap returned by compute.
+            rows_per_block (Optional[int]): Rows per block, derived from the budget if None.
+
+        Yields:
+            Tuple[int, int, np.ndarray]: Start row, stop row and an in-memory copy of the block.
+        """
+        n_rows = matrix.shape[0]
+        rows_per_block = rows_per_block or self.rows_per_block(matrix.shape[1])
+        for start in range(0, n_rows, rows_per_block):
+            stop = min(start + rows_per_block, n_rows)
+            yield start, stop, np.array(matrix[start:stop], dtype=self.dtype)
+
+    def _allocate(self, n_rows: int, spill: bool = True) -> np.ndarray:
+        """Allocate an N x N matrix in memory or as a memory-mapped file.
+
+        Args:
+            n_rows (int): Number of rows and columns.
+            spill (bool): Whether a matrix over the budget may be memory-mapped.
+
+        Returns:
+            np.ndarray: Uninitialized matrix, a np.memmap if it exceeds the budget and
+            spilling is allowed.
+        """
+        matrix_bytes = n_rows * n_rows * np.dtype(self.dtype).itemsize
+        if matrix_bytes <= self.memory_budget:
+            return np.empty((n_rows, n_rows), dtype=self.dtype)
+        if not spill:
+            self.logger.warning(
+                "Similarity matrix (%.1f MB) exceeds memory budget and is held in memory",
+                matrix_bytes / 1024 ** 2)
+            return np.empty((n_rows, n_rows), dtype=self.dtype)
+
+        if self.spill_dir:
+            os.makedirs(self.spill_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(
+            prefix='similarity_matrix_', suffix='.dat', dir=self.spill_dir)
+        os.close(fd)
+        self.spilled_files.append(path)
+        self.logger.info(
+            "Similarity matrix (%.1f MB) exceeds memory budget, spilling to %s",
+            matrix_bytes / 1024 ** 2, path)
+        return np.memmap(path, dtype=self.dtype, mode='w+', shape=(n_rows, n_rows))
+
+    def compute(self, vectors: Any, distance: bool = False, metrics: Any = None,
+                spill: bool = True) -> np.ndarray:
+        """Compute the full cosine similarity or distance matrix.
+
+        Args:
+            vectors (Any): Dense array or sparse matrix with one row per document.
+            distance (bool): Whether to return 1 - similarity, computed in place and clipped
+                at 0 so float32 rounding cannot produce negative distances.
+            metrics (Any): Optional SimilarityMetricsSink receiving the off-diagonal scores.
+            spill (bool): Whether a matrix over the memory budget may be memory-mapped.
+                Pass False when the consumer loads the whole matrix anyway.
+
+        Returns:
+            np.ndarray: float32 matrix, a np.memmap if it exceeds the memory budget and
+            spilling is allowed.
+        """
+        n_rows = vectors.shape[0]
+        matrix = self._allocate(n_rows, spill)
+
+        for start, stop, block in self.iter_blocks(vectors):
+            block_rows = np.arange(stop - start)
+            if metrics is not None:
+                off_diagonal = np.ones(block.shape, dtype=bool)
+                off_diagonal[block_rows, block_rows + start] = False
+                metrics.add_many(block[off_diagonal])
+
+            block[block_rows, block_rows + start] = 1.0
+            if distance:
+                np.subtract(1.0, block, out=block)
+                np.maximum(block, 0, out=block)
+            matrix[start:stop] = block
+
+        if isinstance(matrix, np.memmap):
+            matrix.flush()
+        return matrix
+
+    def cleanup(self):
+        """Delete memory-mapped matrices created by this builder."""
+        for path in self.spilled_files:
+            try:
+                os.remove(path)
+            except OSError as e:
+                self.logger.warning(
+                    "Could not remove similarity matrix %s: %s", path, str(e))
+        self.spilled_files = []
@@ -6,6 +6,7 @@ from .lsa import LSASimilarity
 from .enhanced_jaccard import EnhancedJaccardSimilarity
 from .lda import LDASimilarity
 from .bert_similarity import BERTSimilarity
+from .similarity_metrics import SimilarityMetricsSink
 
 __all__ = [
     'SimilarityStrategy',
@@ -13,5 +14,6 @@ __all__ = [
     'LSASimilarity',
     'EnhancedJaccardSimilarity',
     'LDASimilarity',
-    'BERTSimilarity'
+    'BERTSimilarity',
+    'SimilarityMetricsSink'
 ]
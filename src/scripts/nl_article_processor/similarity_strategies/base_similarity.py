@@ -1,26 +1,34 @@
 """Base class for similarity strategies."""
 from abc import ABC, abstractmethod
-from typing import Set, Dict, Any, List
-import os
+from typing import Set, Dict, Any, List, Tuple
+import hashlib
 import json
-from datetime import datetime
+import os
 
 from nl_utils.logger_config import get_logger, get_module_name
+from nl_utils.file_handler import FileHandler, FileType
+from .similarity_metrics import SimilarityMetricsSink
 
 
 class SimilarityStrategy(ABC):
     """Abstract base class for similarity calculation strategies."""
 
+    # Attributes holding fitted models that can be cached between runs
+    MODEL_ATTRIBUTES: Tuple[str, ...] = ()
+
     def __init__(self, params: Dict[str, Any]):
         """Initialize the similarity strategy.
 
         Args:
             params (Dict[str, Any]): Parameters for the similarity strategy.
+                May contain:
+                - metrics_params (Dict[str, Any]): Parameters for the similarity metrics sink.
         """
         self.params = params
         self.logger = get_logger(get_module_name(__name__))
         self.corpus = None
-        self.similarity_log = []
+        self.similarity_metrics = SimilarityMetricsSink(
+            params.get('metrics_params'))
         self.similarity_log_dir = 'src/outputs/logs/similarity_logs/'
         os.makedirs(self.similarity_log_dir, exist_ok=True)
 
@@ -33,47 +41,141 @@ class SimilarityStrategy(ABC):
         self.corpus = corpus
 
     def log_similarity(self, similarity: float):
-        """Log similarity calculation and save to file.
+        """Record a similarity calculation in the metrics sink.
 
         Args:
             similarity (float): Calculated similarity score.
         """
-        log_entry = {
-            'similarity': similarity,
-        }
-        self.similarity_log.append(log_entry)
-        self.logger.debug(
-            "Similarity between articles: %s",
-            similarity
-        )
+        self.similarity_metrics.add(similarity)
 
     def save_similarity_log(self):
-        """Save the similarity log to a JSON file."""
-        if not self.similarity_log:
-            self.logger.warning("No similarity calculations to save")
-            return
-
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        filename = f"similarity_log_{self.__class__.__name__}_{timestamp}.json"
-        filepath = 'src/outputs/logs/similarity_logs/' + filename
-
+        """Save the similarity metrics summary to an NPZ file."""
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(self.similarity_log, f, ensure_ascii=False, indent=2)
-            self.logger.info(
-                "Saved similarity log to %s",
-                filepath
-            )
+            filepath = self.similarity_metrics.save(
+                self.similarity_log_dir, self.__class__.__name__)
+            if filepath:
+                self.logger.info(
+                    "Saved similarity log to %s",
+                    filepath
+                )
         except Exception as e:
             self.logger.error(
                 "Failed to save similarity log: %s",
                 str(e)
             )
 
+    @staticmethod
+    def build_corpus(articles: List[Dict[str, Any]]) -> List[str]:
+        """Build the corpus of a day's articles.
+
+        Every stage fitting a strategy on the day's articles builds the corpus
+        here, so they share the same fitted model.
+
+        Args:
+            articles (List[Dict[str, Any]]): Articles with their lemmas.
+
+        Returns:
+            List[str]: Space-joined lemmas, one document per unique article ID.
+        """
+        articles_lemmas = {
+            article['article_id']: article.get('article_lemmas', [])
+            for article in articles
+        }
+        return [' '.join(lemmas) for lemmas in articles_lemmas.values()]
+
+    def model_params(self) -> Dict[str, Any]:
+        """Get the parameters that determine the fitted model.
+
+        Returns:
+            Dict[str, Any]: The strategy parameters, without the metrics settings.
+        """
+        return {key: value for key, value in self.params.items() if key != 'metrics_params'}
+
+    def get_corpus_hash(self) -> str:
+        """Get a hash identifying the corpus and the strategy parameters.
+
+        Returns:
+            str: Hex digest of the strategy name, model parameters and corpus.
+        """
+        digest = hashlib.sha256()
+        digest.update(self.__class__.__name__.encode())
+        digest.update(json.dumps(self.model_params(), sort_keys=True, default=str).encode())
+        for document in self.corpus or []:
+            digest.update(document.encode())
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def fit_cached(self, date_str: str):
+        """Fit the strategy, reusing a cached model when the corpus is unchanged.
+
+        Fitted models are stored next to the article groups for the date and
+        keyed by the corpus hash, so later stages and re-runs skip refitting.
+
+        Args:
+            date_str (str): Date string in YYYY-MM-DD format.
+        """
+        if not self.MODEL_ATTRIBUTES:
+            self.fit()
+            return
+
+        file_handler = FileHandler()
+        base_name = f"similarity_model_{self.__class__.__name__}"
+        corpus_hash = self.get_corpus_hash()
+
+        try:
+            cached = file_handler.load_file(
+                FileType.SIMILARITY_MODEL, date_str=date_str, base_name=base_name)
+            if cached.get('corpus_hash') == corpus_hash:
+                for attribute in self.MODEL_ATTRIBUTES:
+                    setattr(self, attribute, cached['models'][attribute])
+                self.logger.info(
+                    "Reusing cached %s model for %s", self.__class__.__name__, date_str)
+                return
+            self.logger.info("Corpus changed, refitting %s", self.__class__.__name__)
+        except FileNotFoundError:
+            self.logger.info("No cached %s model found", self.__class__.__name__)
+        except Exception as e:
+            self.logger.warning("Could not load cached model: %s", str(e))
+
+        self.fit()
+        try:
+            file_handler.save_file(
+                {
+                    'corpus_hash': corpus_hash,
+                    'models': {
+                        attribute: getattr(self, attribute)
+                        for attribute in self.MODEL_ATTRIBUTES
+                    }
+                },
+                FileType.SIMILARITY_MODEL,
+                date_str=date_str,
+                base_name=base_name
+            )
+        except Exception as e:
+            self.logger.warning("Could not cache fitted model: %s", str(e))
+
     @abstractmethod
     def fit(self):
         """Fit the similarity strategy on the corpus."""
 
+    def transform_documents(self, documents: List[Set[str]]) -> Any:
+        """Transform documents into vectors for batch similarity computation.
+
+        The cosine similarity between two transformed documents must equal the
+        score returned by calculate_similarity for the same pair.
+
+        Args:
+            documents (List[Set[str]]): List of lemma sets.
+
+        Returns:
+            Any: Dense array or sparse matrix with one row per document.
+
+        Raises:
+            NotImplementedError: If the strategy is not vector based.
+        """
+        raise NotImplementedError(
+            f'{self.__class__.__name__} does not support document vectors')
+
     @abstractmethod
     def calculate_similarity(self, article1: Set[str], article2: Set[str]) -> float:
         """Calculate similarity between two sets of lemmas.
@@ -1,5 +1,5 @@
 """Sentence-BERT similarity strategy implementation."""
-from typing import Set, Dict, Any
+from typing import Set, Dict, Any, List
 
 from sentence_transformers import SentenceTransformer
 from sklearn.metrics.pairwise import cosine_similarity
@@ -30,6 +30,18 @@ class BERTSimilarity(SimilarityStrategy):
         Note: BERT models are pre-trained, so no fitting is needed.
         """
 
+    def transform_documents(self, documents: List[Set[str]]) -> Any:
+        """Transform documents into sentence embeddings.
+
+        Args:
+            documents (List[Set[str]]): List of lemma sets.
+
+        Returns:
+            Any: Array of embeddings, one row per document.
+        """
+        documents_str = [' '.join(document) for document in documents]
+        return self.model.encode(documents_str)
+
     def calculate_similarity(self, article1: Set[str], article2: Set[str]) -> float:
         """Calculate BERT-based similarity between two articles.
 
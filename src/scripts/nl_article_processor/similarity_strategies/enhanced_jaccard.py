@@ -1,5 +1,5 @@
 """Enhanced Jaccard similarity strategy implementation."""
-from typing import Set, Dict, Any
+from typing import Set, Dict, Any, List
 
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
@@ -10,6 +10,8 @@ from .base_similarity import SimilarityStrategy
 class EnhancedJaccardSimilarity(SimilarityStrategy):
     """Enhanced Jaccard similarity with TF-IDF weighting."""
 
+    MODEL_ATTRIBUTES = ('vectorizer',)
+
     def __init__(self, params: Dict[str, Any]):
         """Initialize the enhanced Jaccard similarity strategy.
 
@@ -26,6 +28,18 @@ class EnhancedJaccardSimilarity(SimilarityStrategy):
         else:
             raise ValueError('Corpus is empty')
 
+    def transform_documents(self, documents: List[Set[str]]) -> Any:
+        """Transform documents into TF-IDF vectors.
+
+        Args:
+            documents (List[Set[str]]): List of lemma sets.
+
+        Returns:
+            Any: Sparse TF-IDF matrix, one row per document.
+        """
+        documents_str = [' '.join(document) for document in documents]
+        return self.vectorizer.transform(documents_str)
+
     def calculate_similarity(self, article1: Set[str], article2: Set[str]) -> float:
         """Calculate enhanced Jaccard similarity with TF-IDF weighting.
 
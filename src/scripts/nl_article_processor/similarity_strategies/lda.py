@@ -1,5 +1,5 @@
 """Latent Dirichlet Allocation (LDA) similarity strategy implementation."""
-from typing import Set, Dict, Any
+from typing import Set, Dict, Any, List
 
 from sklearn.feature_extraction.text import CountVectorizer
 from sklearn.decomposition import LatentDirichletAllocation
@@ -8,9 +8,16 @@ from sklearn.metrics.pairwise import cosine_similarity
 from .base_similarity import SimilarityStrategy
 
 
+def identity_analyzer(document):
+    """Return the document unchanged, used as a picklable vectorizer analyzer."""
+    return document
+
+
 class LDASimilarity(SimilarityStrategy):
     """Latent Dirichlet Allocation (LDA) based similarity."""
 
+    MODEL_ATTRIBUTES = ('vectorizer', 'lda')
+
     def __init__(self, params: Dict[str, Any]):
         """Initialize LDA similarity strategy.
 
@@ -23,7 +30,7 @@ class LDASimilarity(SimilarityStrategy):
         super().__init__(params)
         self.n_topics = params.get('n_topics', 10)
         self.max_iter = params.get('max_iter', 10)
-        self.vectorizer = CountVectorizer(analyzer=lambda x: x)
+        self.vectorizer = CountVectorizer(analyzer=identity_analyzer)
         self.lda = LatentDirichletAllocation(
             n_components=self.n_topics,
             max_iter=self.max_iter,
@@ -50,6 +57,18 @@ class LDASimilarity(SimilarityStrategy):
         self.fit_vectorizer()
         self.fit_lda()
 
+    def transform_documents(self, documents: List[Set[str]]) -> Any:
+        """Transform documents into topic distributions.
+
+        Args:
+            documents (List[Set[str]]): List of lemma sets.
+
+        Returns:
+            Any: Array of topic distributions, one row per document.
+        """
+        documents_str = [' '.join(document) for document in documents]
+        return self.lda.transform(self.vectorizer.transform(documents_str))
+
     def calculate_similarity(self, article1: Set[str], article2: Set[str]) -> float:
         """Calculate LDA-based similarity between two articles.
 
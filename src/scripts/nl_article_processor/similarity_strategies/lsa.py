@@ -1,5 +1,5 @@
 """Latent Semantic Analysis (LSA) similarity strategy implementation."""
-from typing import Set, Dict, Any
+from typing import Set, Dict, Any, List
 
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.decomposition import TruncatedSVD
@@ -11,20 +11,39 @@ from .base_similarity import SimilarityStrategy
 class LSASimilarity(SimilarityStrategy):
     """Latent Semantic Analysis (LSA) based similarity."""
 
+    MODEL_ATTRIBUTES = ('vectorizer', 'lsa')
+
+    # Parameters of the article group stage, shared by stages that reuse its model
+    DEFAULT_PARAMS = {'n_components': 80, 'random_state': 42}
+
     def __init__(self, params: Dict[str, Any]):
         """Initialize LSA similarity strategy.
 
         Args:
             params (Dict[str, Any]): Parameters for the similarity strategy.
-                Must contain:
+                May contain:
                 - n_components (int): Number of components for LSA.
+                - random_state (int): Seed of the SVD, so a refit on the same corpus gives
+                  the same basis.
         """
         super().__init__(params)
-        self.n_components = params.get('n_components', 100)
+        self.n_components = params.get('n_components', self.DEFAULT_PARAMS['n_components'])
         self.vectorizer = TfidfVectorizer(analyzer='word',)
-        self.lsa = TruncatedSVD(n_components=self.n_components)
+        self.random_state = params.get('random_state', self.DEFAULT_PARAMS['random_state'])
+        self.lsa = TruncatedSVD(
+            n_components=self.n_components,
+            random_state=self.random_state
+        )
         # Fit the vectorizer on the corpus
 
+    def model_params(self) -> Dict[str, Any]:
+        """Get the parameters that determine the fitted model.
+
+        Returns:
+            Dict[str, Any]: The effective SVD parameters.
+        """
+        return {'n_components': self.n_components, 'random_state': self.random_state}
+
     def fit_vectorizer(self):
         """Fit the vectorizer on the corpus."""
         if self.corpus:
@@ -44,6 +63,18 @@ class LSASimilarity(SimilarityStrategy):
         self.fit_vectorizer()
         self.fit_lsa()
 
+    def transform_documents(self, documents: List[Set[str]]) -> Any:
+        """Transform documents into LSA space.
+
+        Args:
+            documents (List[Set[str]]): List of lemma sets.
+
+        Returns:
+            Any: Array of LSA vectors, one row per document.
+        """
+        documents_str = [' '.join(document) for document in documents]
+        return self.lsa.transform(self.vectorizer.transform(documents_str))
+
     def calculate_similarity(self, article1: Set[str], article2: Set[str]) -> float:
         """Calculate LSA-based similarity between two articles.
 
@@ -0,0 +1,198 @@
+"""Streaming metrics sink for similarity scores."""
+import os
+from datetime import datetime
+from typing import Dict, Any, Iterable, Optional
+
+import numpy as np
+
+from nl_utils.logger_config import get_logger, get_module_name
+
+
+class SimilarityMetricsSink:
+    """Streaming summary of similarity scores with bounded memory.
+
+    Keeps a fixed-bin histogram, running moments and an optional reservoir
+    sample instead of every individual score. Quantiles are estimated from a
+    fine-grained sketch histogram, so memory stays constant no matter how many
+    comparisons are recorded.
+    """
+
+    QUANTILE_LEVELS = (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)
+
+    def __init__(self, params: Optional[Dict[str, Any]] = None):
+        """Initialize the metrics sink.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Parameters for the sink.
+                May contain:
+                - n_bins (int): Number of histogram bins for plotting.
+                - sketch_bins (int): Number of bins used for quantile estimation.
+                - value_range (Tuple[float, float]): Range of similarity values.
+                - reservoir_size (int): Size of the reservoir sample, 0 disables it.
+                - seed (int): Seed for the reservoir sampler.
+                - buffer_size (int): Number of single scores buffered before flushing.
+        """
+        params = params or {}
+        self.logger = get_logger(get_module_name(__name__))
+        self.n_bins = params.get('n_bins', 50)
+        self.sketch_bins = params.get('sketch_bins', 2000)
+        self.value_range = tuple(params.get('value_range', (-1.0, 1.0)))
+        self.reservoir_size = params.get('reservoir_size', 1000)
+        self.rng = np.random.default_rng(params.get('seed', 42))
+        self.buffer_size = params.get('buffer_size', 4096)
+        self.reset()
+
+    def reset(self):
+        """Clear all recorded metrics."""
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.min_value = np.inf
+        self.max_value = -np.inf
+        self.bin_edges = np.linspace(
+            self.value_range[0], self.value_range[1], self.n_bins + 1)
+        self.bin_counts = np.zeros(self.n_bins, dtype=np.int64)
+        self.sketch_edges = np.linspace(
+            self.value_range[0], self.value_range[1], self.sketch_bins + 1)
+        self.sketch_counts = np.zeros(self.sketch_bins, dtype=np.int64)
+        self.reservoir = np.empty(self.reservoir_size, dtype=np.float32)
+        self._buffer = []
+
+    def add(self, similarity: float):
+        """Record a single similarity score.
+
+        Scores are buffered and folded into the histograms in batches.
+
+        Args:
+            similarity (float): Similarity score to record.
+        """
+        self._buffer.append(similarity)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Fold buffered single scores into the summary."""
+        if self._buffer:
+            buffered = self._buffer
+            self._buffer = []
+            self.add_many(buffered)
+
+    def add_many(self, similarities: Iterable[float]):
+        """Record a batch of similarity scores.
+
+        Args:
+            similarities (Iterable[float]): Similarity scores to record.
+        """
+        values = np.asarray(
+            similarities if isinstance(similarities, np.ndarray) else list(similarities),
+            dtype=np.float64).ravel()
+        if values.size == 0:
+            return
+
+        clipped = np.clip(values, self.value_range[0], self.value_range[1])
+        self.bin_counts += np.histogram(clipped, bins=self.bin_edges)[0]
+        self.sketch_counts += np.histogram(clipped, bins=self.sketch_edges)[0]
+
+        self.total += float(values.sum())
+        self.total_sq += float(np.square(values).sum())
+        self.min_value = min(self.min_value, float(values.min()))
+        self.max_value = max(self.max_value, float(values.max()))
+
+        self._update_reservoir(values)
+        self.count += values.size
+
+    def _update_reservoir(self, values: np.ndarray):
+        """Update the reservoir sample using Algorithm R.
+
+        Args:
+            values (np.ndarray): New values, not yet included in self.count.
+        """
+        if self.reservoir_size <= 0:
+            return
+
+        # Fill the reservoir until it is full
+        filled = min(self.count, self.reservoir_size)
+        n_fill = min(self.reservoir_size - filled, values.size)
+        if n_fill > 0:
+            self.reservoir[filled:filled + n_fill] = values[:n_fill]
+
+        # Replace existing samples with decreasing probability
+        rest = values[n_fill:]
+        if rest.size == 0:
+            return
+        seen = self.count + n_fill + np.arange(1, rest.size + 1)
+        slots = (self.rng.random(rest.size) * seen).astype(np.int64)
+        keep = slots < self.reservoir_size
+        self.reservoir[slots[keep]] = rest[keep]
+
+    def quantiles(self, levels: Iterable[float] = QUANTILE_LEVELS) -> np.ndarray:
+        """Estimate quantiles from the sketch histogram.
+
+        Args:
+            levels (Iterable[float]): Quantile levels between 0 and 1.
+
+        Returns:
+            np.ndarray: Estimated quantile values.
+        """
+        self.flush()
+        levels = np.asarray(list(levels), dtype=np.float64)
+        if self.count == 0:
+            return np.full(levels.shape, np.nan)
+        cumulative = np.concatenate(([0], np.cumsum(self.sketch_counts)))
+        return np.interp(levels * self.count, cumulative, self.sketch_edges)
+
+    def summary(self) -> Dict[str, Any]:
+        """Get a summary of the recorded metrics.
+
+        Returns:
+            Dict[str, Any]: Summary statistics.
+        """
+        self.flush()
+        if self.count == 0:
+            return {'count': 0}
+        mean = self.total / self.count
+        variance = max(self.total_sq / self.count - mean ** 2, 0.0)
+        return {
+            'count': self.count,
+            'mean': mean,
+            'std': variance ** 0.5,
+            'min': self.min_value,
+            'max': self.max_value,
+            'quantiles': dict(zip(self.QUANTILE_LEVELS,
+                                  self.quantiles().tolist()))
+        }
+
+    def save(self, log_dir: str, name: str) -> Optional[str]:
+        """Save the metrics summary to a compressed NPZ file.
+
+        Args:
+            log_dir (str): Directory to save the summary in.
+            name (str): Name used in the file name, usually the strategy class.
+
+        Returns:
+            Optional[str]: Path to the saved file, or None if nothing was recorded.
+        """
+        self.flush()
+        if self.count == 0:
+            self.logger.warning("No similarity calculations to save")
+            return None
+
+        os.makedirs(log_dir, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        filepath = os.path.join(log_dir, f"similarity_log_{name}_{timestamp}.npz")
+
+        summary = self.summary()
+        np.savez_compressed(
+            filepath,
+            count=np.int64(self.count),
+            mean=np.float64(summary['mean']),
+            std=np.float64(summary['std']),
+            min=np.float64(self.min_value),
+            max=np.float64(self.max_value),
+            bin_edges=self.bin_edges,
+            bin_counts=self.bin_counts,
+            quantile_levels=np.asarray(self.QUANTILE_LEVELS),
+            quantile_values=self.quantiles(),
+            reservoir=self.reservoir[:min(self.count, self.reservoir_size)]
+        )
+        return filepath
@@ -3,7 +3,10 @@
 Module for processing text and extracting lemmas from Icelandic text.
 """
 import json
+import multiprocessing
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Optional, Set
 from reynir import Greynir
@@ -36,6 +39,32 @@ def load_stopwords() -> Set[str]:
 # Load stopwords from JSON file
 ICELANDIC_STOPWORDS = load_stopwords()
 
+# Text processor of a lemmatization worker process
+_worker_processor = None
+
+
+def _init_lemma_worker(debug_mode: bool):
+    """Create the text processor of a lemmatization worker process.
+
+    Args:
+        debug_mode (bool): Whether to run in debug mode.
+    """
+    global _worker_processor
+    _worker_processor = TextProcessor(debug_mode=debug_mode)
+
+
+def _extract_lemmas_in_worker(text: str, article_source: str) -> List[str]:
+    """Extract lemmas with the text processor of the worker process.
+
+    Args:
+        text (str): Input text to process.
+        article_source (str): Source of the article for logging.
+
+    Returns:
+        List[str]: List of lemmas from the text.
+    """
+    return _worker_processor.extract_lemmas(text, article_source)
+
 
 class TextProcessor:
     """Class for processing text and extracting lemmas from Icelandic text."""
@@ -183,3 +212,65 @@ class TextProcessor:
             self.logger.error(
                 "Error extracting lemmas from %s: %s", article_source, str(e))
             return []
+
+    def create_lemma_pool(self, max_workers: Optional[int] = None) -> Optional[ProcessPoolExecutor]:
+        """Create a pool of lemmatization worker processes.
+
+        Each worker builds its Greynir instance once, so a pool that is kept
+        for several batches pays the start-up cost only once. Workers are
+        spawned rather than forked: the pool starts its processes on the first
+        submit, which may come from a worker thread while other threads hold
+        locks, and a forked child would inherit those locks held.
+
+        Args:
+            max_workers (Optional[int]): Maximum number of worker processes, the CPU count if None.
+
+        Returns:
+            Optional[ProcessPoolExecutor]: The pool, or None if a single worker would be used.
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers <= 1:
+            return None
+        return ProcessPoolExecutor(max_workers=max_workers,
+                                   mp_context=multiprocessing.get_context('spawn'),
+                                   initializer=_init_lemma_worker, initargs=(self.debug_mode,))
+
+    def extract_lemmas_batch(self, texts: List[str], article_source: str = 'Unknown',
+                             max_workers: Optional[int] = None,
+                             executor: Optional[ProcessPoolExecutor] = None) -> List[List[str]]:
+        """Extract lemmas from several texts in parallel.
+
+        Parsing is CPU-bound, so texts are spread over worker processes that
+        each hold their own Greynir instance.
+
+        Args:
+            texts (List[str]): Input texts to process.
+            article_source (str): Source of the articles for logging.
+            max_workers (Optional[int]): Maximum number of worker processes, the CPU count if None.
+            executor (Optional[ProcessPoolExecutor]): Pool from create_lemma_pool to reuse. A
+                pool is created for this batch if None.
+
+        Returns:
+            List[List[str]]: Lemmas of each text, in the same order as the texts.
+        """
+        if executor is not None:
+            try:
+                return list(executor.map(
+                    _extract_lemmas_in_worker, texts, [article_source] * len(texts)))
+            except Exception as e:
+                self.logger.warning(
+                    "Parallel lemma extraction failed, falling back to serial: %s", str(e))
+                return [self.extract_lemmas(text, article_source) for text in texts]
+
+        max_workers = min(max_workers or os.cpu_count() or 1, len(texts))
+        if max_workers <= 1:
+            return [self.extract_lemmas(text, article_source) for text in texts]
+
+        try:
+            with self.create_lemma_pool(max_workers) as executor:
+                return list(executor.map(
+                    _extract_lemmas_in_worker, texts, [article_source] * len(texts)))
+        except Exception as e:
+            self.logger.warning(
+                "Parallel lemma extraction failed, falling back to serial: %s", str(e))
+            return [self.extract_lemmas(text, article_source) for text in texts]
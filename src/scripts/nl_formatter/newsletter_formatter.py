@@ -16,11 +16,18 @@ logger = get_logger(get_module_name(__name__))
 class NewsletterFormatter:
     """Class for formatting newsletter content."""
 
-    def __init__(self):
-        """Initialize the newsletter formatter."""
+    def __init__(self, params: Optional[Dict[str, Any]] = None):
+        """Initialize the newsletter formatter.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Parameters for the formatter.
+                May contain:
+                - context (PipelineContext): Context that hands stage outputs between stages.
+        """
+        params = params or {}
         self.logger = get_logger(get_module_name(__name__))
         self.template = NewsletterTemplate()
-        self.file_handler = FileHandler()
+        self.file_handler = FileHandler({'context': params.get('context')})
 
     def _create_group_urls_mapping(self, article_groups: Dict[str, Any]) -> Dict[str, List[str]]:
         """Create a mapping of group IDs to their URLs.
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Module for summarizing article groups using OpenAI.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from nl_utils.logger_config import get_logger, get_module_name
+from nl_utils.llm_client import LLMClient
+
+
+class GroupSummarizer:
+    """Class for summarizing article groups with concurrent OpenAI requests.
+
+    This is the map step of map-reduce generation: each group is summarized
+    by a cheap model, and the final newsletter is composed from the compact
+    summaries. Responses are cached by the LLMClient, so re-runs only
+    summarize changed groups.
+    """
+
+    def __init__(self, params: Optional[Dict[str, Any]] = None):
+        """Initialize the GroupSummarizer.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Parameters for the group summarizer.
+                May contain:
+                - model (str): Model used to summarize groups.
+                - max_workers (int): Maximum number of concurrent summary requests.
+                - max_tokens (int): Maximum tokens in each summary.
+        """
+        params = params or {}
+        self.logger = get_logger(get_module_name(__name__))
+        self.model = params.get('model', "gpt-4.1-mini")
+        self.max_workers = params.get('max_workers', 8)
+        self.max_tokens = params.get('max_tokens', 400)
+        self._client = None
+
+    @property
+    def client(self) -> LLMClient:
+        """LLM client shared by all summary requests."""
+        if self._client is None:
+            self._client = LLMClient.shared()
+        return self._client
+
+    def summarize_group(self, group_text: str, prompt_template: str) -> Optional[str]:
+        """Summarize a single article group.
+
+        Args:
+            group_text (str): Formatted articles of the group.
+            prompt_template (str): Template for the group summary prompt.
+
+        Returns:
+            Optional[str]: Summary of the group, or None if generation fails.
+        """
+        try:
+            prompt = prompt_template.format(group_articles=group_text)
+            response = self.client.complete(
+                model=self.model,
+                messages=[{"role": "system", "content": prompt}],
+                label='group_summary',
+                temperature=0.1,
+                max_tokens=self.max_tokens
+            )
+            summary = response['content'].strip()
+            return summary or None
+
+        except Exception as e:
+            self.logger.error("Error summarizing group: %s", str(e))
+            return None
+
+    def summarize_groups(self, group_texts: List[str], prompt_template: str) -> List[Optional[str]]:
+        """Summarize several article groups concurrently.
+
+        Args:
+            group_texts (List[str]): Formatted articles of each group.
+            prompt_template (str): Template for the group summary prompt.
+
+        Returns:
+            List[Optional[str]]: Summaries in the same order as the groups, None where
+            generation failed.
+        """
+        if not group_texts:
+            return []
+
+        self.logger.info(
+            "Summarizing %d groups with up to %d concurrent requests",
+            len(group_texts), self.max_workers)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(
+                lambda group_text: self.summarize_group(group_text, prompt_template),
+                group_texts
+            ))
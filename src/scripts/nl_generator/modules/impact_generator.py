@@ -2,31 +2,99 @@
 """
 Module for generating impacts for newsletter items.
 """
-from typing import Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from nl_utils.logger_config import get_logger, get_module_name
 from nl_utils.file_handler import FileHandler, FileType
+from nl_utils.llm_client import LLMClient
+
+
+def index_article_groups(article_groups: Dict) -> Dict[str, Dict]:
+    """Index article groups by group ID.
+
+    Args:
+        article_groups (Dict): The article groups.
+
+    Returns:
+        Dict[str, Dict]: Groups keyed by their group number.
+    """
+    return {
+        group['details']['group_number']: group
+        for group in article_groups.get('groups', [])
+        if group.get('details', {}).get('group_number')
+    }
 
 
 class ImpactGenerator:
     """Class for generating impacts for newsletter items."""
 
-    def __init__(self, debug_mode: bool = False):
+    def __init__(self, debug_mode: bool = False, params: Optional[Dict[str, Any]] = None):
         """Initialize the ImpactGenerator.
 
         Args:
             debug_mode (bool): Whether to run in debug mode.
+            params (Optional[Dict[str, Any]]): Parameters for the impact generator.
+                May contain:
+                - use_llm (bool): Whether to write impacts with an LLM instead of the
+                  article and source summary.
+                - model (str): Model used for LLM impacts.
+                - max_workers (int): Maximum number of concurrent LLM impact requests.
+                - context (PipelineContext): Context that hands stage outputs between stages.
         """
+        params = params or {}
         self.logger = get_logger(get_module_name(__name__))
         self.debug_mode = debug_mode
-        self.file_handler = FileHandler()
+        self.file_handler = FileHandler({'context': params.get('context')})
+        self.use_llm = params.get('use_llm', False)
+        self.model = params.get('model', "gpt-4.1-mini")
+        self.max_workers = params.get('max_workers', 8)
+
+    def _load_groups_by_id(self, date_str: Optional[str]) -> Dict[str, Dict]:
+        """Load the article groups for a date once and index them by group ID.
 
-    def generate_impacts(self, newsletter: Dict, ignore_impacts: bool = False) -> Dict:
+        Args:
+            date_str (Optional[str]): Date string in YYYY-MM-DD format.
+
+        Returns:
+            Dict[str, Dict]: Groups keyed by group ID, empty if they cannot be loaded.
+        """
+        try:
+            article_groups = self.file_handler.load_file(
+                FileType.ARTICLE_GROUPS,
+                date_str=date_str,
+                base_name="article_groups"
+            )
+        except Exception as e:
+            self.logger.error("No article groups found: %s", str(e))
+            return {}
+        return index_article_groups(article_groups or {})
+
+    def _get_group_id(self, item: Dict) -> Optional[str]:
+        """Get the ID of the best matching group of a news item.
+
+        Args:
+            item (Dict): The news item.
+
+        Returns:
+            Optional[str]: Group ID of the top match, or None if the item has no match.
+        """
+        matches = item.get('matches') or []
+        if matches:
+            return matches[0].get('group_id')
+        return item.get('match', {}).get('group_id')
+
+    def generate_impacts(self, newsletter: Dict, ignore_impacts: bool = False,
+                         groups_by_id: Optional[Dict[str, Dict]] = None,
+                         date_str: Optional[str] = None) -> Dict:
         """Generate impacts for newsletter items.
 
         Args:
             newsletter (Dict): The newsletter content.
             ignore_impacts (bool): Whether to skip impact generation and return placeholders.
+            groups_by_id (Optional[Dict[str, Dict]]): Article groups keyed by group ID. Loaded
+                once for date_str if None.
+            date_str (Optional[str]): Date of the article groups, used when groups_by_id is None.
 
         Returns:
             Dict: Newsletter with generated impacts.
@@ -44,7 +112,11 @@ class ImpactGenerator:
                                 item['impact_urls'] = []
                 return newsletter
 
-            # Process each category
+            if groups_by_id is None:
+                groups_by_id = self._load_groups_by_id(date_str or newsletter.get('date'))
+
+            # Collect the matched group of each item
+            jobs: List[Tuple[Dict, Dict]] = []
             for category in newsletter:
                 if not isinstance(newsletter[category], list):
                     continue
@@ -53,42 +125,36 @@ class ImpactGenerator:
                     if not isinstance(item, dict):
                         continue
 
-                    # Get the matched group ID
-                    match = item.get('match', {})
-                    group_id = match.get('group_id')
-
+                    group_id = self._get_group_id(item)
                     if not group_id:
                         self.logger.warning(
                             "No group ID found for item: %s", item.get('title', 'Unknown'))
                         continue
 
-                    # Load article group
-                    article_groups = self.file_handler.load_file(
-                        FileType.ARTICLE_GROUPS,
-                        date_str=newsletter.get('date'),
-                        base_name="article_groups"
-                    )
-
-                    if not article_groups:
-                        self.logger.error("No article groups found")
-                        continue
-
-                    # Find the matching group
-                    group = next(
-                        (g for g in article_groups.get('groups', [])
-                         if g['details']['group_number'] == group_id),
-                        None
-                    )
-
+                    group = groups_by_id.get(group_id)
                     if not group:
                         self.logger.warning(
                             "Group not found: %s", group_id)
                         continue
 
-                    # Generate impact based on group details
-                    impact = self._generate_impact_for_group(group)
-                    item['impact'] = impact
-                    item['impact_urls'] = group.get('urls', [])
+                    jobs.append((item, group))
+
+            # Generate impacts, concurrently when they come from an LLM
+            if self.use_llm and jobs:
+                prompt_template = self.file_handler.load_file(
+                    FileType.PROMPT, base_name="impact_prompt")
+                self.logger.info(
+                    "Generating %d LLM impacts with up to %d concurrent",
+                    len(jobs), self.max_workers)
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    impacts = list(executor.map(
+                        lambda job: self._generate_llm_impact(*job, prompt_template), jobs))
+            else:
+                impacts = [self._generate_impact_for_group(group) for _, group in jobs]
+
+            for (item, group), impact in zip(jobs, impacts):
+                item['impact'] = impact
+                item['impact_urls'] = group.get('urls', [])
 
             return newsletter
 
@@ -96,9 +162,46 @@ class ImpactGenerator:
             self.logger.error("Error generating impacts: %s", str(e))
             return newsletter
 
+    def _generate_llm_impact(self, item: Dict, group: Dict, prompt_template: str) -> str:
+        """Generate impact text for a news item with an LLM.
+
+        Falls back to the article and source summary if the request fails.
+
+        Args:
+            item (Dict): The news item.
+            group (Dict): The matched article group.
+            prompt_template (str): Template for the impact prompt.
+
+        Returns:
+            str: Generated impact text.
+        """
+        try:
+            articles = "\n".join(
+                f"- {article.get('source', '')}: {article.get('title', '')}\n"
+                f"  {article.get('description', '')}\n  {article.get('url', '')}"
+                for article in group.get('details', {}).get('articles', [])
+            )
+            prompt = prompt_template.format(
+                news_item=f"{item.get('title', '')}\n{item.get('description', '')}",
+                articles=articles or "\n".join(group.get('urls', []))
+            )
+            response = LLMClient.shared().complete(
+                model=self.model,
+                messages=[{"role": "system", "content": prompt}],
+                label='impact',
+                temperature=0.2
+            )
+            return response['content'].strip()
+
+        except Exception as e:
+            self.logger.error("Error generating LLM impact: %s", str(e))
+            return self._generate_impact_for_group(group)
+
     def _generate_impact_for_group(self, group: Dict) -> str:
         """Generate impact text for a group of articles.
 
+        The text is shown in the newsletter, so it is written in Icelandic.
+
         Args:
             group (Dict): The article group to generate impact for.
 
@@ -108,7 +211,7 @@ class ImpactGenerator:
         try:
             article_count = group['details'].get('article_count', 0)
             if article_count == 0:
-                return "No articles found in group"
+                return "Engar greinar fundust í hópnum"
 
             # Generate impact based on article count and sources
             sources = set(article['source']
@@ -116,12 +219,12 @@ class ImpactGenerator:
             source_count = len(sources)
 
             if article_count == 1:
-                return f"Single article from {next(iter(sources))}"
+                return f"Ein grein frá {next(iter(sources))}"
             elif source_count == 1:
-                return f"{article_count} articles from {next(iter(sources))}"
+                return f"{article_count} greinar frá {next(iter(sources))}"
             else:
-                return f"{article_count} articles from {source_count} different sources"
+                return f"{article_count} greinar frá {source_count} ólíkum miðlum"
 
         except Exception as e:
             self.logger.error("Error generating impact for group: %s", str(e))
-            return "Error generating impact"
+            return "Ekki tókst að meta áhrifin"
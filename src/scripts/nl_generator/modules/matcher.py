@@ -2,29 +2,54 @@
 """
 Module for matching news items with article groups.
 """
-from typing import Dict, Set, Tuple, List
+import hashlib
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Set, Tuple, List, Optional
 import numpy as np
 
 from nl_utils.logger_config import get_logger, get_module_name
 from nl_utils.file_handler import FileHandler, FileType
+from nl_utils.article_index import ArticleIndex
 from nl_article_processor.text_processor import TextProcessor
+from nl_article_processor.group_index import GroupIndex
 from nl_article_processor.similarity_strategies import LSASimilarity
 
 
 class Matcher:
     """Class for matching news items with article groups."""
 
-    def __init__(self, debug_mode: bool = False):
+    # Newsletter sections whose items are matched with article groups
+    MATCH_CATEGORIES = (
+        'key_events', 'domestic_news', 'foreign_news',
+        'business', 'famous_people', 'sports', 'arts', 'science'
+    )
+
+    def __init__(self, debug_mode: bool = False, params: Optional[Dict[str, Any]] = None):
         """Initialize the Matcher.
 
         Args:
             debug_mode (bool): Whether to run in debug mode.
+            params (Optional[Dict[str, Any]]): Parameters for the matcher.
+                May contain:
+                - lemma_workers (int): Maximum worker processes for lemmatization, CPU count
+                  if None.
+                - lemma_cache_ttl_days (float): Days cached item lemmas stay valid, 0 disables
+                  the cache.
+                - lemma_cache_name (str): Base name of the lemma cache file.
+                - context (PipelineContext): Context that hands stage outputs between stages.
         """
+        params = params or {}
         self.logger = get_logger(get_module_name(__name__))
         self.debug_mode = debug_mode
-        self.file_handler = FileHandler()
+        self.file_handler = FileHandler({'context': params.get('context')})
         self.text_processor = TextProcessor(debug_mode=debug_mode)
-        self.similarity_strategy = LSASimilarity(params={'n_components': 100})
+        # Same parameters as the article group stage, so its cached model is reused
+        self.similarity_strategy = LSASimilarity(params=dict(LSASimilarity.DEFAULT_PARAMS))
+        self.lemma_workers = params.get('lemma_workers')
+        self.lemma_cache_ttl = params.get('lemma_cache_ttl_days', 30) * 24 * 60 * 60
+        self.lemma_cache_name = params.get('lemma_cache_name', 'newsletter_lemma_cache')
 
         # Initialize article storage
         self.articles = None
@@ -32,6 +57,15 @@ class Matcher:
         self.current_date = None
         self.corpus_fitted = False
 
+        # Group centroids in the fitted LSA space, built once per date
+        self.group_index: Optional[GroupIndex] = None
+
+        # Lemma cache and worker pool, kept across batches until close()
+        self._lemma_cache: Optional[Dict[str, Dict]] = None
+        self._lemma_cache_changed = False
+        self._lemma_pool: Optional[ProcessPoolExecutor] = None
+        self._lemma_lock = threading.Lock()
+
     def _prepare_corpus(self, article_groups: Dict) -> None:
         """Prepare and fit the corpus for LSA similarity.
 
@@ -46,21 +80,17 @@ class Matcher:
         # Load articles if needed
         self._load_articles(article_groups.get('date'))
 
-        # Collect all article lemmas
-        corpus = []
-        for article in self.articles:
-            lemmas = article.get('article_lemmas', [])
-            if lemmas:
-                corpus.append(' '.join(lemmas))
+        # Collect all article lemmas, built the same way as the article group stage
+        corpus = self.similarity_strategy.build_corpus(self.articles)
 
-        if not corpus:
+        if not any(corpus):
             self.logger.error(
                 "No lemmas found in articles for corpus preparation")
             return
 
-        # Set and fit the corpus
+        # Set the corpus and reuse the fitted model when it is unchanged
         self.similarity_strategy.set_corpus(corpus)
-        self.similarity_strategy.fit()
+        self.similarity_strategy.fit_cached(article_groups.get('date'))
         self.corpus_fitted = True
         self.logger.info("Corpus prepared with %d documents", len(corpus))
 
@@ -73,20 +103,16 @@ class Matcher:
         if self.current_date == date_str and self.articles is not None:
             return
 
-        self.articles = self.file_handler.load_file(
-            FileType.ARTICLES,
-            date_str=date_str,
-            base_name="articles"
-        )
-        if not self.articles:
+        article_index = ArticleIndex.for_date(date_str, file_handler=self.file_handler)
+        if not article_index:
             self.logger.error(
                 "Failed to load articles file for date: %s", date_str)
             self.articles = []
             self.articles_dict = {}
             return
 
-        self.articles_dict = {article.get(
-            'article_id'): article for article in self.articles}
+        self.articles = article_index.articles
+        self.articles_dict = article_index.by_id
         self.current_date = date_str
         self.logger.debug("Loaded %d articles for date: %s",
                           len(self.articles), date_str)
@@ -116,75 +142,156 @@ class Matcher:
 
         return ' '.join(text_parts)
 
-    def _get_group_lemmas(self, group: Dict) -> Set[str]:
-        """Extract all lemmas from articles in a group.
-
-        Args:
-            group (Dict): The article group to process.
+    def _load_lemma_cache(self) -> Dict[str, Dict]:
+        """Load the lemma cache once and drop expired entries.
 
         Returns:
-            Set[str]: Set of lemmas from all articles in the group.
+            Dict[str, Dict]: Cache entries keyed by the hash of the item text.
         """
-        group_lemmas = set()
-        article_ids = group.get('article_ids', [])
+        if self._lemma_cache is not None:
+            return self._lemma_cache
+
+        cache = {}
+        if self.lemma_cache_ttl > 0:
+            try:
+                cache = self.file_handler.load_file(
+                    FileType.CACHE, base_name=self.lemma_cache_name)
+            except FileNotFoundError:
+                cache = {}
+            except Exception as e:
+                self.logger.warning("Could not load lemma cache: %s", str(e))
+
+        now = time.time()
+        self._lemma_cache = {
+            key: entry for key, entry in cache.items()
+            if now - entry.get('created_at', 0) < self.lemma_cache_ttl
+        }
+        return self._lemma_cache
+
+    def _lemmatize_items(self, texts: List[str]) -> List[List[str]]:
+        """Lemmatize news item texts as one batch, reusing cached lemmas.
+
+        The worker pool and the cache are kept for later batches, e.g. the
+        other sections of a streamed newsletter; call close() when done.
 
-        for article_id in article_ids:
-            article = self.articles_dict.get(article_id)
-            if article:
-                article_lemmas = article.get('article_lemmas', [])
-                if article_lemmas:
-                    group_lemmas.update(article_lemmas)
-
-        return group_lemmas
+        Args:
+            texts (List[str]): Texts of the news items.
 
-    def _calculate_group_probabilities(
-        self,
-        news_item_lemmas: Set[str],
-        article_groups: Dict,
-        temperature: float = 0.10
-    ) -> List[Tuple[str, float]]:
-        """Calculate probabilities for each group using softmax.
+        Returns:
+            List[List[str]]: Lemmas of each text, in the same order as the texts.
+        """
+        with self._lemma_lock:
+            cache = self._load_lemma_cache()
+            keys = [hashlib.sha256(text.encode()).hexdigest() for text in texts]
+            lemmas = [cache[key]['lemmas'] if key in cache else None for key in keys]
+            missing = [i for i, item_lemmas in enumerate(lemmas) if item_lemmas is None]
+
+            self.logger.info(
+                "Lemmatizing %d items: %d cached, %d to parse",
+                len(texts), len(texts) - len(missing), len(missing))
+            if not missing:
+                return lemmas
+
+            if self._lemma_pool is None and len(missing) > 1:
+                self._lemma_pool = self.text_processor.create_lemma_pool(self.lemma_workers)
+            new_lemmas = self.text_processor.extract_lemmas_batch(
+                [texts[i] for i in missing], 'newsletter', self.lemma_workers,
+                executor=self._lemma_pool)
+
+            now = time.time()
+            for i, item_lemmas in zip(missing, new_lemmas):
+                lemmas[i] = item_lemmas
+                # Empty results usually mean a parse failure and are retried next time
+                if item_lemmas:
+                    cache[keys[i]] = {'lemmas': item_lemmas, 'created_at': now}
+                    self._lemma_cache_changed = True
+
+            return lemmas
+
+    def save_lemma_cache(self):
+        """Save the lemma cache if new lemmas were added."""
+        with self._lemma_lock:
+            if not self._lemma_cache_changed or self.lemma_cache_ttl <= 0:
+                return
+            try:
+                self.file_handler.save_file(
+                    self._lemma_cache, FileType.CACHE, base_name=self.lemma_cache_name, indent=None)
+                self._lemma_cache_changed = False
+            except Exception as e:
+                self.logger.warning("Could not save lemma cache: %s", str(e))
+
+    def close(self):
+        """Save the lemma cache and shut down the lemmatization workers."""
+        self.save_lemma_cache()
+        with self._lemma_lock:
+            if self._lemma_pool is not None:
+                self._lemma_pool.shutdown(wait=True)
+                self._lemma_pool = None
+
+    def _load_group_index(self, article_groups: Dict) -> Optional[GroupIndex]:
+        """Load the group index for the date, built once and stored next to the groups.
 
         Args:
-            news_item_lemmas (Set[str]): Lemmas from the news item.
             article_groups (Dict): The article groups to match against.
-            temperature (float): Temperature parameter for softmax.
 
         Returns:
-            List[Tuple[str, float]]: List of (group_id, probability) tuples.
+            Optional[GroupIndex]: Index of the groups, or None if the groups are invalid.
         """
-        similarities = []
-        group_ids = []
+        date_str = article_groups.get('date')
+        if self.group_index is not None and self.group_index.date_str == date_str:
+            return self.group_index
 
-        # Get the groups list from the article_groups dictionary
         groups = article_groups.get('groups', [])
         if not isinstance(groups, list):
             self.logger.error(
                 "Article groups 'groups' is not a list: %s", type(groups))
-            return []
+            return None
 
-        # Load articles if needed
-        self._load_articles(article_groups.get('date'))
+        self.group_index = GroupIndex.for_date(
+            article_groups, self.similarity_strategy, self.file_handler)
+        return self.group_index
+
+    def _score_items(self, item_lemma_sets: List[Set[str]], article_groups: Dict) -> np.ndarray:
+        """Compute cosine similarities between news items and all groups.
+
+        All items are transformed in one call and scored against the group
+        centroids with one matrix product.
 
-        # Calculate similarities for all groups
-        for group in groups:
-            group_lemmas = self._get_group_lemmas(group)
-            if not group_lemmas:
-                continue
+        Args:
+            item_lemma_sets (List[Set[str]]): Lemmas of each news item.
+            article_groups (Dict): The article groups to match against.
 
-            similarity = self.similarity_strategy.calculate_similarity(
-                news_item_lemmas, group_lemmas)
+        Returns:
+            np.ndarray: Items x groups similarity matrix, columns in group index order.
+        """
+        group_index = self._load_group_index(article_groups)
+        if not group_index or not item_lemma_sets:
+            return np.zeros((len(item_lemma_sets), 0))
 
-            group_id = group.get('details', {}).get('group_number')
-            if group_id:
-                similarities.append(similarity)
-                group_ids.append(group_id)
+        similarities = group_index.score(
+            self.similarity_strategy.transform_documents(item_lemma_sets))
+        self.similarity_strategy.similarity_metrics.add_many(similarities.ravel())
+        return similarities
 
-        if not similarities:
+    def _similarities_to_probabilities(
+        self,
+        similarities: np.ndarray,
+        temperature: float = 0.10
+    ) -> List[Tuple[str, float]]:
+        """Turn one item's group similarities into sorted softmax probabilities.
+
+        Args:
+            similarities (np.ndarray): Similarity to each group, in group index order.
+            temperature (float): Temperature parameter for softmax.
+
+        Returns:
+            List[Tuple[str, float]]: List of (group_id, probability) tuples.
+        """
+        if len(similarities) == 0:
             return []
+        group_ids = self.group_index.group_ids
 
         # Apply softmax to get probabilities
-        similarities = np.array(similarities)
         exp_similarities = np.exp(similarities / temperature)
         probabilities = exp_similarities / np.sum(exp_similarities)
 
@@ -197,6 +304,25 @@ class Matcher:
                 "Group %s has probability %f", group_ids[i], probabilities[i])
         return [(group_ids[i], float(probabilities[i])) for i in sorted_indices]
 
+    def _calculate_group_probabilities(
+        self,
+        news_item_lemmas: Set[str],
+        article_groups: Dict,
+        temperature: float = 0.10
+    ) -> List[Tuple[str, float]]:
+        """Calculate probabilities for each group using softmax.
+
+        Args:
+            news_item_lemmas (Set[str]): Lemmas from the news item.
+            article_groups (Dict): The article groups to match against.
+            temperature (float): Temperature parameter for softmax.
+
+        Returns:
+            List[Tuple[str, float]]: List of (group_id, probability) tuples.
+        """
+        similarities = self._score_items([news_item_lemmas], article_groups)
+        return self._similarities_to_probabilities(similarities[0], temperature)
+
     def _select_matching_groups(
         self,
         group_probabilities: List[Tuple[str, float]]
@@ -230,6 +356,63 @@ class Matcher:
         threshold = mean_prob + 0.5 * std_prob
         return [g for g in group_probabilities if g[1] >= threshold]
 
+    def match_items(self, items: List[Dict], article_groups: Dict) -> List[Dict]:
+        """Match news items with article groups in one batch.
+
+        Args:
+            items (List[Dict]): News items, updated in place.
+            article_groups (Dict): The article groups.
+
+        Returns:
+            List[Dict]: The news items with match information.
+        """
+        self._prepare_corpus(article_groups)
+
+        # Process the text of all items to get lemmas
+        item_lemma_sets = [
+            set(lemmas) for lemmas in self._lemmatize_items(
+                [self._extract_news_item_text(item) for item in items])
+        ]
+
+        # Score all items against all groups at once
+        similarities = self._score_items(item_lemma_sets, article_groups)
+
+        for i, item in enumerate(items):
+            # Select matching groups
+            selected_groups = self._select_matching_groups(
+                self._similarities_to_probabilities(similarities[i]))
+
+            # Add match information
+            item['matches'] = [
+                {
+                    'group_id': group_id,
+                    'probability': prob
+                }
+                for group_id, prob in selected_groups
+            ]
+
+            self.logger.debug(
+                "Added match info for item %d: %d matches", i, len(selected_groups))
+
+        return items
+
+    def match_category(self, category: str, items: List[Dict], article_groups: Dict) -> List[Dict]:
+        """Match the news items of a single newsletter section with article groups.
+
+        Sections can be matched on their own, e.g. as soon as they finish
+        streaming from the model.
+
+        Args:
+            category (str): Name of the newsletter section.
+            items (List[Dict]): News items of the section, updated in place.
+            article_groups (Dict): The article groups.
+
+        Returns:
+            List[Dict]: The news items with match information.
+        """
+        self.logger.info("Matching items in category: %s", category)
+        return self.match_items(items, article_groups)
+
     def match_news_items(self, newsletter: Dict, article_groups: Dict) -> Dict:
         """Match news items with article groups using LSA similarity and softmax probabilities.
 
@@ -249,48 +432,14 @@ class Matcher:
             # Create a copy of the newsletter to modify
             matched_newsletter = newsletter.copy()
 
-            # Define categories to match
-            categories = [
-                '', 'key_events', 'domestic_news', 'foreign_news',
-                'business', 'famous_people', 'sports', 'arts', 'science'
+            # Match the items of all categories in one batch
+            items = [
+                item
+                for category in self.MATCH_CATEGORIES
+                for item in matched_newsletter.get(category, [])
             ]
-
-            # Match each category
-            for category in categories:
-                if category not in matched_newsletter:
-                    continue
-
-                self.logger.info("Matching items in category: %s", category)
-
-                # Process each item in the category
-                for i, item in enumerate(matched_newsletter[category]):
-                    # Extract text from the news item
-                    text = self._extract_news_item_text(item)
-
-                    # Process text to get lemmas
-                    lemmas = self.text_processor.extract_lemmas(
-                        text, 'newsletter')
-
-                    # Calculate probabilities for all groups
-                    group_probabilities = self._calculate_group_probabilities(
-                        set(lemmas), article_groups)
-
-                    # Select matching groups
-                    selected_groups = self._select_matching_groups(
-                        group_probabilities)
-
-                    # Add match information
-                    matched_newsletter[category][i]['matches'] = [
-                        {
-                            'group_id': group_id,
-                            'probability': prob
-                        }
-                        for group_id, prob in selected_groups
-                    ]
-
-                    self.logger.debug(
-                        "Added match info for %s item %d: %d matches",
-                        category, i, len(selected_groups))
+            self.logger.info("Matching %d items in one batch", len(items))
+            self.match_items(items, article_groups)
 
             return matched_newsletter
 
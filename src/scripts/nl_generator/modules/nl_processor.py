@@ -2,32 +2,43 @@
 """
 Module for processing newsletters with article matching and impact generation.
 """
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 from nl_utils.logger_config import get_logger, get_module_name
 from nl_utils.file_handler import FileHandler, FileType
 
 from .matcher import Matcher
-from .impact_generator import ImpactGenerator
+from .impact_generator import ImpactGenerator, index_article_groups
 from .impact_inserter import ImpactInserter
 
 
 class NLProcessor:
     """Class for processing newsletters with article matching and impact generation."""
 
-    def __init__(self, debug_mode: bool = False):
+    def __init__(self, debug_mode: bool = False, params: Optional[Dict[str, Any]] = None):
         """Initialize the NLProcessor.
 
         Args:
             debug_mode (bool): Whether to run in debug mode.
+            params (Optional[Dict[str, Any]]): Parameters for the processor.
+                May contain:
+                - impact_params (Dict[str, Any]): Parameters passed to the ImpactGenerator.
+                - context (PipelineContext): Context that hands stage outputs between stages.
         """
+        params = params or {}
         self.logger = get_logger(get_module_name(__name__))
         self.debug_mode = debug_mode
-        self.file_handler = FileHandler()
-        self.matcher = Matcher(debug_mode)
-        self.impact_generator = ImpactGenerator(debug_mode)
+        context = params.get('context')
+        self.file_handler = FileHandler({'context': context})
+        self.matcher = Matcher(debug_mode, {'context': context})
+        self.impact_generator = ImpactGenerator(
+            debug_mode, {**(params.get('impact_params') or {}), 'context': context})
         self.impact_inserter = ImpactInserter(debug_mode)
 
+    def close(self):
+        """Release the matcher's lemmatization workers and save its lemma cache."""
+        self.matcher.close()
+
     def run_matching(self, newsletter: Dict, article_groups: Dict, date_str: str) -> Optional[str]:
         """Run only the matching process on a newsletter.
 
@@ -88,9 +99,10 @@ class NLProcessor:
                 matched_newsletter['summary_impact_urls'] = []
                 return matched_newsletter
 
-            # Generate impacts
+            # Generate impacts from the groups indexed once by ID
+            groups_by_id = index_article_groups(article_groups)
             newsletter_with_impacts = self.impact_generator.generate_impacts(
-                matched_newsletter, ignore_impacts)
+                matched_newsletter, ignore_impacts, groups_by_id=groups_by_id)
 
             # Insert impacts
             processed_newsletter = self.impact_inserter.insert_impacts(
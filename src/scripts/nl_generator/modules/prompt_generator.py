@@ -3,25 +3,251 @@
 Module for generating prompts for newsletter generation.
 """
 import random
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Any, Set
 from datetime import datetime, timedelta
 
 from nl_utils.logger_config import get_logger, get_module_name
 from nl_utils.file_handler import FileHandler, FileType
+from nl_utils.article_index import ArticleIndex
+from nl_utils.token_counter import TokenCounter, count_tokens, truncate_tokens
+
+from .group_summarizer import GroupSummarizer
 
 
 class PromptGenerator:
     """Class for generating prompts for newsletter generation."""
 
-    def __init__(self, debug_mode: bool = False):
+    def __init__(self, debug_mode: bool = False, params: Optional[Dict[str, Any]] = None):
         """Initialize the PromptGenerator.
 
         Args:
             debug_mode (bool): Whether to run in debug mode.
+            params (Optional[Dict[str, Any]]): Parameters for the prompt builder.
+                May contain:
+                - token_budget (int): Maximum tokens for the article groups section, None disables it.
+                - max_article_tokens (int): Maximum tokens kept from each article text.
+                - duplicate_threshold (float): Word overlap above which an article in a group is
+                  considered a duplicate of an earlier one.
+                - source_weight (float): Weight of source diversity when ranking groups.
+                - approximate_tokens (bool): Whether to estimate token counts from text length.
+                - prompt_layout (str): 'cached' orders groups with a seeded shuffle, so re-runs
+                  produce the same prompt and hit provider prompt caching. 'shuffled' uses
+                  a new random order on every run.
+                - shuffle_seed (int): Seed combined with the date for the 'cached' layout.
+                - summarize_groups (bool): Whether to replace each group's articles with a
+                  summary from a cheap model (map-reduce generation).
+                - summary_params (Dict[str, Any]): Parameters for the GroupSummarizer.
+                - context (PipelineContext): Context that hands stage outputs between stages.
         """
+        params = params or {}
         self.logger = get_logger(get_module_name(__name__))
         self.debug_mode = debug_mode
-        self.file_handler = FileHandler()
+        self.file_handler = FileHandler({'context': params.get('context')})
+        self.token_budget = params.get('token_budget', 100000)
+        self.max_article_tokens = params.get('max_article_tokens', 1500)
+        self.duplicate_threshold = params.get('duplicate_threshold', 0.8)
+        self.source_weight = params.get('source_weight', 2.0)
+        self.summarize_groups = params.get('summarize_groups', False)
+        self.summarizer = GroupSummarizer(params.get('summary_params'))
+        self.approximate_tokens = params.get('approximate_tokens', False)
+        self.prompt_layout = params.get('prompt_layout', 'cached')
+        self.shuffle_seed = params.get('shuffle_seed', 0)
+
+    def estimate_tokens(self, text: str) -> int:
+        """Estimate the number of tokens in a text string.
+
+        Args:
+            text (str): The text to estimate tokens for.
+
+        Returns:
+            int: Estimated number of tokens.
+        """
+        return count_tokens(text, approximate=self.approximate_tokens)
+
+    def rank_groups(self, groups: List[Dict]) -> List[Dict]:
+        """Rank groups by size and source diversity.
+
+        Stories covered by many articles from several outlets come first, so
+        they are kept when the token budget runs out.
+
+        Args:
+            groups (List[Dict]): Article groups to rank.
+
+        Returns:
+            List[Dict]: Groups in descending order of importance.
+        """
+        def score(group: Dict) -> float:
+            articles = group.get('details', {}).get('articles', [])
+            sources = {article.get('source') for article in articles}
+            return len(group.get('article_ids', [])) + self.source_weight * len(sources)
+
+        return sorted(groups, key=score, reverse=True)
+
+    def _truncate_text(self, text: str) -> str:
+        """Truncate a text to the maximum number of tokens per article.
+
+        Args:
+            text (str): Article text.
+
+        Returns:
+            str: The text, cut at max_article_tokens if it is longer.
+        """
+        if not self.max_article_tokens:
+            return text
+        return truncate_tokens(text, self.max_article_tokens)
+
+    def _is_duplicate(self, words: Set[str], kept_words: List[Set[str]]) -> bool:
+        """Check whether an article text nearly duplicates an already kept text.
+
+        Args:
+            words (Set[str]): Words of the article text.
+            kept_words (List[Set[str]]): Words of the texts already kept in the group.
+
+        Returns:
+            bool: True if the overlap with a kept text exceeds the duplicate threshold.
+        """
+        for other in kept_words:
+            union = len(words | other)
+            if union and len(words & other) / union >= self.duplicate_threshold:
+                return True
+        return False
+
+    def format_group(self, group: Dict, article_index: ArticleIndex) -> Optional[str]:
+        """Format a single article group for the prompt.
+
+        Args:
+            group (Dict): Article group to format.
+            article_index (ArticleIndex): Index of the day's articles.
+
+        Returns:
+            Optional[str]: Formatted group, or None if the group has no articles.
+        """
+        articles_text = self.format_group_articles(group, article_index)
+        if not articles_text:
+            return None
+        return self._group_header(group) + articles_text
+
+    def _group_header(self, group: Dict) -> str:
+        """Get the header that opens a group in the prompt.
+
+        Args:
+            group (Dict): Article group.
+
+        Returns:
+            str: Group header.
+        """
+        group_number = group.get('details', {}).get(
+            'group_number', 'Unknown')
+        return f"\n{'='*80}\nGROUP {group_number}\n{'='*80}\n"
+
+    def format_group_articles(self, group: Dict, article_index: ArticleIndex) -> Optional[str]:
+        """Format the articles of a group.
+
+        Near-duplicate article texts are dropped and long texts are truncated.
+
+        Args:
+            group (Dict): Article group to format.
+            article_index (ArticleIndex): Index of the day's articles.
+
+        Returns:
+            Optional[str]: Formatted articles, or None if the group has no articles.
+        """
+        group_number = group.get('details', {}).get(
+            'group_number', 'Unknown')
+        formatted_group = ""
+
+        # Get article IDs from the group
+        article_ids = group.get('article_ids', [])
+        if not article_ids:
+            self.logger.warning(
+                "No article IDs found in group %s", group_number)
+            return None
+
+        # Process each article in the group
+        kept_words = []
+        for article_id in article_ids:
+            article = article_index.get(article_id)
+            if not article:
+                self.logger.warning(
+                    "Article not found: %s", article_id)
+                continue
+
+            text = article.get('article_text') or 'No content'
+            words = set(text.lower().split())
+            if self._is_duplicate(words, kept_words):
+                self.logger.debug(
+                    "Dropping near-duplicate article %s in group %s", article_id, group_number)
+                continue
+            kept_words.append(words)
+
+            # Article delimiter
+            formatted_group += f"\n{'-'*40}\n"
+            formatted_group += f"Title: {article.get('article_title', 'No title')}\n"
+            formatted_group += f"Content: {self._truncate_text(text)}\n"
+            formatted_group += f"{'-'*40}\n"
+
+        return formatted_group or None
+
+    def format_summarized_groups(self, groups: List[Dict], article_index: ArticleIndex) -> List[str]:
+        """Format groups as summaries written concurrently by a cheap model.
+
+        Groups are selected within the token budget before any are summarized,
+        counting each at its header plus the summary's maximum length, so only
+        groups that make it into the prompt are sent to the model. Groups whose
+        summary fails keep their formatted articles.
+
+        Args:
+            groups (List[Dict]): Article groups to format, most important first.
+            article_index (ArticleIndex): Index of the day's articles.
+
+        Returns:
+            List[str]: Formatted groups, in the same order as the selected groups.
+        """
+        group_texts = []
+        valid_groups = []
+        token_counter = TokenCounter(
+            self.token_budget, approximate=self.approximate_tokens)
+        for group in groups:
+            articles_text = self.format_group_articles(group, article_index)
+            if not articles_text:
+                continue
+            estimate = (token_counter.count(self._summary_header(group))
+                        + self.summarizer.max_tokens)
+            if not token_counter.fits(estimate):
+                continue
+            token_counter.total += estimate
+            group_texts.append(articles_text)
+            valid_groups.append(group)
+
+        self.logger.info(
+            "Summarizing %d of %d groups within the token budget", len(valid_groups), len(groups))
+        if not valid_groups:
+            return []
+
+        prompt_template = self.file_handler.load_file(
+            FileType.PROMPT, base_name="group_summary_prompt")
+        summaries = self.summarizer.summarize_groups(group_texts, prompt_template)
+
+        formatted_groups = []
+        for group, articles_text, summary in zip(valid_groups, group_texts, summaries):
+            if summary is None:
+                formatted_groups.append(self._group_header(group) + articles_text)
+                continue
+            formatted_groups.append(f"{self._summary_header(group)}{summary}\n")
+        return formatted_groups
+
+    def _summary_header(self, group: Dict) -> str:
+        """Get the text that precedes a group's summary in the prompt.
+
+        Args:
+            group (Dict): Article group.
+
+        Returns:
+            str: Group header, story name and article count.
+        """
+        group_name = group.get('details', {}).get('group_name', 'No title')
+        n_articles = len(group.get('article_ids', []))
+        return f"{self._group_header(group)}Story: {group_name}\nArticles: {n_articles}\nSummary: "
 
     def load_previous_newsletter(self, date_str: str) -> str:
         """Load and format the previous day's newsletter content.
@@ -129,19 +355,12 @@ class PromptGenerator:
             date_header = f"Date: {date_str}"
             formatted_groups = [date_header]
 
-            # Load all articles for the date
-            articles = self.file_handler.load_file(
-                FileType.ARTICLES,
-                date_str=date_str,
-                base_name="articles"
-            )
-            if not articles:
+            # Get the article index for the date
+            article_index = ArticleIndex.for_date(date_str, file_handler=self.file_handler)
+            if not article_index:
                 self.logger.error("No articles found for date: %s", date_str)
                 return "No articles available."
 
-            # Create a lookup dictionary for articles by ID
-            article_lookup = {article['article_id']: article for article in articles}
-
             # Get the groups from the article_groups structure
             groups = article_groups.get('groups', [])
             if not groups:
@@ -153,48 +372,39 @@ class PromptGenerator:
                 self.logger.error("Groups is not a list: %s", type(groups))
                 return "Error: Invalid groups format."
 
-            # Randomize the order of groups
+            # Select the most important groups that fit in the token budget
+            ranked_groups = self.rank_groups([g for g in groups if isinstance(g, dict)])
+            if self.summarize_groups:
+                candidate_groups = self.format_summarized_groups(ranked_groups, article_index)
+            else:
+                candidate_groups = [
+                    self.format_group(group, article_index) for group in ranked_groups
+                ]
+
+            selected_groups = []
+            token_counter = TokenCounter(
+                self.token_budget, approximate=self.approximate_tokens)
+            for formatted_group in candidate_groups:
+                if formatted_group and token_counter.try_add(formatted_group):
+                    selected_groups.append(formatted_group)
+
+            self.logger.info(
+                "Selected %d of %d groups using %d tokens (budget: %s)",
+                len(selected_groups), len(groups), token_counter.total, self.token_budget)
+
+            # Randomize the order of groups, reproducibly in the cached layout
             try:
-                shuffled_groups = random.sample(groups, len(groups))
+                if self.prompt_layout == 'cached':
+                    rng = random.Random(f"{self.shuffle_seed}:{date_str}")
+                    shuffled_groups = rng.sample(selected_groups, len(selected_groups))
+                else:
+                    shuffled_groups = random.sample(selected_groups, len(selected_groups))
             except ValueError as e:
                 self.logger.error("Error shuffling groups: %s", str(e))
                 # Fallback to original order if shuffling fails
-                shuffled_groups = groups
-
-            # Process each group
-            for group in shuffled_groups:
-                if not isinstance(group, dict):
-                    self.logger.warning(
-                        "Invalid group format: %s", type(group))
-                    continue
-
-                # Get group number from details
-                group_number = group.get('details', {}).get(
-                    'group_number', 'Unknown')
-                formatted_group = f"\n{'='*80}\nGROUP {group_number}\n{'='*80}\n"
-
-                # Get article IDs from the group
-                article_ids = group.get('article_ids', [])
-                if not article_ids:
-                    self.logger.warning(
-                        "No article IDs found in group %s", group_number)
-                    continue
-
-                # Process each article in the group
-                for article_id in article_ids:
-                    article = article_lookup.get(article_id)
-                    if not article:
-                        self.logger.warning(
-                            "Article not found: %s", article_id)
-                        continue
-
-                    # Article delimiter
-                    formatted_group += f"\n{'-'*40}\n"
-                    formatted_group += f"Title: {article.get('article_title', 'No title')}\n"
-                    formatted_group += f"Content: {article.get('article_text', 'No content')}\n"
-                    formatted_group += f"{'-'*40}\n"
-
-                formatted_groups.append(formatted_group)
+                shuffled_groups = selected_groups
+
+            formatted_groups.extend(shuffled_groups)
 
             if len(formatted_groups) <= 1:  # Only contains the date header
                 self.logger.warning("No valid groups were processed")
@@ -3,37 +3,41 @@
 Module for generating raw newsletters using OpenAI.
 """
 import json
-import os
 from pathlib import Path
-from typing import Dict, Optional
-
-import tiktoken
-from openai import OpenAI
-from dotenv import load_dotenv
+from typing import Any, Callable, Dict, Optional
 
 from nl_utils.logger_config import get_logger, get_module_name
 from nl_utils.file_handler import FileHandler, FileType
 from nl_utils.newsletter_schemas import DAILY_MORNING_SCHEMA
+from nl_utils.json_stream import IncrementalJSONObjectParser
+from nl_utils.token_counter import count_tokens
+from nl_utils.llm_client import LLMClient
 
 
 class RawNLGenerator:
     """Class for generating raw newsletters using OpenAI."""
 
-    def __init__(self, debug_mode: bool = False):
+    def __init__(self, debug_mode: bool = False, params: Optional[Dict[str, Any]] = None):
         """Initialize the RawNLGenerator.
 
         Args:
             debug_mode (bool): Whether to run in debug mode.
+            params (Optional[Dict[str, Any]]): Parameters for the generator.
+                May contain:
+                - context (PipelineContext): Context that hands stage outputs between stages.
         """
+        params = params or {}
         self.logger = get_logger(get_module_name(__name__))
         self.debug_mode = debug_mode
-        load_dotenv()
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        self.file_handler = FileHandler()
+        self.llm = LLMClient.shared()
+        self.file_handler = FileHandler({'context': params.get('context')})
 
     def estimate_tokens(self, text: str, model: str = "gpt-4") -> int:
         """Estimate the number of tokens in a text string.
 
+        The estimate is only logged, and the API reports exact usage, so
+        it is computed from the text length instead of encoding the prompt.
+
         Args:
             text (str): The text to estimate tokens for.
             model (str): The model to use for token estimation.
@@ -41,12 +45,24 @@ class RawNLGenerator:
         Returns:
             int: Estimated number of tokens.
         """
-        try:
-            encoding = tiktoken.encoding_for_model(model)
-            return len(encoding.encode(text))
-        except KeyError:
-            encoding = tiktoken.get_encoding("cl100k_base")
-            return len(encoding.encode(text))
+        return count_tokens(text, model, approximate=True)
+
+    def log_usage(self, usage: Dict[str, int]):
+        """Log the token usage of a completion, including prompt-cache hits.
+
+        Args:
+            usage (Dict[str, int]): Token usage reported by the LLMClient.
+        """
+        if not usage:
+            return
+        prompt_tokens = usage.get('prompt_tokens', 0)
+        cached_tokens = usage.get('cached_tokens', 0)
+        self.logger.info(
+            "Prompt tokens: %d (%d cached, %.0f%%)",
+            prompt_tokens, cached_tokens,
+            100 * cached_tokens / prompt_tokens if prompt_tokens else 0)
+        self.logger.info("Completion tokens: %d", usage.get('completion_tokens', 0))
+        self.logger.info("Total tokens used: %d", usage.get('total_tokens', 0))
 
     def generate_newsletter(self, prompt: str) -> Optional[Dict]:
         """Generate a newsletter using the OpenAI API.
@@ -63,9 +79,10 @@ class RawNLGenerator:
             self.logger.info("Estimated prompt tokens: %d", prompt_tokens)
 
             schema = DAILY_MORNING_SCHEMA
-            response = self.client.chat.completions.create(
+            response = self.llm.complete(
                 model="gpt-4.1",
                 messages=[{"role": "system", "content": prompt}],
+                label='newsletter',
                 response_format={
                     "type": "json_schema",
                     "json_schema": schema.get("json_schema")
@@ -73,12 +90,62 @@ class RawNLGenerator:
                 temperature=0.12
             )
 
-            completion_tokens = response.usage.completion_tokens
-            total_tokens = response.usage.total_tokens
-            self.logger.info("Completion tokens: %d", completion_tokens)
-            self.logger.info("Total tokens used: %d", total_tokens)
+            if response['cached']:
+                self.logger.info("Using cached newsletter response")
+            else:
+                self.log_usage(response['usage'])
 
-            newsletter_json = json.loads(response.choices[0].message.content)
+            newsletter_json = json.loads(response['content'])
+            return newsletter_json
+
+        except Exception as e:
+            self.logger.error("Error generating newsletter: %s", str(e))
+            return None
+
+    def generate_newsletter_stream(self, prompt: str,
+                                   on_section: Callable[[str, Any], None]) -> Optional[Dict]:
+        """Generate a newsletter with a streamed completion.
+
+        The completion is parsed while it arrives, and each finished section
+        is handed to on_section before the later sections are generated.
+
+        Args:
+            prompt (str): The prompt to use for generation.
+            on_section (Callable[[str, Any], None]): Called with the key and value of each
+                section as soon as it is complete.
+
+        Returns:
+            Optional[Dict]: The generated newsletter content.
+        """
+        try:
+            self.logger.info("Generating newsletter from prompt (streaming)")
+            prompt_tokens = self.estimate_tokens(prompt)
+            self.logger.info("Estimated prompt tokens: %d", prompt_tokens)
+
+            schema = DAILY_MORNING_SCHEMA
+            stream = self.llm.stream(
+                model="gpt-4.1",
+                messages=[{"role": "system", "content": prompt}],
+                label='newsletter',
+                on_usage=self.log_usage,
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": schema.get("json_schema")
+                },
+                temperature=0.12
+            )
+
+            parser = IncrementalJSONObjectParser()
+            newsletter_json = {}
+            for content in stream:
+                for key, value in parser.feed(content):
+                    self.logger.debug("Finished streaming section: %s", key)
+                    newsletter_json[key] = value
+                    on_section(key, value)
+
+            if not parser.finished:
+                self.logger.error("Streamed newsletter ended before the JSON object was complete")
+                return None
             return newsletter_json
 
         except Exception as e:
@@ -110,13 +177,16 @@ class RawNLGenerator:
             self.logger.error("Error saving newsletter: %s", str(e))
             return None
 
-    def run_generator(self, prompt: str, date_str: str, ignore: bool = False) -> Optional[str]:
+    def run_generator(self, prompt: str, date_str: str, ignore: bool = False,
+                      on_section: Optional[Callable[[str, Any], None]] = None) -> Optional[str]:
         """Run the newsletter generation process.
 
         Args:
             prompt (str): The prompt to use for generation.
             date_str (str): Date string in YYYY-MM-DD format.
             ignore (bool): Whether to ignore operations.
+            on_section (Optional[Callable[[str, Any], None]]): If given, the completion is
+                streamed and each finished section is passed to this callback.
 
         Returns:
             Optional[str]: Path to the generated newsletter file.
@@ -129,7 +199,10 @@ class RawNLGenerator:
             self.logger.info("Starting newsletter generation for %s", date_str)
 
             # Generate newsletter
-            newsletter_content = self.generate_newsletter(prompt)
+            if on_section is not None:
+                newsletter_content = self.generate_newsletter_stream(prompt, on_section)
+            else:
+                newsletter_content = self.generate_newsletter(prompt)
             if not newsletter_content:
                 return None
 
@@ -3,7 +3,9 @@
 Newsletter generator module for creating newsletters from news articles.
 """
 import argparse
-from typing import Optional
+import copy
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
 
 from nl_utils.logger_config import get_logger, get_module_name
 from nl_utils.file_handler import FileType, FileHandler
@@ -11,23 +13,40 @@ from nl_utils.file_handler import FileType, FileHandler
 from .modules.prompt_generator import PromptGenerator
 from .modules.raw_nl_generator import RawNLGenerator
 from .modules.nl_processor import NLProcessor
+from .modules.matcher import Matcher
 
 
 class NewsletterGenerator:
     """Class for generating and processing newsletters."""
 
-    def __init__(self, debug_mode: bool = False):
+    def __init__(self, debug_mode: bool = False, params: Optional[Dict[str, Any]] = None):
         """Initialize the NewsletterGenerator.
 
         Args:
             debug_mode (bool): Whether to run in debug mode.
+            params (Optional[Dict[str, Any]]): Parameters for the generator.
+                May contain:
+                - prompt_params (Dict[str, Any]): Parameters for the PromptGenerator.
+                - processor_params (Dict[str, Any]): Parameters for the NLProcessor.
+                - stream (bool): Whether to stream the completion and match finished
+                  sections while later ones are still being generated.
+                - context (PipelineContext): Context that hands stage outputs between stages.
         """
+        params = params or {}
+        context = params.get('context')
+        self.stream = params.get('stream', False)
         self.logger = get_logger(get_module_name(__name__))
         self.debug_mode = debug_mode
-        self.file_handler = FileHandler()
-        self.prompt_generator = PromptGenerator(debug_mode)
-        self.raw_generator = RawNLGenerator(debug_mode)
-        self.nl_processor = NLProcessor(debug_mode)
+        self.file_handler = FileHandler({'context': context})
+        self.prompt_generator = PromptGenerator(
+            debug_mode, {**(params.get('prompt_params') or {}), 'context': context})
+        self.raw_generator = RawNLGenerator(debug_mode, {'context': context})
+        self.nl_processor = NLProcessor(
+            debug_mode, {**(params.get('processor_params') or {}), 'context': context})
+
+    def close(self):
+        """Release the lemmatization workers and save the lemma cache of the matcher."""
+        self.nl_processor.close()
 
     def run_matching(self, date_str: str, ignore: bool = False) -> Optional[str]:
         """Run only the matching process on an existing newsletter.
@@ -74,6 +93,8 @@ class NewsletterGenerator:
         except Exception as e:
             self.logger.error("Error in matching process: %s", str(e))
             return None
+        finally:
+            self.close()
 
     def run_generator(self, date_str: str, ignore: bool = False, ignore_generation: bool = False, ignore_impacts: bool = False, ignore_matching: bool = False) -> Optional[str]:
         """Run the newsletter generation process.
@@ -111,6 +132,10 @@ class NewsletterGenerator:
             if not prompt:
                 return None
 
+            if self.stream and not ignore_generation and not ignore_matching:
+                return self.run_streaming_generator(
+                    prompt, article_groups, date_str, ignore_impacts)
+
             # Generate raw newsletter
             raw_newsletter_file = self.raw_generator.run_generator(
                 prompt, date_str, ignore_generation)
@@ -129,6 +154,58 @@ class NewsletterGenerator:
         except Exception as e:
             self.logger.error("Error in newsletter generation: %s", str(e))
             return None
+        finally:
+            self.close()
+
+    def run_streaming_generator(self, prompt: str, article_groups: Dict, date_str: str,
+                                ignore_impacts: bool = False) -> Optional[str]:
+        """Generate the newsletter with a streamed completion and overlap matching.
+
+        Each section is matched on a background worker as soon as it has
+        finished streaming, so matching runs while the model is still writing
+        the later sections.
+
+        Args:
+            prompt (str): The prompt to use for generation.
+            article_groups (Dict): The article groups.
+            date_str (str): Date string in YYYY-MM-DD format.
+            ignore_impacts (bool): Whether to skip impact generation and return placeholders.
+
+        Returns:
+            Optional[str]: Path to the processed newsletter file.
+        """
+        newsletter = {}
+        pending: Dict[str, Future] = {}
+
+        # A single worker keeps the matcher's fitted model single-threaded
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            def on_section(key: str, value: Any):
+                newsletter[key] = value
+                if key in Matcher.MATCH_CATEGORIES and isinstance(value, list):
+                    # The unprocessed newsletter is saved without matches
+                    pending[key] = executor.submit(
+                        self.nl_processor.matcher.match_category,
+                        key, copy.deepcopy(value), article_groups)
+
+            raw_newsletter_file = self.raw_generator.run_generator(
+                prompt, date_str, on_section=on_section)
+            if not raw_newsletter_file:
+                return None
+
+            matched_newsletter = dict(newsletter)
+            for key, future in pending.items():
+                try:
+                    matched_newsletter[key] = future.result()
+                except Exception as e:
+                    self.logger.error(
+                        "Error matching streamed section %s: %s", key, str(e))
+                    return self.nl_processor.run_processor(
+                        date_str, ignore_impacts=ignore_impacts)
+
+        self.logger.info("Matched %d sections while streaming", len(pending))
+        processed_newsletter = self.nl_processor.process_newsletter(
+            matched_newsletter, article_groups, ignore_impacts, ignore_matching=True)
+        return self.nl_processor.save_newsletter(processed_newsletter, date_str)
 
 
 def main():
@@ -165,8 +242,11 @@ def main():
             if not args.date:
                 logger.error("Date is required when adding impacts")
                 return
-            success = generator.nl_processor.run_processor(
-                args.date, args.ignore, args.ignore_impacts)
+            try:
+                success = generator.nl_processor.run_processor(
+                    args.date, args.ignore, args.ignore_impacts)
+            finally:
+                generator.close()
             if success:
                 print("Successfully added impacts to newsletter for %s", args.date)
             else:
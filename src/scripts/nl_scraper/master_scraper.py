@@ -14,15 +14,19 @@ from .scrapers import VisirScraper, MblScraper, VbScraper, RUVScraper
 class MasterScraper:
     """Class for orchestrating news scraping from multiple sources."""
 
-    def __init__(self, debug_mode: bool = False):
+    def __init__(self, debug_mode: bool = False, params: Optional[Dict[str, Any]] = None):
         """Initialize the master scraper.
 
         Args:
             debug_mode: Whether to enable debug mode for scrapers
+            params: Parameters for the master scraper.
+                May contain:
+                - context (PipelineContext): Context that hands the articles to later stages.
         """
+        params = params or {}
         self.logger = get_logger(get_module_name(__name__))
         self.debug_mode = debug_mode
-        self.file_handler = FileHandler()
+        self.file_handler = FileHandler({'context': params.get('context')})
         self.text_processor = TextProcessor(debug_mode=debug_mode)
         self.scrapers = {
             'visir': VisirScraper(debug_mode=debug_mode),
@@ -37,15 +37,19 @@ DEV_EMAIL = 'mrbadboy0110@gmail.com'
 class NewsletterSender:
     """Class to handle newsletter sending functionality."""
 
-    def __init__(self, dev_mode: bool = False):
+    def __init__(self, dev_mode: bool = False, params: Optional[Dict[str, Any]] = None):
         """Initialize the NewsletterSender.
 
         Args:
             dev_mode (bool): Whether to run in development mode
+            params (Optional[Dict[str, Any]]): Parameters for the sender.
+                May contain:
+                - context (PipelineContext): Context that hands stage outputs between stages.
         """
+        params = params or {}
         self.dev_mode = dev_mode
         self.logger = logger
-        self.file_handler = FileHandler()
+        self.file_handler = FileHandler({'context': params.get('context')})
         self._validate_config()
 
     def _validate_config(self) -> None:
@@ -221,7 +225,7 @@ class NewsletterSender:
         date: Optional[str] = None,
         filename: Optional[str] = None,
         ignore: bool = False
-    ) -> None:
+    ) -> bool:
         """Send the newsletter to all active subscribers.
 
         Args:
@@ -229,16 +233,19 @@ class NewsletterSender:
             date (Optional[str]): Date of newsletter to send (YYYY-MM-DD)
             filename (Optional[str]): Filename of newsletter to send
             ignore (bool): If True, skip sending and return immediately
+
+        Returns:
+            bool: False if the newsletter could not be sent, True otherwise
         """
         if ignore:
             self.logger.info("Ignoring newsletter send operation")
-            return
+            return True
 
         # Get active subscribers
         subscribers = self.get_active_subscribers()
         if not subscribers:
             self.logger.warning("No active subscribers found")
-            return
+            return True
 
         # Get newsletter content based on provided parameters
         if newsletter_content is None:
@@ -246,7 +253,7 @@ class NewsletterSender:
 
         if not newsletter_content:
             self.logger.error("No newsletter content found")
-            return
+            return False
 
         # Create email template
         email_html = self._create_email_html(newsletter_content)
@@ -275,9 +282,10 @@ class NewsletterSender:
 
         except Exception as e:
             self.logger.error("Error connecting to SMTP server: %s", str(e))
-            return
+            return False
 
         self.logger.info("Newsletter sent to %d subscribers", len(subscribers))
+        return True
 
 
 def send_newsletter(date: Optional[str] = None, filename: Optional[str] = None) -> None:
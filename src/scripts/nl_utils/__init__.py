@@ -3,6 +3,17 @@ Utility functions and configurations package.
 """
 
 from .file_handler import FileHandler, FileType, FileCategory
+from .article_index import ArticleIndex
+from .article_store import ArticleStore
+from .json_stream import IncrementalJSONObjectParser
+from .token_counter import TokenCounter, count_tokens, truncate_tokens
+from .llm_client import LLMClient
+from .llm_cache_miss import LLMCacheMiss
+from .pipeline_context import PipelineContext
+from .stage_manifest import StageManifest
+from .stage import Stage
+from .pipeline_runner import PipelineRunner, select_stages
+from .serializers import JSONSerializer
 from .date_utils import get_yesterday_date
 from .scraper_utils import (
     save_debug_html,
@@ -16,6 +27,34 @@ __all__ = [
     'FileType',
     'FileCategory',
 
+    # Article index
+    'ArticleIndex',
+
+    # Columnar article store
+    'ArticleStore',
+
+    # Streaming JSON
+    'IncrementalJSONObjectParser',
+
+    # Token accounting
+    'TokenCounter',
+    'count_tokens',
+    'truncate_tokens',
+
+    # LLM client
+    'LLMClient',
+    'LLMCacheMiss',
+
+    # Pipeline context
+    'PipelineContext',
+    'StageManifest',
+    'PipelineRunner',
+    'select_stages',
+    'Stage',
+
+    # Serialization
+    'JSONSerializer',
+
     # Date utilities
     'get_yesterday_date',
 
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Id-indexed view of a day's articles.
+"""
+from typing import Dict, Iterator, List, Optional
+
+from .file_handler import FileHandler, FileType
+from .logger_config import get_logger, get_module_name
+
+
+class ArticleIndex:
+    """Index of a day's articles keyed by article ID.
+
+    Every index holds articles of its own. Indexes for a date are loaded
+    through a FileHandler, whose read cache and pipeline context serve a
+    fresh copy of the current articles file without re-reading it, so a
+    stage never sees articles modified by another stage or left over from
+    an earlier version of the file.
+    """
+
+    def __init__(self, articles: List[Dict], date_str: Optional[str] = None):
+        """Initialize the ArticleIndex.
+
+        Args:
+            articles (List[Dict]): Articles to index.
+            date_str (Optional[str]): Date string in YYYY-MM-DD format.
+        """
+        self.date_str = date_str
+        self.articles = articles
+        self.by_id = {
+            article.get('article_id'): article for article in articles
+        }
+
+    @classmethod
+    def for_date(cls, date_str: str, articles: Optional[List[Dict]] = None,
+                 file_handler: Optional[FileHandler] = None) -> 'ArticleIndex':
+        """Build the index for a date.
+
+        Args:
+            date_str (str): Date string in YYYY-MM-DD format.
+            articles (Optional[List[Dict]]): Articles to index. If None, the articles file
+                for the date is loaded.
+            file_handler (Optional[FileHandler]): File handler to load the articles with,
+                so articles held in its pipeline context are found.
+
+        Returns:
+            ArticleIndex: Index for the date.
+        """
+        if articles is None:
+            articles = (file_handler or FileHandler()).load_file(
+                FileType.ARTICLES,
+                date_str=date_str,
+                base_name="articles"
+            ) or []
+
+        index = cls(articles, date_str)
+        get_logger(get_module_name(__name__)).debug(
+            "Indexed %d articles for date: %s", len(index), date_str)
+        return index
+
+    def get(self, article_id: str) -> Optional[Dict]:
+        """Get an article by ID.
+
+        Args:
+            article_id (str): ID of the article.
+
+        Returns:
+            Optional[Dict]: The article, or None if it is not in the index.
+        """
+        return self.by_id.get(article_id)
+
+    def __contains__(self, article_id: str) -> bool:
+        return article_id in self.by_id
+
+    def __len__(self) -> int:
+        return len(self.articles)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.articles)
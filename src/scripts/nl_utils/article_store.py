@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Columnar, date-partitioned store of scraped articles for multi-day queries.
+"""
+from typing import Dict, Iterable, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    from pyarrow import fs
+except ImportError:
+    pa = None
+
+from .file_handler import FileHandler, FileType, atomic_path
+from .logger_config import get_logger, get_module_name
+
+
+class ArticleStore:
+    """Parquet copy of the daily articles files, one file per date.
+
+    The JSON articles files stay the source of truth; a day's Parquet file is
+    (re)built from its JSON file whenever that is newer. Rows are sorted by
+    source and written as one row group per source, so filters on source or
+    date skip whole files and row groups, and only the requested columns are
+    read, from memory-mapped files. Requires the optional pyarrow package.
+    """
+
+    BASE_NAME = "articles"
+
+    def __init__(self):
+        """Initialize the ArticleStore.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        if pa is None:
+            raise ImportError("The article store requires the pyarrow package")
+        self.logger = get_logger(get_module_name(__name__))
+        self.file_handler = FileHandler()
+        self.filesystem = fs.LocalFileSystem(use_mmap=True)
+        self.schema = pa.schema([
+            ('date', pa.string()),
+            ('article_id', pa.string()),
+            ('article_source', pa.string()),
+            ('article_title', pa.string()),
+            ('article_url', pa.string()),
+            ('article_date', pa.string()),
+            ('article_description', pa.string()),
+            ('article_text', pa.string()),
+            ('article_lemmas', pa.list_(pa.string()))
+        ])
+
+    @staticmethod
+    def available() -> bool:
+        """Check whether the store can be used.
+
+        Returns:
+            bool: True if pyarrow is installed.
+        """
+        return pa is not None
+
+    def json_dates(self) -> List[str]:
+        """Get the dates that have a JSON articles file.
+
+        Returns:
+            List[str]: Dates in YYYY-MM-DD format, oldest first.
+        """
+        return self._dates(FileType.ARTICLES)
+
+    def dates(self) -> List[str]:
+        """Get the dates stored in the article store.
+
+        Returns:
+            List[str]: Dates in YYYY-MM-DD format, oldest first.
+        """
+        return self._dates(FileType.ARTICLE_STORE)
+
+    def _dates(self, file_type: FileType) -> List[str]:
+        """Get the dates of the articles files of a type.
+
+        Args:
+            file_type (FileType): Type of the articles files.
+
+        Returns:
+            List[str]: Dates in YYYY-MM-DD format, oldest first.
+        """
+        directory = self.file_handler.get_file_path(file_type, base_name=self.BASE_NAME).parent
+        if not directory.exists():
+            return []
+        dates = set()
+        for path in directory.glob(f"{self.BASE_NAME}_*"):
+            date_str, _ = self.file_handler.extract_date_from_filename(path.name)
+            if date_str:
+                dates.add(date_str)
+        return sorted(dates)
+
+    def write_day(self, date_str: str, articles: List[Dict]):
+        """Write the articles of a day to the store.
+
+        Args:
+            date_str (str): Date string in YYYY-MM-DD format.
+            articles (List[Dict]): Articles of the day.
+        """
+        path = self.file_handler.get_file_path(
+            FileType.ARTICLE_STORE, date_str=date_str, base_name=self.BASE_NAME)
+
+        rows = sorted(articles, key=lambda article: article.get('article_source') or '')
+        table = pa.Table.from_pylist(
+            [{**row, 'date': date_str} for row in rows], schema=self.schema)
+
+        # One row group per source lets source filters skip row groups
+        sources = table.column('article_source').to_pylist()
+        with atomic_path(path) as temp_path:
+            with pq.ParquetWriter(temp_path, self.schema, compression='zstd') as writer:
+                start = 0
+                while start < len(sources):
+                    end = start
+                    while end < len(sources) and sources[end] == sources[start]:
+                        end += 1
+                    writer.write_table(table.slice(start, end - start))
+                    start = end
+
+        self.logger.info("Stored %d articles for %s in %s", len(rows), date_str, path)
+
+    def sync(self, dates: Optional[Iterable[str]] = None) -> List[str]:
+        """Build the stored days that are missing or older than their JSON file.
+
+        Args:
+            dates (Optional[Iterable[str]]): Dates to sync. Defaults to all JSON dates.
+
+        Returns:
+            List[str]: Dates that were (re)built.
+        """
+        built = []
+        for date_str in dates if dates is not None else self.json_dates():
+            json_path = self.file_handler.get_file_path(
+                FileType.ARTICLES, date_str=date_str, base_name=self.BASE_NAME)
+            if not json_path.exists():
+                continue
+            store_path = self.file_handler.get_file_path(
+                FileType.ARTICLE_STORE, date_str=date_str, base_name=self.BASE_NAME)
+            if store_path.exists() and store_path.stat().st_mtime >= json_path.stat().st_mtime:
+                continue
+
+            try:
+                articles = self.file_handler.load_file(
+                    FileType.ARTICLES, date_str=date_str, base_name=self.BASE_NAME)
+                self.write_day(date_str, articles or [])
+                built.append(date_str)
+            except Exception as e:
+                self.logger.error("Error storing articles for %s: %s", date_str, str(e))
+
+        if built:
+            self.logger.info("Synced article store for %d dates", len(built))
+        return built
+
+    def query(self, columns: Optional[List[str]] = None, start_date: Optional[str] = None,
+              end_date: Optional[str] = None, sources: Optional[List[str]] = None,
+              sync: bool = True) -> 'pa.Table':
+        """Query stored articles.
+
+        Args:
+            columns (Optional[List[str]]): Columns to read. Defaults to all columns.
+            start_date (Optional[str]): First date to include, in YYYY-MM-DD format.
+            end_date (Optional[str]): Last date to include, in YYYY-MM-DD format.
+            sources (Optional[List[str]]): Sources to include. Defaults to all sources.
+            sync (bool): Whether to first build stored days from newer JSON files.
+
+        Returns:
+            pa.Table: Matching articles with the requested columns.
+        """
+        def in_range(date_str: str) -> bool:
+            return ((start_date is None or date_str >= start_date)
+                    and (end_date is None or date_str <= end_date))
+
+        if sync:
+            self.sync([date_str for date_str in self.json_dates() if in_range(date_str)])
+
+        # Dates are pruned by file name, sources by row group statistics
+        paths = [
+            str(self.file_handler.get_file_path(
+                FileType.ARTICLE_STORE, date_str=date_str, base_name=self.BASE_NAME))
+            for date_str in self.dates() if in_range(date_str)
+        ]
+        if not paths:
+            return self.schema.empty_table().select(columns or self.schema.names)
+
+        dataset = ds.dataset(paths, schema=self.schema, format='parquet',
+                             filesystem=self.filesystem)
+        row_filter = ds.field('article_source').isin(sources) if sources else None
+        return dataset.to_table(columns=columns, filter=row_filter)
@@ -2,13 +2,21 @@
 """
 Unified file handling utilities for the newsletter system.
 """
-import json
+import os
+import pickle
 import re
+import threading
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
 from enum import Enum, auto
 from pathlib import Path
-from typing import Union, Dict, List, Tuple, Optional
+from typing import Any, Iterable, Iterator, Union, Dict, List, Tuple, Optional
+
+import joblib
 
 from .logger_config import get_logger, get_module_name
+from .serializers import JSONSerializer, ZSTD_SUFFIX, compress, decompress, is_zstd
 
 
 class FileType(Enum):
@@ -16,6 +24,9 @@ class FileType(Enum):
     # News related files
     ARTICLES = auto()  # News articles
     ARTICLE_GROUPS = auto()  # Grouped articles
+    ARTICLE_STORE = auto()  # Columnar copy of the articles, one Parquet file per date
+    SIMILARITY_MODEL = auto()  # Fitted similarity models for grouped articles
+    GROUP_INDEX = auto()  # Precomputed group term vectors and centroids
 
     # Newsletter related files
     UNPROCESSED_NEWSLETTER = auto()  # Raw newsletter before processing
@@ -28,6 +39,9 @@ class FileType(Enum):
     # Other files
     TEXT = auto()  # Generic text files
     JSON = auto()  # Generic JSON files
+    LLM_RESPONSE = auto()  # Cached LLM responses keyed by request hash
+    CACHE = auto()  # Local caches, not committed
+    STAGE_MANIFEST = auto()  # Completed pipeline stages per date
 
 
 class FileCategory(Enum):
@@ -38,48 +52,131 @@ class FileCategory(Enum):
     OTHER = auto()  # Other files
 
 
+@contextmanager
+def atomic_path(file_path: Path) -> Iterator[Path]:
+    """Get a temporary path that atomically replaces a file once it has been written.
+
+    The content is written to a hidden temporary file in the same directory,
+    flushed to disk and renamed over the target, so a crash leaves either the
+    old or the new file, never a truncated one.
+
+    Args:
+        file_path (Path): Path of the file to write
+
+    Yields:
+        Path: Temporary path to write the content to
+    """
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = file_path.with_name(f".{file_path.name}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        yield temp_path
+        with open(temp_path, 'rb+') as f:
+            os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+
+    # Persist the rename itself
+    try:
+        directory_fd = os.open(file_path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(directory_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(directory_fd)
+
+
 class FileHandler:
     """Unified file handling class for the newsletter system."""
 
+    # JSON backend, replaceable with e.g. JSONSerializer('json')
+    serializer = JSONSerializer()
+
+    # JSON file types saved as zstd-compressed '.zst' variants, which requires zstandard.
+    # Meant for caches and intermediate files, not for outputs that are committed.
+    # Compressed variants are detected when loading whether or not the type is listed.
+    compress_types: Tuple[FileType, ...] = ()
+    compression_level = 3
+
+    # Process-wide cache of decoded files, validated by modification time and size.
+    # JSON content is cached pickled and unpickled on every hit, which is faster than
+    # reading and decoding the file again, and gives each caller a copy of its own.
+    read_cache_types = (FileType.ARTICLES, FileType.ARTICLE_GROUPS, FileType.PROMPT)
+    read_cache_max_bytes = 128 * 1024 * 1024  # Budget in on-disk bytes, 0 disables the cache
+    _read_cache: "OrderedDict[Path, Tuple[int, int, Any]]" = OrderedDict()
+    _read_cache_bytes = 0
+    _read_cache_lock = threading.Lock()
+
     # Directory structure mapping
     DIRECTORIES = {
         FileType.ARTICLES: "src/outputs/news/articles",
         FileType.ARTICLE_GROUPS: "src/outputs/news/article_groups",
+        FileType.ARTICLE_STORE: "src/outputs/news/article_store",
+        FileType.SIMILARITY_MODEL: "src/outputs/news/article_groups",
+        FileType.GROUP_INDEX: "src/outputs/news/article_groups",
         FileType.UNPROCESSED_NEWSLETTER: "src/outputs/newsletters/unprocessed",
         FileType.PROCESSED_NEWSLETTER: "src/outputs/newsletters/processed",
         FileType.FORMATTED_NEWSLETTER: "src/outputs/newsletters/formatted",
         FileType.PROMPT: "src/prompts",
         FileType.TEXT: "src/outputs/text",
-        FileType.JSON: "src/outputs/json"
+        FileType.JSON: "src/outputs/json",
+        FileType.LLM_RESPONSE: "src/outputs/llm_cache",
+        FileType.CACHE: "src/outputs/cache",
+        FileType.STAGE_MANIFEST: "src/outputs/manifests"
     }
 
     # File type to category mapping
     TYPE_TO_CATEGORY = {
         FileType.ARTICLES: FileCategory.NEWS,
         FileType.ARTICLE_GROUPS: FileCategory.NEWS,
+        FileType.ARTICLE_STORE: FileCategory.NEWS,
+        FileType.SIMILARITY_MODEL: FileCategory.NEWS,
+        FileType.GROUP_INDEX: FileCategory.NEWS,
         FileType.UNPROCESSED_NEWSLETTER: FileCategory.NEWSLETTER,
         FileType.PROCESSED_NEWSLETTER: FileCategory.NEWSLETTER,
         FileType.FORMATTED_NEWSLETTER: FileCategory.NEWSLETTER,
         FileType.PROMPT: FileCategory.PROMPT,
         FileType.TEXT: FileCategory.OTHER,
-        FileType.JSON: FileCategory.OTHER
+        FileType.JSON: FileCategory.OTHER,
+        FileType.LLM_RESPONSE: FileCategory.OTHER,
+        FileType.CACHE: FileCategory.OTHER,
+        FileType.STAGE_MANIFEST: FileCategory.OTHER
     }
 
     # File type to extension mapping
     TYPE_TO_EXTENSION = {
         FileType.ARTICLES: ".json",
         FileType.ARTICLE_GROUPS: ".json",
+        FileType.ARTICLE_STORE: ".parquet",
+        FileType.SIMILARITY_MODEL: ".joblib",
+        FileType.GROUP_INDEX: ".joblib",
         FileType.UNPROCESSED_NEWSLETTER: ".json",
         FileType.PROCESSED_NEWSLETTER: ".json",
         FileType.FORMATTED_NEWSLETTER: ".html",
         FileType.PROMPT: ".txt",
         FileType.TEXT: ".txt",
-        FileType.JSON: ".json"
+        FileType.JSON: ".json",
+        FileType.LLM_RESPONSE: ".json",
+        FileType.CACHE: ".json",
+        FileType.STAGE_MANIFEST: ".json"
     }
 
-    def __init__(self):
-        """Initialize the FileHandler with logger."""
+    def __init__(self, params: Optional[Dict[str, Any]] = None):
+        """Initialize the FileHandler with logger.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Parameters for the file handler.
+                May contain:
+                - context (PipelineContext): Context that holds stage outputs in memory
+                  and writes them in the background.
+        """
+        params = params or {}
         self.logger = get_logger(get_module_name(__name__))
+        self.context = params.get('context')
 
     def _get_file_path(self, file_type: FileType, date_str: Optional[str] = None,
                        base_name: Optional[str] = None) -> Path:
@@ -110,6 +207,138 @@ class FileHandler:
 
         return directory / filename
 
+    def get_file_path(self, file_type: FileType, date_str: Optional[str] = None,
+                      base_name: Optional[str] = None) -> Path:
+        """Get the path a file is stored at.
+
+        Args:
+            file_type (FileType): Type of file
+            date_str (Optional[str]): Date string in YYYY-MM-DD format
+            base_name (Optional[str]): Base name for the file
+
+        Returns:
+            Path: Path to the stored variant of the file if it exists, otherwise the
+                path it would be saved to
+        """
+        file_path = self._get_file_path(file_type, date_str, base_name)
+        return self._find_existing(file_path) or file_path
+
+    def _find_existing(self, file_path: Path) -> Optional[Path]:
+        """Find the stored variant of a file.
+
+        Args:
+            file_path (Path): Path to the uncompressed file
+
+        Returns:
+            Optional[Path]: The file, its compressed variant, or None if neither exists
+        """
+        if file_path.exists():
+            return file_path
+        compressed_path = file_path.with_name(file_path.name + ZSTD_SUFFIX)
+        if compressed_path.exists():
+            return compressed_path
+        return None
+
+    def file_exists(self, file_type: FileType, date_str: Optional[str] = None,
+                    base_name: Optional[str] = None) -> bool:
+        """Check whether a file exists.
+
+        Args:
+            file_type (FileType): Type of file to check
+            date_str (Optional[str]): Date string in YYYY-MM-DD format
+            base_name (Optional[str]): Base name for the file
+
+        Returns:
+            bool: True if the file exists
+        """
+        file_path = self._get_file_path(file_type, date_str, base_name)
+        context = self.context
+        if context is not None and context.covers(file_type) and context.contains(file_path):
+            return True
+        return self._find_existing(file_path) is not None
+
+    @classmethod
+    def configure_read_cache(cls, max_bytes: Optional[int] = None,
+                             file_types: Optional[Iterable[FileType]] = None):
+        """Configure the process-wide read cache.
+
+        Args:
+            max_bytes (Optional[int]): Total on-disk size of cached files, 0 disables the cache
+            file_types (Optional[Iterable[FileType]]): File types to cache
+        """
+        with cls._read_cache_lock:
+            if max_bytes is not None:
+                cls.read_cache_max_bytes = max_bytes
+            if file_types is not None:
+                cls.read_cache_types = tuple(file_types)
+        cls.clear_read_cache()
+
+    @classmethod
+    def clear_read_cache(cls):
+        """Drop all cached file contents."""
+        with cls._read_cache_lock:
+            cls._read_cache.clear()
+            cls._read_cache_bytes = 0
+
+    @classmethod
+    def _read_cache_get(cls, file_path: Path, stat: os.stat_result) -> Tuple[bool, Any]:
+        """Get cached content if the file is unchanged since it was cached.
+
+        Args:
+            file_path (Path): Path to the file
+            stat (os.stat_result): Current status of the file
+
+        Returns:
+            Tuple[bool, Any]: Whether the content was cached, and the content
+        """
+        with cls._read_cache_lock:
+            entry = cls._read_cache.get(file_path)
+            if entry is None:
+                return False, None
+            mtime, size, content = entry
+            if mtime != stat.st_mtime_ns or size != stat.st_size:
+                del cls._read_cache[file_path]
+                cls._read_cache_bytes -= size
+                return False, None
+            cls._read_cache.move_to_end(file_path)
+        # Strings are immutable and shared, anything else is unpickled into a new copy
+        return True, content if isinstance(content, str) else pickle.loads(content)
+
+    @classmethod
+    def _read_cache_put(cls, file_path: Path, stat: os.stat_result, content: Any):
+        """Cache decoded content, evicting the least recently used files over budget.
+
+        Args:
+            file_path (Path): Path to the file
+            stat (os.stat_result): Status of the file when it was read
+            content (Any): Decoded content
+        """
+        if stat.st_size > cls.read_cache_max_bytes:
+            return
+        if not isinstance(content, str):
+            content = pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL)
+        with cls._read_cache_lock:
+            previous = cls._read_cache.pop(file_path, None)
+            if previous is not None:
+                cls._read_cache_bytes -= previous[1]
+            cls._read_cache[file_path] = (stat.st_mtime_ns, stat.st_size, content)
+            cls._read_cache_bytes += stat.st_size
+            while cls._read_cache_bytes > cls.read_cache_max_bytes:
+                _, (_, size, _) = cls._read_cache.popitem(last=False)
+                cls._read_cache_bytes -= size
+
+    @classmethod
+    def _read_cache_invalidate(cls, file_path: Path):
+        """Drop a file from the read cache.
+
+        Args:
+            file_path (Path): Path to the file
+        """
+        with cls._read_cache_lock:
+            entry = cls._read_cache.pop(file_path, None)
+            if entry is not None:
+                cls._read_cache_bytes -= entry[1]
+
     def load_file(self, file_type: FileType, date_str: Optional[str] = None,
                   base_name: Optional[str] = None, encoding: str = 'utf-8') -> Union[Dict, List, str]:
         """Load a file based on its type.
@@ -127,20 +356,54 @@ class FileHandler:
             FileNotFoundError: If file doesn't exist
             ValueError: If content is invalid
         """
+        file_path = None
         try:
             file_path = self._get_file_path(file_type, date_str, base_name)
-            if not file_path.exists():
+
+            # Serve stage outputs handed off in memory, decoded into a copy of their own
+            context = self.context
+            if context is not None and context.covers(file_type):
+                found, data = context.get(file_path)
+                if found:
+                    self.logger.info("Loaded file from pipeline context: %s", file_path)
+                    return data if isinstance(data, str) else self.serializer.loads(data)
+
+            stored_path = self._find_existing(file_path)
+            if stored_path is None:
                 raise FileNotFoundError(f"File not found: {file_path}")
 
+            # Reuse content decoded earlier in the process if the file is unchanged
+            use_read_cache = (file_type in self.read_cache_types
+                              and self.read_cache_max_bytes > 0)
+            if use_read_cache:
+                stat = stored_path.stat()
+                found, content = self._read_cache_get(file_path, stat)
+                if found:
+                    self.logger.debug("Loaded file from read cache: %s", file_path)
+                    return content
+
             # Load text files (including prompts) as plain text
+            data = None
             if file_type in [FileType.FORMATTED_NEWSLETTER, FileType.TEXT, FileType.PROMPT]:
                 with open(file_path, 'r', encoding=encoding) as f:
-                    content = f.read()
+                    content = data = f.read()
+            elif file_type in [FileType.SIMILARITY_MODEL, FileType.GROUP_INDEX]:
+                content = joblib.load(file_path)
             else:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    content = json.load(f)
-
-            self.logger.info("Loaded file from: %s", file_path)
+                with open(stored_path, 'rb') as f:
+                    data = f.read()
+                if is_zstd(data):
+                    data = decompress(data)
+                if encoding.lower().replace('-', '') != 'utf8':
+                    data = data.decode(encoding)
+                content = self.serializer.loads(data)
+
+            if use_read_cache:
+                self._read_cache_put(file_path, stat, content)
+            if data is not None and context is not None and context.covers(file_type):
+                context.remember(file_path, data)
+
+            self.logger.info("Loaded file from: %s", stored_path)
             return content
 
         except Exception as e:
@@ -151,20 +414,25 @@ class FileHandler:
     def save_file(self, content: Union[Dict, List, str], file_type: FileType,
                   date_str: Optional[str] = None, base_name: Optional[str] = None,
                   encoding: str = 'utf-8', ensure_ascii: bool = False,
-                  indent: int = 2) -> Path:
+                  indent: Optional[int] = 2, compressed: Optional[bool] = None) -> Path:
         """Save content to a file based on its type.
 
+        JSON is indented by default, as the outputs are committed and reviewed.
+        Caches and intermediate files can pass indent=None for compact JSON.
+
         Args:
             content: Content to save
             file_type (FileType): Type of file to save
             date_str (Optional[str]): Date string in YYYY-MM-DD format
             base_name (Optional[str]): Base name for the file
-            encoding (str): File encoding to use
+            encoding (str): File encoding to use for text files, JSON is always UTF-8
             ensure_ascii (bool): Whether to ensure ASCII output for JSON
-            indent (int): Number of spaces for JSON indentation
+            indent (Optional[int]): Number of spaces for JSON indentation, None for compact JSON
+            compressed (Optional[bool]): Whether to save JSON as a zstd-compressed variant.
+                Defaults to whether the file type is in compress_types.
 
         Returns:
-            Path: Path to the saved file
+            Path: Path to the saved file, without the compressed variant's suffix
 
         Raises:
             ValueError: If content is invalid
@@ -173,22 +441,38 @@ class FileHandler:
         file_path = None
         try:
             file_path = self._get_file_path(file_type, date_str, base_name)
-            file_path.parent.mkdir(parents=True, exist_ok=True)
 
             if file_type in [FileType.FORMATTED_NEWSLETTER, FileType.TEXT, FileType.PROMPT]:
                 if not isinstance(content, str):
                     raise ValueError("Content must be a string for text files")
-                with open(file_path, 'w', encoding=encoding) as f:
-                    f.write(content)
-            else:
-                if not isinstance(content, (dict, list)):
+            elif file_type in [FileType.SIMILARITY_MODEL, FileType.GROUP_INDEX]:
+                if not isinstance(content, dict):
                     raise ValueError(
-                        "Content must be a dictionary or list for JSON files")
-                with open(file_path, 'w', encoding=encoding) as f:
-                    json.dump(content, f, ensure_ascii=ensure_ascii,
-                              indent=indent)
+                        "Content must be a dictionary for model files")
+            elif not isinstance(content, (dict, list)):
+                raise ValueError(
+                    "Content must be a dictionary or list for JSON files")
+
+            # Cached content of the file is stale from here on
+            self._read_cache_invalidate(file_path)
+
+            if compressed is None:
+                compressed = file_type in self.compress_types
+
+            # Encoded here, so later changes to the content cannot race the writer
+            data = self._encode(content, file_type, ensure_ascii, indent)
+
+            def write():
+                self._write_file(data, file_path, file_type, encoding, compressed)
 
-            self.logger.info("Saved file to: %s", file_path)
+            # Hand stage outputs off in memory and persist them in the background
+            context = self.context
+            if context is not None and context.covers(file_type):
+                context.put(file_path, data, write)
+                self.logger.info("Saving file in the background to: %s", file_path)
+            else:
+                write()
+                self.logger.info("Saved file to: %s", file_path)
             return file_path
 
         except Exception as e:
@@ -196,6 +480,103 @@ class FileHandler:
             self.logger.error(error_msg)
             raise
 
+    def _encode(self, content: Union[Dict, List, str], file_type: FileType,
+                ensure_ascii: bool, indent: Optional[int]) -> Union[bytes, str, Dict]:
+        """Encode validated content for writing.
+
+        Args:
+            content: Content to encode
+            file_type (FileType): Type of file to write
+            ensure_ascii (bool): Whether to ensure ASCII output for JSON
+            indent (Optional[int]): Number of spaces for JSON indentation
+
+        Returns:
+            Union[bytes, str, Dict]: UTF-8 JSON, text, or the unchanged content of model files
+        """
+        if file_type in [FileType.FORMATTED_NEWSLETTER, FileType.TEXT, FileType.PROMPT,
+                         FileType.SIMILARITY_MODEL, FileType.GROUP_INDEX]:
+            return content
+        return self.serializer.dumps(content, indent=indent, ensure_ascii=ensure_ascii)
+
+    def _write_file(self, data: Union[bytes, str, Dict], file_path: Path, file_type: FileType,
+                    encoding: str, compressed: bool):
+        """Write encoded content to a file atomically.
+
+        Args:
+            data (Union[bytes, str, Dict]): Content encoded by _encode
+            file_path (Path): Path to the file
+            file_type (FileType): Type of file to write
+            encoding (str): File encoding to use for text files
+            compressed (bool): Whether to write JSON as a zstd-compressed variant
+        """
+        if file_type in [FileType.FORMATTED_NEWSLETTER, FileType.TEXT, FileType.PROMPT]:
+            with atomic_path(file_path) as temp_path:
+                with open(temp_path, 'w', encoding=encoding) as f:
+                    f.write(data)
+        elif file_type in [FileType.SIMILARITY_MODEL, FileType.GROUP_INDEX]:
+            with atomic_path(file_path) as temp_path:
+                joblib.dump(data, temp_path, compress=3)
+        else:
+            compressed_path = file_path.with_name(file_path.name + ZSTD_SUFFIX)
+            target, stale = file_path, compressed_path
+            if compressed:
+                data = compress(data, self.compression_level)
+                target, stale = compressed_path, file_path
+            with atomic_path(target) as temp_path:
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+            # Only one variant may exist, so loads are unambiguous
+            stale.unlink(missing_ok=True)
+
+    def export_json(self, file_type: FileType, date_str: Optional[str] = None,
+                    base_name: Optional[str] = None, output_path: Optional[Path] = None,
+                    indent: int = 2) -> Path:
+        """Export a stored JSON file as indented, uncompressed JSON for reading.
+
+        Args:
+            file_type (FileType): Type of file to export
+            date_str (Optional[str]): Date string in YYYY-MM-DD format
+            base_name (Optional[str]): Base name for the file
+            output_path (Optional[Path]): Path to write to. Defaults to the file's path
+                with a '.pretty.json' suffix.
+            indent (int): Number of spaces for JSON indentation
+
+        Returns:
+            Path: Path to the exported file
+        """
+        content = self.load_file(file_type, date_str, base_name)
+        file_path = self._get_file_path(file_type, date_str, base_name)
+        output_path = Path(output_path or file_path.with_suffix('.pretty.json'))
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(output_path, 'wb') as f:
+            f.write(self.serializer.dumps(content, indent=indent))
+        self.logger.info("Exported %s to: %s", file_path, output_path)
+        return output_path
+
+    def query_articles(self, columns: Optional[List[str]] = None,
+                       start_date: Optional[str] = None, end_date: Optional[str] = None,
+                       sources: Optional[List[str]] = None) -> List[Dict]:
+        """Query articles across days from the columnar article store.
+
+        Days whose articles file changed since it was stored are stored again
+        first. Requires the optional pyarrow package.
+
+        Args:
+            columns (Optional[List[str]]): Article fields to read, e.g. ['article_id',
+                'article_lemmas']. Defaults to all fields plus 'date'.
+            start_date (Optional[str]): First date to include, in YYYY-MM-DD format
+            end_date (Optional[str]): Last date to include, in YYYY-MM-DD format
+            sources (Optional[List[str]]): Sources to include. Defaults to all sources.
+
+        Returns:
+            List[Dict]: Matching articles with the requested fields
+        """
+        # Imported here because the store builds on FileHandler
+        from .article_store import ArticleStore
+        return ArticleStore().query(
+            columns=columns, start_date=start_date, end_date=end_date,
+            sources=sources).to_pylist()
+
     def find_latest_file(self, file_type: FileType, pattern: Optional[str] = None) -> Optional[Path]:
         """Find the most recent file of a given type.
 
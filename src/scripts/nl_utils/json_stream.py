@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Incremental parser for JSON objects that arrive in chunks.
+"""
+import json
+from typing import Any, Iterator, List, Tuple
+
+
+class IncrementalJSONObjectParser:
+    """Parser that yields top-level members of a JSON object as they complete.
+
+    Chunks of a streamed completion are fed in order. The parser scans each
+    character once, tracking strings, escapes and nesting depth, and decodes a
+    member as soon as the comma or closing brace after its value arrives. This
+    lets callers start on finished sections while later ones are still being
+    generated.
+    """
+
+    def __init__(self):
+        """Initialize the IncrementalJSONObjectParser."""
+        self.buffer: List[str] = []
+        self.text = ""
+        self.position = 0
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.member_start = None
+        self.finished = False
+
+    def feed(self, chunk: str) -> Iterator[Tuple[str, Any]]:
+        """Feed the next chunk of the JSON text.
+
+        Args:
+            chunk (str): Next part of the JSON text.
+
+        Yields:
+            Tuple[str, Any]: Key and decoded value of each top-level member completed
+            by this chunk.
+
+        Raises:
+            ValueError: If the text is not a JSON object or a member cannot be decoded.
+        """
+        if not chunk:
+            return
+        self.buffer.append(chunk)
+        self.text += chunk
+
+        while self.position < len(self.text):
+            char = self.text[self.position]
+            self.position += 1
+
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"':
+                self.in_string = True
+            elif char in '{[':
+                if self.depth == 0 and char != '{':
+                    raise ValueError("Streamed JSON is not an object")
+                self.depth += 1
+                if self.depth == 1:
+                    self.member_start = self.position
+            elif char in '}]':
+                self.depth -= 1
+                if self.depth == 0:
+                    yield from self._complete_member(self.position - 1)
+                    self.finished = True
+            elif char == ',' and self.depth == 1:
+                yield from self._complete_member(self.position - 1)
+                # Drop decoded members so the pending text stays small
+                self.text = self.text[self.position:]
+                self.position = 0
+                self.member_start = 0
+
+    def _complete_member(self, end: int) -> Iterator[Tuple[str, Any]]:
+        """Decode the member between the last member start and end.
+
+        Args:
+            end (int): Position of the comma or closing brace after the member.
+
+        Yields:
+            Tuple[str, Any]: Key and decoded value of the member, if it is not empty.
+        """
+        member = self.text[self.member_start:end]
+        if not member.strip():
+            return
+        yield from json.loads("{" + member + "}").items()
+
+    def get_text(self) -> str:
+        """Get all text fed so far.
+
+        Returns:
+            str: The concatenated chunks.
+        """
+        return "".join(self.buffer)
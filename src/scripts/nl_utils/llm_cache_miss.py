@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+"""
+Error raised when a replayed LLM request has no cached response.
+"""
+
+
+class LLMCacheMiss(RuntimeError):
+    """Raised in replay mode when a request has no cached response."""
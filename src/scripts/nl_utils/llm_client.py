@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Shared LLM client with a content-addressed response cache.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from dotenv import load_dotenv
+
+from .file_handler import FileHandler, FileType
+from .llm_cache_miss import LLMCacheMiss
+from .logger_config import get_logger, get_module_name
+
+# Client modes
+MODE_CACHE = 'cache'  # Serve cached responses, call the API on a miss
+MODE_REFRESH = 'refresh'  # Always call the API and overwrite the cache
+MODE_REPLAY = 'replay'  # Serve only cached responses, never call the API
+MODES = (MODE_CACHE, MODE_REFRESH, MODE_REPLAY)
+
+
+class LLMClient:
+    """Wrapper around the OpenAI chat API shared by all LLM stages.
+
+    Responses are cached on disk keyed by a hash of the model, messages and
+    request parameters, so identical requests are only paid for once. In
+    replay mode the client never touches the network, which lets the whole
+    pipeline be re-run and benchmarked offline from earlier responses. A local
+    stand-in server can be used instead of the API by setting OPENAI_BASE_URL.
+    The cache directory is git-ignored, so it only persists between local runs;
+    CI starts from an empty cache and calls the API for every request.
+    Request counts, tokens and latency are recorded per stage label.
+    """
+
+    _shared: Optional['LLMClient'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, params: Optional[Dict[str, Any]] = None):
+        """Initialize the LLMClient.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Parameters for the client.
+                May contain:
+                - mode (str): 'cache', 'refresh' or 'replay'. Defaults to the NL_LLM_MODE
+                  environment variable, or 'cache'.
+                - context (PipelineContext): Context that hands stage outputs between stages.
+        """
+        params = params or {}
+        load_dotenv()
+        self.logger = get_logger(get_module_name(__name__))
+        self.file_handler = FileHandler({'context': params.get('context')})
+        self.mode = params.get('mode') or os.getenv('NL_LLM_MODE', MODE_CACHE)
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown LLM client mode: {self.mode}")
+        self.metrics: Dict[str, Dict[str, float]] = {}
+        self._metrics_lock = threading.Lock()
+        self._client = None
+
+    @classmethod
+    def shared(cls, params: Optional[Dict[str, Any]] = None) -> 'LLMClient':
+        """Get the client shared by all stages in the process.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Parameters used if the shared client
+                does not exist yet, ignored otherwise.
+
+        Returns:
+            LLMClient: Shared client.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls(params)
+            return cls._shared
+
+    @property
+    def client(self) -> Any:
+        """OpenAI client, created on the first request that misses the cache."""
+        if self._client is None:
+            # Imported here so replay runs do not need API credentials
+            from openai import OpenAI
+            self._client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+        return self._client
+
+    def request_key(self, model: str, messages: List[Dict], params: Dict[str, Any]) -> str:
+        """Get the cache key of a request.
+
+        Args:
+            model (str): Model name.
+            messages (List[Dict]): Chat messages.
+            params (Dict[str, Any]): Other request parameters.
+
+        Returns:
+            str: Hex digest identifying the request.
+        """
+        key_data = json.dumps(
+            {'model': model, 'messages': messages, 'params': params},
+            ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    def _load_cached(self, key: str) -> Optional[Dict]:
+        """Load a cached response.
+
+        Args:
+            key (str): Cache key of the request.
+
+        Returns:
+            Optional[Dict]: Cached response, or None on a miss or in refresh mode.
+        """
+        if self.mode == MODE_REFRESH:
+            return None
+        try:
+            if self.file_handler.file_exists(FileType.LLM_RESPONSE, base_name=key):
+                return self.file_handler.load_file(FileType.LLM_RESPONSE, base_name=key)
+        except Exception as e:
+            self.logger.warning("Could not load cached LLM response %s: %s", key, str(e))
+        if self.mode == MODE_REPLAY:
+            raise LLMCacheMiss(f"No cached response for request {key}")
+        return None
+
+    def _save_cached(self, key: str, model: str, content: str, usage: Dict[str, int]):
+        """Save a response to the cache.
+
+        Args:
+            key (str): Cache key of the request.
+            model (str): Model name.
+            content (str): Response content.
+            usage (Dict[str, int]): Token usage of the response.
+        """
+        try:
+            self.file_handler.save_file(
+                {'model': model, 'content': content, 'usage': usage, 'created_at': time.time()},
+                FileType.LLM_RESPONSE, base_name=key, indent=None)
+        except Exception as e:
+            self.logger.warning("Could not cache LLM response %s: %s", key, str(e))
+
+    def _record(self, label: str, usage: Dict[str, int], latency: float, cache_hit: bool):
+        """Record the metrics of a request.
+
+        Args:
+            label (str): Stage label of the request.
+            usage (Dict[str, int]): Token usage of the response.
+            latency (float): Seconds spent on the request.
+            cache_hit (bool): Whether the response came from the cache.
+        """
+        with self._metrics_lock:
+            stats = self.metrics.setdefault(label, {
+                'requests': 0, 'cache_hits': 0, 'prompt_tokens': 0,
+                'cached_tokens': 0, 'completion_tokens': 0, 'latency': 0.0
+            })
+            stats['requests'] += 1
+            stats['latency'] += latency
+            if cache_hit:
+                stats['cache_hits'] += 1
+                return
+            stats['prompt_tokens'] += usage.get('prompt_tokens', 0)
+            stats['cached_tokens'] += usage.get('cached_tokens', 0)
+            stats['completion_tokens'] += usage.get('completion_tokens', 0)
+
+    @staticmethod
+    def _usage_dict(usage: Any) -> Dict[str, int]:
+        """Convert an API usage object to a plain dictionary.
+
+        Args:
+            usage (Any): Usage object of a chat completion.
+
+        Returns:
+            Dict[str, int]: Prompt, cached, completion and total token counts.
+        """
+        if usage is None:
+            return {}
+        details = getattr(usage, 'prompt_tokens_details', None)
+        return {
+            'prompt_tokens': usage.prompt_tokens,
+            'cached_tokens': getattr(details, 'cached_tokens', None) or 0,
+            'completion_tokens': usage.completion_tokens,
+            'total_tokens': usage.total_tokens
+        }
+
+    def complete(self, model: str, messages: List[Dict], label: str = 'default',
+                 **params: Any) -> Dict[str, Any]:
+        """Run a chat completion, serving it from the cache when possible.
+
+        Args:
+            model (str): Model name.
+            messages (List[Dict]): Chat messages.
+            label (str): Stage label used for metrics.
+            **params: Other request parameters, e.g. temperature or response_format.
+
+        Returns:
+            Dict[str, Any]: 'content', 'usage' and 'cached' (whether it came from the cache).
+
+        Raises:
+            LLMCacheMiss: In replay mode, if the request has no cached response.
+        """
+        start = time.perf_counter()
+        key = self.request_key(model, messages, params)
+        cached = self._load_cached(key)
+        if cached is not None:
+            self._record(label, cached.get('usage', {}), time.perf_counter() - start, True)
+            return {'content': cached['content'], 'usage': cached.get('usage', {}), 'cached': True}
+
+        response = self.client.chat.completions.create(
+            model=model, messages=messages, **params)
+        content = response.choices[0].message.content
+        usage = self._usage_dict(response.usage)
+        self._record(label, usage, time.perf_counter() - start, False)
+        self._save_cached(key, model, content, usage)
+        return {'content': content, 'usage': usage, 'cached': False}
+
+    def stream(self, model: str, messages: List[Dict], label: str = 'default',
+               on_usage: Optional[Callable[[Dict[str, int]], None]] = None,
+               **params: Any) -> Iterator[str]:
+        """Stream a chat completion, replaying it from the cache when possible.
+
+        Streamed and blocking requests share cache entries.
+
+        Args:
+            model (str): Model name.
+            messages (List[Dict]): Chat messages.
+            label (str): Stage label used for metrics.
+            on_usage (Optional[Callable[[Dict[str, int]], None]]): Called with the token
+                usage once a completion from the API has finished.
+            **params: Other request parameters, e.g. temperature or response_format.
+
+        Yields:
+            str: Parts of the completion content as they arrive.
+
+        Raises:
+            LLMCacheMiss: In replay mode, if the request has no cached response.
+        """
+        start = time.perf_counter()
+        key = self.request_key(model, messages, params)
+        cached = self._load_cached(key)
+        if cached is not None:
+            self._record(label, cached.get('usage', {}), time.perf_counter() - start, True)
+            yield cached['content']
+            return
+
+        response = self.client.chat.completions.create(
+            model=model, messages=messages, stream=True,
+            stream_options={"include_usage": True}, **params)
+        parts = []
+        usage = {}
+        for chunk in response:
+            if chunk.usage:
+                usage = self._usage_dict(chunk.usage)
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                yield parts[-1]
+
+        self._record(label, usage, time.perf_counter() - start, False)
+        self._save_cached(key, model, "".join(parts), usage)
+        if on_usage:
+            on_usage(usage)
+
+    def log_metrics(self):
+        """Log the request metrics of each stage."""
+        with self._metrics_lock:
+            for label, stats in sorted(self.metrics.items()):
+                self.logger.info(
+                    "LLM %s: %d requests (%d cached), %d prompt tokens (%d prompt-cached), "
+                    "%d completion tokens, %.1fs",
+                    label, stats['requests'], stats['cache_hits'], stats['prompt_tokens'],
+                    stats['cached_tokens'], stats['completion_tokens'], stats['latency'])
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+In-process hand-off of stage outputs between pipeline steps.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .file_handler import FileType
+from .logger_config import get_logger, get_module_name
+
+
+class PipelineContext:
+    """Holds stage outputs in memory and persists them in the background.
+
+    FileHandlers created with the context in their params serve the stage
+    output types from memory: a saved output is kept in the encoded form it
+    is written in, and written to disk on a background thread, and a loaded
+    output is kept as it was read. Every load decodes its own copy, so
+    stages running at the same time never share objects, and a stage may
+    modify what it saved or loaded without affecting the others.
+    """
+
+    # File types handed between stages
+    STAGE_TYPES = (
+        FileType.ARTICLES,
+        FileType.ARTICLE_GROUPS,
+        FileType.UNPROCESSED_NEWSLETTER,
+        FileType.PROCESSED_NEWSLETTER,
+        FileType.FORMATTED_NEWSLETTER
+    )
+
+    def __init__(self, params: Optional[Dict[str, Any]] = None):
+        """Initialize the PipelineContext.
+
+        Args:
+            params (Optional[Dict[str, Any]]): Parameters for the context.
+                May contain:
+                - file_types (Tuple[FileType, ...]): File types held in memory. Defaults
+                  to STAGE_TYPES.
+        """
+        params = params or {}
+        self.logger = get_logger(get_module_name(__name__))
+        self.file_types = tuple(params.get('file_types', self.STAGE_TYPES))
+        self.entries: Dict[Path, Union[bytes, str]] = {}
+        self.pending: Dict[Path, Future] = {}
+        self.errors: List[Tuple[Path, Exception]] = []
+        self._lock = threading.Lock()
+        # A single writer keeps writes to the same file in order
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='pipeline-writer')
+
+    def __enter__(self) -> 'PipelineContext':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(raise_errors=exc_type is None)
+
+    def close(self, raise_errors: bool = True):
+        """Wait for pending writes and stop the writer thread.
+
+        Args:
+            raise_errors (bool): Whether to raise if any write failed.
+        """
+        try:
+            self.flush(raise_errors)
+        finally:
+            self._executor.shutdown(wait=True)
+
+    def covers(self, file_type: FileType) -> bool:
+        """Check whether a file type is held in memory.
+
+        Args:
+            file_type (FileType): Type of file.
+
+        Returns:
+            bool: True if outputs of this type are handed off in memory.
+        """
+        return file_type in self.file_types
+
+    def contains(self, file_path: Path) -> bool:
+        """Check whether a file is held in memory.
+
+        Args:
+            file_path (Path): Path of the file.
+
+        Returns:
+            bool: True if the file's content is held in memory.
+        """
+        with self._lock:
+            return file_path in self.entries
+
+    def get(self, file_path: Path) -> Tuple[bool, Optional[Union[bytes, str]]]:
+        """Get the in-memory data of a file.
+
+        Args:
+            file_path (Path): Path of the file.
+
+        Returns:
+            Tuple[bool, Optional[Union[bytes, str]]]: Whether the file is held in memory,
+            and its encoded JSON or text.
+        """
+        with self._lock:
+            if file_path not in self.entries:
+                return False, None
+            return True, self.entries[file_path]
+
+    def remember(self, file_path: Path, data: Union[bytes, str]):
+        """Hold data that was read from disk.
+
+        Args:
+            file_path (Path): Path of the file.
+            data (Union[bytes, str]): Encoded JSON or text of the file.
+        """
+        with self._lock:
+            self.entries.setdefault(file_path, data)
+
+    def put(self, file_path: Path, data: Union[bytes, str], write: Callable[[], Any]) -> Future:
+        """Hold saved data in memory and write it to disk in the background.
+
+        Args:
+            file_path (Path): Path of the file.
+            data (Union[bytes, str]): Encoded JSON or text to save.
+            write (Callable[[], Any]): Writes the data to the file.
+
+        Returns:
+            Future: Completes when the data has been written.
+        """
+        with self._lock:
+            self.entries[file_path] = data
+            future = self._executor.submit(self._persist, file_path, write)
+            self.pending[file_path] = future
+        return future
+
+    def after_writes(self, callback: Callable[[], Any]) -> Future:
+        """Run a callback once all writes submitted so far have finished.
+
+        Args:
+            callback (Callable[[], Any]): Called on the writer thread.
+
+        Returns:
+            Future: Completes with the callback's result.
+        """
+        # The single writer runs tasks in submission order
+        return self._executor.submit(callback)
+
+    def _persist(self, file_path: Path, write: Callable[[], Any]):
+        """Write a file, recording the error if it fails.
+
+        Args:
+            file_path (Path): Path of the file.
+            write (Callable[[], Any]): Writes the data to the file.
+        """
+        try:
+            write()
+        except Exception as e:
+            self.logger.error("Error persisting %s: %s", file_path, str(e))
+            with self._lock:
+                self.errors.append((file_path, e))
+            raise
+
+    def flush(self, raise_errors: bool = True):
+        """Wait until all pending writes have finished.
+
+        Args:
+            raise_errors (bool): Whether to raise if any write failed.
+
+        Raises:
+            IOError: If raise_errors is set and any write failed.
+        """
+        with self._lock:
+            pending = list(self.pending.values())
+        for future in pending:
+            future.exception()
+        # Also wait for callbacks queued behind the writes
+        self._executor.submit(lambda: None).result()
+
+        with self._lock:
+            errors = list(self.errors)
+        if errors and raise_errors:
+            raise IOError(
+                f"Failed to persist {len(errors)} file(s): "
+                + ", ".join(str(path) for path, _ in errors))
+
+    def wait_for(self, file_paths: Iterable[Path]):
+        """Wait until the pending writes of some files have finished.
+
+        Args:
+            file_paths (Iterable[Path]): Paths of the files.
+
+        Raises:
+            IOError: If the last write of any of the files failed.
+        """
+        with self._lock:
+            pending = [(path, self.pending[path]) for path in file_paths if path in self.pending]
+        failed = [str(path) for path, future in pending if future.exception() is not None]
+        if failed:
+            raise IOError(f"Failed to persist {len(failed)} file(s): " + ", ".join(failed))
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Dependency-ordered, resumable runner for the newsletter pipeline stages.
+"""
+import hashlib
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .file_handler import FileHandler
+from .logger_config import get_logger, get_module_name
+from .stage import Stage
+from .stage_manifest import StageManifest
+
+# Stage outcomes
+STATUS_DONE = 'done'  # Ran successfully
+STATUS_SKIPPED = 'skipped'  # Outputs were up to date
+STATUS_FAILED = 'failed'  # Raised an error
+STATUS_BLOCKED = 'blocked'  # Not run because a dependency failed
+
+
+def select_stages(stages: List[Stage], only: Optional[List[str]] = None,
+                  skip: Optional[List[str]] = None) -> List[Stage]:
+    """Select the stages to run.
+
+    Stages that are not selected are not run, and the outputs they wrote
+    earlier are trusted as inputs of the selected stages.
+
+    Args:
+        stages (List[Stage]): All stages.
+        only (Optional[List[str]]): Stages to run. Defaults to all stages.
+        skip (Optional[List[str]]): Stages not to run.
+
+    Returns:
+        List[Stage]: The selected stages in their original order, with explicit
+        dependencies on stages that are not selected dropped.
+    """
+    selected = set(only or [stage.name for stage in stages]) - set(skip or [])
+    for stage in stages:
+        if stage.name in selected:
+            stage.after = [name for name in stage.after if name in selected]
+    return [stage for stage in stages if stage.name in selected]
+
+
+class PipelineRunner:
+    """Runs stages in dependency order, concurrently where they are independent.
+
+    Dependencies come from the declared files: a stage runs after every stage
+    that writes one of its inputs. A stage is skipped when the date's stage
+    manifest has an entry for the same input content and configuration and
+    its outputs are unchanged, so re-running after a late failure only redoes
+    the stages from the failure on. If a stage fails, the stages depending on
+    it are not run, while independent stages continue.
+    """
+
+    def __init__(self, date_str: str, stages: List[Stage], params: Optional[Dict[str, Any]] = None):
+        """Initialize the PipelineRunner.
+
+        Args:
+            date_str (str): Date string in YYYY-MM-DD format.
+            stages (List[Stage]): Stages to run.
+            params (Optional[Dict[str, Any]]): Parameters for the runner.
+                May contain:
+                - max_workers (int): Maximum number of stages running at the same time.
+                - force (List[str]): Stages to run even if they are up to date.
+                - context (PipelineContext): Context the stages hand their outputs through.
+                  Stage inputs are hashed once its writes of them have finished.
+
+        Raises:
+            ValueError: If stage names are not unique, a dependency is unknown or the
+                dependencies contain a cycle.
+        """
+        params = params or {}
+        self.logger = get_logger(get_module_name(__name__))
+        self.date_str = date_str
+        self.max_workers = params.get('max_workers', 4)
+        self.force = set(params.get('force', []))
+        self.context = params.get('context')
+        self.manifest = StageManifest(date_str, {'context': self.context})
+        self.file_handler = FileHandler({'context': self.context})
+
+        self.stages = {stage.name: stage for stage in stages}
+        if len(self.stages) != len(stages):
+            raise ValueError("Stage names must be unique")
+
+        writers = {path: stage.name for stage in stages for path in stage.outputs}
+        self.dependencies: Dict[str, Set[str]] = {}
+        for stage in stages:
+            unknown = [name for name in stage.after if name not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages: {unknown}")
+            self.dependencies[stage.name] = set(stage.after) | {
+                writers[path] for path in stage.inputs
+                if path in writers and writers[path] != stage.name
+            }
+        self.order = self._topological_order()
+
+        self.results: Dict[str, str] = {}
+        self.timings: Dict[str, float] = {}
+
+    def _topological_order(self) -> List[str]:
+        """Order the stages so that each comes after its dependencies.
+
+        Returns:
+            List[str]: Stage names in dependency order, ties in declaration order.
+
+        Raises:
+            ValueError: If the dependencies contain a cycle.
+        """
+        order = []
+        remaining = list(self.stages)
+        while remaining:
+            ready = [name for name in remaining if self.dependencies[name] <= set(order)]
+            if not ready:
+                raise ValueError(f"Stage dependencies contain a cycle: {remaining}")
+            order.extend(ready)
+            remaining = [name for name in remaining if name not in ready]
+        return order
+
+    def _inputs_hash(self, stage: Stage) -> Optional[str]:
+        """Hash the content of a stage's inputs together with its configuration.
+
+        Args:
+            stage (Stage): The stage.
+
+        Returns:
+            Optional[str]: Hex digest of the input files and the stage configuration, or
+            None if an input could not be written, as the files on disk are then stale.
+        """
+        # Inputs written in the background must be on disk before they are hashed.
+        # Only this stage's inputs are waited for, so failed writes of other files
+        # do not affect it.
+        if stage.inputs and self.context is not None:
+            try:
+                self.context.wait_for(stage.inputs)
+            except IOError as e:
+                self.logger.warning("Inputs of stage %s are not on disk: %s", stage.name, str(e))
+                return None
+
+        inputs = {}
+        for path in stage.inputs:
+            stored_path = self.file_handler._find_existing(path)
+            inputs[str(path)] = StageManifest.file_hash(stored_path) if stored_path else None
+        key_data = json.dumps(
+            {'config': stage.config, 'inputs': inputs}, sort_keys=True, default=str)
+        return hashlib.sha256(key_data.encode()).hexdigest()
+
+    def is_up_to_date(self, stage: Stage, inputs_hash: Optional[str] = None) -> bool:
+        """Check whether a stage's recorded run still matches its inputs and outputs.
+
+        Args:
+            stage (Stage): The stage.
+            inputs_hash (Optional[str]): Precomputed hash of the stage's inputs.
+
+        Returns:
+            bool: True if the stage can be skipped.
+        """
+        if not stage.cacheable or stage.name in self.force:
+            return False
+        inputs_hash = inputs_hash or self._inputs_hash(stage)
+        entry = self.manifest.get(stage.name)
+        if inputs_hash is None or not entry or entry.get('inputs_hash') != inputs_hash:
+            return False
+        return self.manifest.is_complete(stage.name)
+
+    def _record(self, stage: Stage, duration: float, inputs_hash: str):
+        """Record a completed stage once its outputs have been written.
+
+        Args:
+            stage (Stage): The stage.
+            duration (float): Wall time of the stage in seconds.
+            inputs_hash (str): Hash of the stage's inputs.
+        """
+        rows = None
+        if stage.rows:
+            try:
+                rows = stage.rows()
+            except Exception as e:
+                self.logger.warning("Could not count rows of stage %s: %s", stage.name, str(e))
+
+        def record():
+            try:
+                self.manifest.record(stage.name, stage.outputs, duration, rows,
+                                     inputs_hash=inputs_hash)
+            except Exception as e:
+                self.logger.warning("Could not record stage %s: %s", stage.name, str(e))
+
+        if self.context is not None:
+            self.context.after_writes(record)
+        else:
+            record()
+
+    def _run_stage(self, stage: Stage) -> str:
+        """Run a stage unless it is up to date.
+
+        Args:
+            stage (Stage): The stage.
+
+        Returns:
+            str: STATUS_DONE or STATUS_SKIPPED.
+        """
+        started = time.perf_counter()
+        inputs_hash = self._inputs_hash(stage)
+        if inputs_hash is not None and self.is_up_to_date(stage, inputs_hash):
+            self.logger.info("Skipping up-to-date stage: %s", stage.name)
+            return STATUS_SKIPPED
+
+        self.logger.info("Running stage: %s", stage.name)
+        stage.run()
+        # A run from inputs that are not on disk cannot be checked later
+        if inputs_hash is not None:
+            self._record(stage, time.perf_counter() - started, inputs_hash)
+        return STATUS_DONE
+
+    def plan(self) -> List[Tuple[str, List[str], bool]]:
+        """Describe the stages without running them.
+
+        Up-to-date checks reflect the files as they are now.
+
+        Returns:
+            List[Tuple[str, List[str], bool]]: Name, dependencies and whether the stage is
+            up to date, for each stage in dependency order.
+        """
+        return [
+            (name, sorted(self.dependencies[name]), self.is_up_to_date(self.stages[name]))
+            for name in self.order
+        ]
+
+    def run(self) -> bool:
+        """Run all stages.
+
+        Returns:
+            bool: True if every stage ran or was up to date.
+        """
+        self.results = {}
+        self.timings = {}
+        started: Dict[str, float] = {}
+        running: Dict[Future, str] = {}
+        pending = list(self.order)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name in list(pending):
+                    statuses = [self.results.get(dependency) for dependency in self.dependencies[name]]
+                    if any(status in (STATUS_FAILED, STATUS_BLOCKED) for status in statuses):
+                        self.logger.error("✗ Stage %s blocked by a failed dependency", name)
+                        self.results[name] = STATUS_BLOCKED
+                        pending.remove(name)
+                    elif all(status in (STATUS_DONE, STATUS_SKIPPED) for status in statuses):
+                        started[name] = time.perf_counter()
+                        running[executor.submit(self._run_stage, self.stages[name])] = name
+                        pending.remove(name)
+
+                if not running:
+                    continue
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    self.timings[name] = time.perf_counter() - started[name]
+                    try:
+                        self.results[name] = future.result()
+                        self.logger.info("✓ Stage %s %s in %.1fs",
+                                         name, self.results[name], self.timings[name])
+                    except Exception as e:
+                        self.results[name] = STATUS_FAILED
+                        self.logger.error("✗ Stage %s failed after %.1fs: %s",
+                                          name, self.timings[name], str(e))
+
+        self.log_summary()
+        return all(status in (STATUS_DONE, STATUS_SKIPPED) for status in self.results.values())
+
+    def log_summary(self):
+        """Log the outcome and wall time of each stage."""
+        for name in self.order:
+            self.logger.info("Stage %-16s %-8s %6.1fs", name,
+                             self.results.get(name, '-'), self.timings.get(name, 0.0))
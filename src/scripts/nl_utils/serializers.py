@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+JSON serialization backends and optional zstd compression for stored files.
+"""
+import json
+import math
+from typing import Any, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Frame header of zstd-compressed data
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+# Suffix appended to the path of compressed file variants
+ZSTD_SUFFIX = '.zst'
+
+
+def replace_non_finite(content: Any) -> Any:
+    """Replace NaN and infinite floats with None.
+
+    Args:
+        content (Any): Decoded JSON content.
+
+    Returns:
+        Any: Copy of the content with non-finite floats replaced.
+    """
+    if isinstance(content, float):
+        return content if math.isfinite(content) else None
+    if isinstance(content, dict):
+        return {key: replace_non_finite(value) for key, value in content.items()}
+    if isinstance(content, (list, tuple)):
+        return [replace_non_finite(value) for value in content]
+    return content
+
+
+def available_backends() -> List[str]:
+    """Get the JSON backends that can be used in this environment.
+
+    Returns:
+        List[str]: Backend names, fastest first.
+    """
+    backends = []
+    if orjson is not None:
+        backends.append('orjson')
+    if msgspec is not None:
+        backends.append('msgspec')
+    backends.append('json')
+    return backends
+
+
+def zstd_available() -> bool:
+    """Check whether zstd compression is available.
+
+    Returns:
+        bool: True if the zstandard package is installed.
+    """
+    return zstandard is not None
+
+
+def is_zstd(data: bytes) -> bool:
+    """Check whether data is zstd-compressed.
+
+    Args:
+        data (bytes): Raw file content.
+
+    Returns:
+        bool: True if the data starts with a zstd frame header.
+    """
+    return data[:4] == ZSTD_MAGIC
+
+
+def compress(data: bytes, level: int = 3) -> bytes:
+    """Compress data with zstd.
+
+    Args:
+        data (bytes): Data to compress.
+        level (int): Compression level.
+
+    Returns:
+        bytes: Compressed data.
+
+    Raises:
+        RuntimeError: If the zstandard package is not installed.
+    """
+    if zstandard is None:
+        raise RuntimeError("zstd compression requires the zstandard package")
+    return zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def decompress(data: bytes) -> bytes:
+    """Decompress zstd-compressed data.
+
+    Args:
+        data (bytes): Compressed data.
+
+    Returns:
+        bytes: Decompressed data.
+
+    Raises:
+        RuntimeError: If the zstandard package is not installed.
+    """
+    if zstandard is None:
+        raise RuntimeError("Reading zstd-compressed files requires the zstandard package")
+    return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+
+
+class JSONSerializer:
+    """Encodes and decodes JSON with the fastest available backend.
+
+    orjson and msgspec are used when installed and fall back to the standard
+    library for output they cannot produce, such as ASCII-escaped text, an
+    indent other than 2 (orjson) or unsupported types, so the output is
+    always the same JSON regardless of the backend.
+
+    NaN and infinite floats are written as null by every backend, as orjson
+    and msgspec do, so the output is always valid JSON. They load back as None.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        """Initialize the JSONSerializer.
+
+        Args:
+            backend (Optional[str]): 'orjson', 'msgspec' or 'json'. Defaults to the fastest
+                available backend.
+
+        Raises:
+            ValueError: If the backend is unknown or not installed.
+        """
+        backends = available_backends()
+        self.backend = backend or backends[0]
+        if self.backend not in backends:
+            raise ValueError(f"JSON backend not available: {self.backend}")
+
+    def dumps(self, content: Any, indent: Optional[int] = None,
+              ensure_ascii: bool = False) -> bytes:
+        """Encode content as UTF-8 JSON.
+
+        Args:
+            content (Any): Content to encode.
+            indent (Optional[int]): Number of spaces for indentation, None for compact output.
+            ensure_ascii (bool): Whether to escape non-ASCII characters.
+
+        Returns:
+            bytes: Encoded JSON, with NaN and infinite floats written as null.
+        """
+        if not ensure_ascii:
+            try:
+                if self.backend == 'orjson' and indent in (None, 2):
+                    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+                    if indent:
+                        option |= orjson.OPT_INDENT_2
+                    return orjson.dumps(content, option=option)
+                if self.backend == 'msgspec':
+                    data = msgspec.json.encode(content)
+                    return msgspec.json.format(data, indent=indent) if indent else data
+            except TypeError:
+                # Types the fast backends cannot encode, e.g. numpy scalars in msgspec
+                pass
+
+        separators = None if indent is not None else (',', ':')
+        try:
+            text = json.dumps(content, ensure_ascii=ensure_ascii, indent=indent,
+                              separators=separators, allow_nan=False)
+        except ValueError:
+            # Non-finite floats, which the standard library would write as invalid NaN tokens
+            text = json.dumps(replace_non_finite(content), ensure_ascii=ensure_ascii,
+                              indent=indent, separators=separators)
+        return text.encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """Decode JSON.
+
+        Args:
+            data (Union[bytes, str]): UTF-8 encoded JSON or text.
+
+        Returns:
+            Any: Decoded content.
+        """
+        if self.backend == 'orjson':
+            return orjson.loads(data)
+        if self.backend == 'msgspec':
+            return msgspec.json.decode(data)
+        return json.loads(data)
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Pipeline stage declaration.
+"""
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Union
+
+
+class Stage:
+    """A pipeline step with the files it reads and writes."""
+
+    def __init__(self, name: str, run: Callable[[], Any],
+                 inputs: Optional[List[Union[str, Path]]] = None,
+                 outputs: Optional[List[Union[str, Path]]] = None,
+                 after: Optional[List[str]] = None, config: Any = None,
+                 rows: Optional[Callable[[], int]] = None, cacheable: bool = True):
+        """Initialize the Stage.
+
+        Args:
+            name (str): Unique name of the stage.
+            run (Callable[[], Any]): Runs the stage, raising an exception on failure.
+            inputs (Optional[List[Union[str, Path]]]): Files the stage reads. A stage depends
+                on the stages that write them.
+            outputs (Optional[List[Union[str, Path]]]): Files the stage writes.
+            after (Optional[List[str]]): Stages that must finish first without sharing files.
+            config (Any): JSON-serializable settings that change the outputs. A change
+                makes the stage run again.
+            rows (Optional[Callable[[], int]]): Counts the records the stage produced,
+                called after it ran.
+            cacheable (bool): Whether the stage may be skipped when it is up to date.
+                Stages with external effects that must repeat, like reading a mailbox,
+                set this to False.
+        """
+        self.name = name
+        self.run = run
+        self.inputs = [Path(path) for path in inputs or []]
+        self.outputs = [Path(path) for path in outputs or []]
+        self.after = list(after or [])
+        self.config = config
+        self.rows = rows
+        self.cacheable = cacheable
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Per-date manifest of completed pipeline stages.
+"""
+import hashlib
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from .file_handler import FileHandler, FileType
+from .logger_config import get_logger, get_module_name
+
+
+class StageManifest:
+    """Records which pipeline stages completed for a date and what they wrote.
+
+    Each entry holds the content hash and size of every output file, a row
+    count and the stage's wall time. A stage counts as complete only while
+    all of its outputs still exist with the recorded hashes, so the
+    orchestrator can trust existing outputs and resume after the last good
+    stage instead of redoing it.
+    """
+
+    BASE_NAME = "manifest"
+
+    _lock = threading.Lock()
+
+    def __init__(self, date_str: str, params: Optional[Dict[str, Any]] = None):
+        """Initialize the StageManifest.
+
+        Args:
+            date_str (str): Date string in YYYY-MM-DD format.
+            params (Optional[Dict[str, Any]]): Parameters for the manifest.
+                May contain:
+                - context (PipelineContext): Context that hands stage outputs between stages.
+        """
+        params = params or {}
+        self.logger = get_logger(get_module_name(__name__))
+        self.file_handler = FileHandler({'context': params.get('context')})
+        self.date_str = date_str
+
+    @staticmethod
+    def file_hash(file_path: Union[str, Path]) -> str:
+        """Compute the content hash of a file.
+
+        Args:
+            file_path (Union[str, Path]): Path to the file.
+
+        Returns:
+            str: SHA-256 hex digest of the file content.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _stored_path(self, file_path: Union[str, Path]) -> Optional[Path]:
+        """Find the stored variant of an output file.
+
+        Args:
+            file_path (Union[str, Path]): Path returned when the output was saved.
+
+        Returns:
+            Optional[Path]: The file or its compressed variant, None if neither exists.
+        """
+        return self.file_handler._find_existing(Path(file_path))
+
+    def load(self) -> Dict[str, Dict[str, Any]]:
+        """Load the manifest.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Entries keyed by stage name, empty if there is none.
+        """
+        if not self.file_handler.file_exists(
+                FileType.STAGE_MANIFEST, date_str=self.date_str, base_name=self.BASE_NAME):
+            return {}
+        try:
+            return self.file_handler.load_file(
+                FileType.STAGE_MANIFEST, date_str=self.date_str, base_name=self.BASE_NAME)
+        except Exception as e:
+            self.logger.warning("Could not load stage manifest: %s", str(e))
+            return {}
+
+    def get(self, stage: str) -> Optional[Dict[str, Any]]:
+        """Get the entry of a stage.
+
+        Args:
+            stage (str): Name of the stage.
+
+        Returns:
+            Optional[Dict[str, Any]]: The stage's entry, or None if it has not completed.
+        """
+        return self.load().get(stage)
+
+    def record(self, stage: str, outputs: List[Union[str, Path]], duration: float,
+               rows: Optional[int] = None, **details: Any) -> Dict[str, Any]:
+        """Record that a stage completed.
+
+        Call this only after the stage's outputs have been written.
+
+        Args:
+            stage (str): Name of the stage.
+            outputs (List[Union[str, Path]]): Paths of the files the stage wrote.
+            duration (float): Wall time of the stage in seconds.
+            rows (Optional[int]): Number of records the stage produced.
+            **details: Other values to store with the entry.
+
+        Returns:
+            Dict[str, Any]: The recorded entry.
+
+        Raises:
+            FileNotFoundError: If an output does not exist.
+        """
+        files = {}
+        for output in outputs:
+            stored_path = self._stored_path(output)
+            if stored_path is None:
+                raise FileNotFoundError(f"Output of stage {stage} not found: {output}")
+            files[str(output)] = {
+                'sha256': self.file_hash(stored_path),
+                'size': stored_path.stat().st_size
+            }
+
+        entry = {
+            'outputs': files,
+            'rows': rows,
+            'duration': round(duration, 3),
+            'completed_at': datetime.now().isoformat(timespec='seconds'),
+            **details
+        }
+        with self._lock:
+            manifest = self.load()
+            manifest[stage] = entry
+            self.file_handler.save_file(
+                manifest, FileType.STAGE_MANIFEST, date_str=self.date_str,
+                base_name=self.BASE_NAME, indent=2)
+
+        self.logger.info(
+            "Recorded stage %s for %s: %s rows in %.1fs", stage, self.date_str, rows, duration)
+        return entry
+
+    def is_complete(self, stage: str) -> bool:
+        """Check whether a stage completed and its outputs are unchanged.
+
+        Args:
+            stage (str): Name of the stage.
+
+        Returns:
+            bool: True if the stage is recorded and every output matches its hash.
+        """
+        entry = self.get(stage)
+        if not entry:
+            return False
+        for output, recorded in entry.get('outputs', {}).items():
+            stored_path = self._stored_path(output)
+            if stored_path is None:
+                self.logger.info("Output of stage %s is missing: %s", stage, output)
+                return False
+            if (stored_path.stat().st_size != recorded.get('size')
+                    or self.file_hash(stored_path) != recorded.get('sha256')):
+                self.logger.info("Output of stage %s changed: %s", stage, output)
+                return False
+        return True
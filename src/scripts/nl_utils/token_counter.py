@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Token accounting shared by the prompt and generation stages.
+"""
+import math
+from functools import lru_cache
+from typing import Any, Optional
+
+import tiktoken
+
+from .logger_config import get_logger, get_module_name
+
+# Average characters per token for Icelandic news text, used by the approximate mode
+APPROX_CHARS_PER_TOKEN = 3.2
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: str = "gpt-4") -> Optional[Any]:
+    """Get the tiktoken encoding of a model, loaded once per process.
+
+    Args:
+        model (str): Model whose encoding to load.
+
+    Returns:
+        Optional[Any]: The encoding, or None if it cannot be loaded (e.g. offline).
+    """
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        get_logger(get_module_name(__name__)).warning(
+            "Could not load tiktoken encoding for %s, using approximate counts: %s",
+            model, str(e))
+        return None
+
+
+def approximate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text from its length.
+
+    Args:
+        text (str): The text to estimate tokens for.
+
+    Returns:
+        int: Approximate number of tokens.
+    """
+    return math.ceil(len(text) / APPROX_CHARS_PER_TOKEN)
+
+
+def count_tokens(text: str, model: str = "gpt-4", approximate: bool = False) -> int:
+    """Count the tokens in a text.
+
+    Args:
+        text (str): The text to count tokens for.
+        model (str): Model whose encoding to use.
+        approximate (bool): Whether to estimate from the text length instead of encoding.
+
+    Returns:
+        int: Number of tokens.
+    """
+    encoding = None if approximate else get_encoding(model)
+    if encoding is None:
+        return approximate_tokens(text)
+    return len(encoding.encode(text))
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str = "gpt-4", suffix: str = " [...]") -> str:
+    """Truncate a text to a maximum number of tokens.
+
+    Texts whose UTF-8 length is within the limit are returned without encoding,
+    since no token is shorter than one byte.
+
+    Args:
+        text (str): The text to truncate.
+        max_tokens (int): Maximum number of tokens to keep.
+        model (str): Model whose encoding to use.
+        suffix (str): Marker appended to truncated texts.
+
+    Returns:
+        str: The text, cut at max_tokens if it is longer.
+    """
+    if len(text.encode('utf-8')) <= max_tokens:
+        return text
+
+    encoding = get_encoding(model)
+    if encoding is None:
+        max_chars = int(max_tokens * APPROX_CHARS_PER_TOKEN)
+        return text if len(text) <= max_chars else text[:max_chars] + suffix
+
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens]) + suffix
+
+
+class TokenCounter:
+    """Running token count for text that is built up piece by piece.
+
+    Each piece is counted once when it is added, so a prompt builder can
+    check its budget while appending instead of re-encoding the whole prompt.
+    """
+
+    def __init__(self, budget: Optional[int] = None, model: str = "gpt-4", approximate: bool = False):
+        """Initialize the TokenCounter.
+
+        Args:
+            budget (Optional[int]): Maximum number of tokens, None for no limit.
+            model (str): Model whose encoding to use.
+            approximate (bool): Whether to estimate from text length instead of encoding.
+        """
+        self.budget = budget
+        self.model = model
+        self.approximate = approximate
+        self.total = 0
+
+    def count(self, text: str) -> int:
+        """Count the tokens in a text without adding them.
+
+        Args:
+            text (str): The text to count tokens for.
+
+        Returns:
+            int: Number of tokens.
+        """
+        return count_tokens(text, self.model, self.approximate)
+
+    def fits(self, tokens: int) -> bool:
+        """Check whether a number of tokens fits in the remaining budget.
+
+        Args:
+            tokens (int): Number of tokens to add.
+
+        Returns:
+            bool: True if there is no budget or the tokens fit in it.
+        """
+        return not self.budget or self.total + tokens <= self.budget
+
+    def add(self, text: str) -> int:
+        """Add a text to the running count.
+
+        Args:
+            text (str): The text to add.
+
+        Returns:
+            int: Number of tokens in the text.
+        """
+        tokens = self.count(text)
+        self.total += tokens
+        return tokens
+
+    def try_add(self, text: str) -> bool:
+        """Add a text to the running count if it fits in the budget.
+
+        Args:
+            text (str): The text to add.
+
+        Returns:
+            bool: True if the text fit and was added.
+        """
+        tokens = self.count(text)
+        if not self.fits(tokens):
+            return False
+        self.total += tokens
+        return True
@@ -0,0 +1,21 @@
+"""
+Shared pytest fixtures.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src' / 'scripts'))
+
+from nl_utils.file_handler import FileHandler  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    """Run each test in an empty directory, as outputs are written relative to it."""
+    monkeypatch.chdir(tmp_path)
+    # Cached paths are relative, so entries of other tests must not be served
+    FileHandler.clear_read_cache()
+    yield tmp_path
+    FileHandler.clear_read_cache()
@@ -0,0 +1,49 @@
+"""
+Tests for the article index.
+"""
+from nl_utils.article_index import ArticleIndex
+from nl_utils.file_handler import FileHandler, FileType
+from nl_utils.pipeline_context import PipelineContext
+
+DATE = '2026-01-01'
+
+
+def save_articles(file_handler, articles):
+    file_handler.save_file(articles, FileType.ARTICLES, date_str=DATE, base_name='articles')
+
+
+def test_indexes_do_not_share_articles():
+    save_articles(FileHandler(), [{'article_id': '1', 'article_title': 'Frétt'}])
+
+    first = ArticleIndex.for_date(DATE)
+    first.get('1')['article_title'] = 'Changed'
+
+    assert ArticleIndex.for_date(DATE).get('1')['article_title'] == 'Frétt'
+
+
+def test_rewritten_articles_file_is_reloaded():
+    file_handler = FileHandler()
+    save_articles(file_handler, [{'article_id': '1'}])
+    assert '1' in ArticleIndex.for_date(DATE)
+
+    save_articles(file_handler, [{'article_id': '2'}])
+    index = ArticleIndex.for_date(DATE)
+
+    assert '2' in index and '1' not in index
+    assert len(index) == 1
+
+
+def test_articles_held_in_context_are_found():
+    with PipelineContext() as context:
+        file_handler = FileHandler({'context': context})
+        save_articles(file_handler, [{'article_id': '1'}])
+
+        assert ArticleIndex.for_date(DATE, file_handler=file_handler).get('1') == {
+            'article_id': '1'}
+
+
+def test_given_articles_are_indexed():
+    index = ArticleIndex.for_date(DATE, [{'article_id': '1'}, {'article_id': '2'}])
+
+    assert [article['article_id'] for article in index] == ['1', '2']
+    assert index.get('3') is None
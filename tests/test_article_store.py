@@ -0,0 +1,133 @@
+"""
+Tests for the Parquet article store and FileHandler.query_articles.
+"""
+import os
+
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from nl_utils.article_store import ArticleStore  # noqa: E402
+from nl_utils.file_handler import FileHandler, FileType  # noqa: E402
+
+
+def article(article_id, source, title='Frétt'):
+    return {
+        'article_id': article_id,
+        'article_source': source,
+        'article_title': title,
+        'article_url': f'https://example.is/{article_id}',
+        'article_date': '2026-01-01',
+        'article_description': 'Lýsing',
+        'article_text': 'Texti greinarinnar',
+        'article_lemmas': ['texti', 'grein']
+    }
+
+
+DAYS = {
+    '2026-01-01': [article('1', 'visir'), article('2', 'mbl'), article('3', 'visir')],
+    '2026-01-02': [article('4', 'ruv'), article('5', 'mbl')],
+    '2026-01-03': [article('6', 'visir')]
+}
+
+
+def save_days(days=DAYS):
+    file_handler = FileHandler()
+    for date_str, articles in days.items():
+        file_handler.save_file(articles, FileType.ARTICLES, date_str=date_str,
+                               base_name=ArticleStore.BASE_NAME)
+    return file_handler
+
+
+def ids(rows):
+    return sorted(row['article_id'] for row in rows)
+
+
+def test_write_day_round_trip():
+    store = ArticleStore()
+
+    store.write_day('2026-01-01', DAYS['2026-01-01'])
+
+    rows = store.query(sync=False).to_pylist()
+    assert store.dates() == ['2026-01-01']
+    assert {row['article_id']: row for row in rows} == {
+        item['article_id']: {**item, 'date': '2026-01-01'} for item in DAYS['2026-01-01']
+    }
+
+
+def test_write_day_stores_one_row_group_per_source():
+    import pyarrow.parquet as pq
+
+    store = ArticleStore()
+    store.write_day('2026-01-01', DAYS['2026-01-01'])
+    path = store.file_handler.get_file_path(
+        FileType.ARTICLE_STORE, date_str='2026-01-01', base_name=ArticleStore.BASE_NAME)
+
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_row_groups == 2
+    assert [metadata.row_group(i).num_rows for i in range(2)] == [1, 2]
+
+
+def test_sync_partitions_by_date_and_skips_current_days():
+    save_days()
+    store = ArticleStore()
+
+    assert store.sync() == list(DAYS)
+    assert store.dates() == list(DAYS)
+    assert store.sync() == []
+
+
+def test_sync_rebuilds_days_with_a_newer_json_file():
+    file_handler = save_days()
+    store = ArticleStore()
+    store.sync()
+
+    path = file_handler.save_file(DAYS['2026-01-02'] + [article('7', 'vb')], FileType.ARTICLES,
+                                  date_str='2026-01-02', base_name=ArticleStore.BASE_NAME)
+    later = path.stat().st_mtime + 10
+    os.utime(path, (later, later))
+
+    assert store.sync() == ['2026-01-02']
+    assert ids(store.query(start_date='2026-01-02', end_date='2026-01-02').to_pylist()) == [
+        '4', '5', '7']
+
+
+def test_query_filters_dates_and_sources():
+    save_days()
+    store = ArticleStore()
+
+    assert ids(store.query().to_pylist()) == ['1', '2', '3', '4', '5', '6']
+    assert ids(store.query(start_date='2026-01-02').to_pylist()) == ['4', '5', '6']
+    assert ids(store.query(end_date='2026-01-01').to_pylist()) == ['1', '2', '3']
+    assert ids(store.query(sources=['visir']).to_pylist()) == ['1', '3', '6']
+    assert ids(store.query(start_date='2026-01-02', end_date='2026-01-02',
+                           sources=['mbl']).to_pylist()) == ['5']
+
+
+def test_query_reads_only_the_requested_columns():
+    save_days()
+
+    table = ArticleStore().query(columns=['article_id', 'date'], sources=['ruv'])
+
+    assert table.column_names == ['article_id', 'date']
+    assert table.to_pylist() == [{'article_id': '4', 'date': '2026-01-02'}]
+
+
+def test_query_without_stored_days_is_empty():
+    table = ArticleStore().query(columns=['article_id'])
+
+    assert table.num_rows == 0
+    assert table.column_names == ['article_id']
+
+
+def test_file_handler_query_articles():
+    file_handler = save_days()
+
+    rows = file_handler.query_articles(columns=['article_id', 'article_lemmas'],
+                                       start_date='2026-01-01', end_date='2026-01-02',
+                                       sources=['mbl'])
+
+    assert sorted(rows, key=lambda row: row['article_id']) == [
+        {'article_id': '2', 'article_lemmas': ['texti', 'grein']},
+        {'article_id': '5', 'article_lemmas': ['texti', 'grein']}
+    ]
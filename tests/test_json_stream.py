@@ -0,0 +1,67 @@
+"""
+Tests for the incremental JSON object parser.
+"""
+import json
+
+import pytest
+
+from nl_utils.json_stream import IncrementalJSONObjectParser
+
+
+def feed_all(parser, chunks):
+    members = []
+    for chunk in chunks:
+        members.extend(parser.feed(chunk))
+    return members
+
+
+def test_members_are_yielded_as_they_complete():
+    parser = IncrementalJSONObjectParser()
+
+    assert list(parser.feed('{"a": [1, 2')) == []
+    assert list(parser.feed('], "b"')) == [('a', [1, 2])]
+    assert list(parser.feed(': {"c": 3}}')) == [('b', {'c': 3})]
+    assert parser.finished
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 1000])
+def test_any_chunking_gives_the_whole_object(chunk_size):
+    content = {
+        'domestic': [{'title': 'Frétt, með kommu', 'ids': [1, 2]}],
+        'quote': 'She said "hi}" and left \\ {',
+        'empty': {},
+        'number': 1.5
+    }
+    text = json.dumps(content, ensure_ascii=False, indent=2)
+    parser = IncrementalJSONObjectParser()
+
+    members = feed_all(parser, [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)])
+
+    assert dict(members) == content
+    assert [key for key, _ in members] == list(content)
+    assert parser.get_text() == text
+    assert parser.finished
+
+
+def test_empty_object():
+    parser = IncrementalJSONObjectParser()
+
+    assert feed_all(parser, ['{', ' }']) == []
+    assert parser.finished
+
+
+def test_unfinished_object_is_not_finished():
+    parser = IncrementalJSONObjectParser()
+
+    assert feed_all(parser, ['{"a": 1, "b": [']) == [('a', 1)]
+    assert not parser.finished
+
+
+def test_non_object_is_rejected():
+    with pytest.raises(ValueError):
+        feed_all(IncrementalJSONObjectParser(), ['[1, 2]'])
+
+
+def test_invalid_member_is_rejected():
+    with pytest.raises(ValueError):
+        feed_all(IncrementalJSONObjectParser(), ['{"a": tru, "b": 1}'])
@@ -0,0 +1,287 @@
+"""
+Tests for the pipeline runner.
+"""
+import threading
+from pathlib import Path
+
+import pytest
+
+from nl_utils.file_handler import FileHandler, FileType
+from nl_utils.pipeline_context import PipelineContext
+from nl_utils.pipeline_runner import (
+    STATUS_BLOCKED, STATUS_DONE, STATUS_FAILED, STATUS_SKIPPED, PipelineRunner, select_stages)
+from nl_utils.stage import Stage
+from nl_utils.stage_manifest import StageManifest
+
+DATE = '2026-01-01'
+
+
+class Pipeline:
+    """Three chained stages writing JSON files, plus an independent one."""
+
+    def __init__(self, context=None):
+        self.file_handler = FileHandler({'context': context})
+        self.runs = []
+        self.fail = set()
+        self.source = [1, 2, 3]
+        self.paths = {
+            name: self.file_handler.get_file_path(FileType.JSON, base_name=name)
+            for name in ('raw', 'groups', 'newsletter', 'other')
+        }
+
+    def step(self, name, input_name=None):
+        def run():
+            self.runs.append(name)
+            if name in self.fail:
+                raise RuntimeError(f"{name} failed")
+            content = (self.file_handler.load_file(FileType.JSON, base_name=input_name)
+                       if input_name else self.source)
+            self.file_handler.save_file({'from': content}, FileType.JSON, base_name=name)
+        return run
+
+    def stages(self):
+        return [
+            # Declared out of order, dependencies come from the files
+            Stage('newsletter', self.step('newsletter', 'groups'),
+                  inputs=[self.paths['groups']], outputs=[self.paths['newsletter']]),
+            Stage('groups', self.step('groups', 'raw'),
+                  inputs=[self.paths['raw']], outputs=[self.paths['groups']]),
+            Stage('raw', self.step('raw'), outputs=[self.paths['raw']]),
+            Stage('other', self.step('other'), outputs=[self.paths['other']])
+        ]
+
+    def run(self, force=(), context=None):
+        self.runs = []
+        runner = PipelineRunner(DATE, self.stages(), {'force': list(force), 'context': context})
+        succeeded = runner.run()
+        if context is not None:
+            context.flush()
+        return succeeded, runner.results
+
+
+def test_topological_order():
+    runner = PipelineRunner(DATE, Pipeline().stages())
+
+    order = runner.order
+    assert order.index('raw') < order.index('groups') < order.index('newsletter')
+    assert runner.dependencies == {
+        'newsletter': {'groups'}, 'groups': {'raw'}, 'raw': set(), 'other': set()}
+
+
+def test_explicit_dependencies_are_ordered():
+    stages = [Stage('b', lambda: None, after=['a']), Stage('a', lambda: None)]
+
+    assert PipelineRunner(DATE, stages).order == ['a', 'b']
+
+
+def test_cycle_is_rejected():
+    stages = [
+        Stage('a', lambda: None, inputs=['b.json'], outputs=['a.json']),
+        Stage('b', lambda: None, inputs=['a.json'], outputs=['b.json']),
+        Stage('c', lambda: None)
+    ]
+
+    with pytest.raises(ValueError, match="cycle"):
+        PipelineRunner(DATE, stages)
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(ValueError, match="unknown"):
+        PipelineRunner(DATE, [Stage('a', lambda: None, after=['b'])])
+
+
+def test_duplicate_names_are_rejected():
+    with pytest.raises(ValueError, match="unique"):
+        PipelineRunner(DATE, [Stage('a', lambda: None), Stage('a', lambda: None)])
+
+
+def test_select_only_and_skip():
+    stages = [Stage('a', lambda: None), Stage('b', lambda: None, after=['a']),
+              Stage('c', lambda: None, after=['a', 'b'])]
+
+    selected = select_stages(stages, only=['b', 'c'], skip=['b'])
+
+    assert [stage.name for stage in selected] == ['c']
+    assert selected[0].after == []
+    assert [stage.name for stage in select_stages(stages)] == ['a', 'b', 'c']
+
+
+def test_selected_stage_trusts_existing_inputs():
+    pipeline = Pipeline()
+    pipeline.run()
+
+    stages = select_stages(pipeline.stages(), only=['newsletter'])
+    pipeline.runs = []
+    assert PipelineRunner(DATE, stages, {'force': ['newsletter']}).run()
+
+    assert pipeline.runs == ['newsletter']
+
+
+def test_runs_dependencies_first():
+    pipeline = Pipeline()
+
+    succeeded, results = pipeline.run()
+
+    assert succeeded
+    assert set(results.values()) == {STATUS_DONE}
+    runs = pipeline.runs
+    assert runs.index('raw') < runs.index('groups') < runs.index('newsletter')
+
+
+def test_up_to_date_stages_are_skipped():
+    pipeline = Pipeline()
+    pipeline.run()
+
+    succeeded, results = pipeline.run()
+
+    assert succeeded
+    assert set(results.values()) == {STATUS_SKIPPED}
+    assert pipeline.runs == []
+
+
+def test_changed_input_reruns_dependents():
+    pipeline = Pipeline()
+    pipeline.run()
+
+    pipeline.source = [4, 5, 6]
+    pipeline.run(force=['raw'])
+
+    assert sorted(pipeline.runs) == ['groups', 'newsletter', 'raw']
+
+
+def test_changed_output_reruns_stage():
+    pipeline = Pipeline()
+    pipeline.run()
+
+    pipeline.paths['newsletter'].write_text('{"edited": true}', encoding='utf-8')
+    pipeline.run()
+
+    assert pipeline.runs == ['newsletter']
+
+
+def test_changed_config_reruns_stage():
+    pipeline = Pipeline()
+    stages = pipeline.stages()
+    PipelineRunner(DATE, stages).run()
+
+    stages[2].config = {'sources': ['mbl']}
+    pipeline.runs = []
+    PipelineRunner(DATE, stages).run()
+
+    assert sorted(pipeline.runs) == ['raw']
+
+
+def test_uncacheable_stage_always_runs():
+    runs = []
+    stages = [Stage('send', lambda: runs.append('send'), cacheable=False)]
+
+    PipelineRunner(DATE, stages).run()
+    PipelineRunner(DATE, stages).run()
+
+    assert runs == ['send', 'send']
+
+
+def test_sent_marker_keeps_sending_from_repeating():
+    pipeline = Pipeline()
+    file_handler = FileHandler()
+    sent_path = file_handler.get_file_path(
+        FileType.STAGE_MANIFEST, date_str=DATE, base_name='sent')
+    sends = []
+
+    def send():
+        sends.append(file_handler.load_file(FileType.JSON, base_name='newsletter'))
+        file_handler.save_file({'date': DATE}, FileType.STAGE_MANIFEST, date_str=DATE,
+                               base_name='sent')
+
+    def run(force=()):
+        stages = pipeline.stages() + [
+            Stage('sending', send, outputs=[sent_path], after=['newsletter'])]
+        return PipelineRunner(DATE, stages, {'force': list(force)}).run()
+
+    assert run()
+    assert len(sends) == 1
+
+    # Neither a re-run nor a regenerated newsletter sends it again
+    assert run()
+    pipeline.source = [4]
+    assert run(force=['raw'])
+    assert 'newsletter' in pipeline.runs
+    assert len(sends) == 1
+
+    assert run(force=['sending'])
+    assert len(sends) == 2
+
+
+def test_failure_blocks_dependents_and_resume_skips_good_stages():
+    pipeline = Pipeline()
+    pipeline.fail = {'groups'}
+
+    succeeded, results = pipeline.run()
+
+    assert not succeeded
+    assert results == {'raw': STATUS_DONE, 'groups': STATUS_FAILED,
+                       'newsletter': STATUS_BLOCKED, 'other': STATUS_DONE}
+
+    pipeline.fail = set()
+    succeeded, results = pipeline.run()
+
+    assert succeeded
+    assert sorted(pipeline.runs) == ['groups', 'newsletter']
+    assert results['raw'] == results['other'] == STATUS_SKIPPED
+
+
+def test_independent_stages_run_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    stages = [Stage('a', barrier.wait), Stage('b', barrier.wait)]
+
+    assert PipelineRunner(DATE, stages, {'max_workers': 2}).run()
+
+
+def test_plan_reports_up_to_date_stages():
+    pipeline = Pipeline()
+    pipeline.run()
+    pipeline.paths['groups'].unlink()
+    pipeline.runs = []
+
+    plan = {name: up_to_date for name, _, up_to_date in
+            PipelineRunner(DATE, pipeline.stages()).plan()}
+
+    assert plan == {'raw': True, 'other': True, 'groups': False, 'newsletter': False}
+    assert pipeline.runs == []
+
+
+def test_context_outputs_are_recorded_and_skipped():
+    with PipelineContext({'file_types': [FileType.JSON]}) as context:
+        pipeline = Pipeline(context)
+        assert pipeline.run(context=context)[0]
+        assert pipeline.run(context=context)[1] == {
+            name: STATUS_SKIPPED for name in ('raw', 'groups', 'newsletter', 'other')}
+
+    assert FileHandler().load_file(FileType.JSON, base_name='newsletter') == {
+        'from': {'from': {'from': [1, 2, 3]}}}
+
+
+def test_failed_input_write_does_not_skip_or_record(monkeypatch):
+    with PipelineContext({'file_types': [FileType.JSON]}) as context:
+        pipeline = Pipeline(context)
+        pipeline.run(context=context)
+
+        # Writing 'raw' fails, so groups cannot be checked against it
+        def fail(data, file_path, *args):
+            if Path(file_path).name == pipeline.paths['raw'].name:
+                raise OSError("disk full")
+            return original(data, file_path, *args)
+        original = pipeline.file_handler._write_file
+        monkeypatch.setattr(pipeline.file_handler, '_write_file', fail)
+
+        recorded = StageManifest(DATE).get('groups')
+        runner = PipelineRunner(DATE, pipeline.stages(),
+                                {'force': ['raw'], 'context': context})
+        runner.run()
+        context.flush(raise_errors=False)
+
+        assert runner.results['groups'] == STATUS_DONE
+        assert runner.results['other'] == STATUS_SKIPPED
+        assert runner.manifest.get('groups') == recorded
+        assert [path.name for path, _ in context.errors] == [pipeline.paths['raw'].name]
+        context.errors.clear()
@@ -0,0 +1,89 @@
+"""
+Tests for the FileHandler read cache.
+"""
+import json
+import os
+
+import pytest
+
+from nl_utils.file_handler import FileHandler, FileType
+
+DATE = '2026-01-01'
+
+
+@pytest.fixture
+def file_handler():
+    return FileHandler()
+
+
+def load(file_handler):
+    return file_handler.load_file(FileType.ARTICLES, date_str=DATE, base_name='articles')
+
+
+def write_behind_cache(path, content, mtime_ns):
+    """Change a file without going through the FileHandler."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(content, f)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_hits_are_independent_copies(file_handler):
+    file_handler.save_file([{'article_id': '1'}], FileType.ARTICLES,
+                           date_str=DATE, base_name='articles')
+
+    first = load(file_handler)
+    first[0]['article_id'] = 'changed'
+    first.append({'article_id': '2'})
+
+    assert load(file_handler) == [{'article_id': '1'}]
+    assert load(file_handler) is not load(file_handler)
+
+
+def test_changed_modification_time_invalidates(file_handler):
+    path = file_handler.get_file_path(FileType.ARTICLES, date_str=DATE, base_name='articles')
+    path.parent.mkdir(parents=True)
+    mtime_ns = 1_700_000_000 * 10**9
+    write_behind_cache(path, [{'article_id': '1'}], mtime_ns)
+    assert load(file_handler) == [{'article_id': '1'}]
+
+    # Same size, so only the modification time tells the contents apart
+    write_behind_cache(path, [{'article_id': '2'}], mtime_ns)
+    assert load(file_handler) == [{'article_id': '1'}]
+
+    write_behind_cache(path, [{'article_id': '2'}], mtime_ns + 1_000_000_000)
+    assert load(file_handler) == [{'article_id': '2'}]
+
+
+def test_changed_size_invalidates(file_handler):
+    path = file_handler.save_file([{'article_id': '1'}], FileType.ARTICLES,
+                                  date_str=DATE, base_name='articles')
+    mtime_ns = path.stat().st_mtime_ns
+    load(file_handler)
+
+    write_behind_cache(path, [{'article_id': '1'}, {'article_id': '2'}], mtime_ns)
+    assert len(load(file_handler)) == 2
+
+
+def test_save_invalidates(file_handler):
+    file_handler.save_file([{'article_id': '1'}], FileType.ARTICLES,
+                           date_str=DATE, base_name='articles')
+    load(file_handler)
+
+    file_handler.save_file([{'article_id': '2'}], FileType.ARTICLES,
+                           date_str=DATE, base_name='articles')
+    assert load(file_handler) == [{'article_id': '2'}]
+
+
+def test_files_over_budget_are_evicted(file_handler, monkeypatch):
+    paths = [
+        file_handler.save_file([{'article_id': str(day)}], FileType.ARTICLES,
+                               date_str=f'2026-01-0{day}', base_name='articles')
+        for day in (1, 2)
+    ]
+    monkeypatch.setattr(FileHandler, 'read_cache_max_bytes', paths[0].stat().st_size)
+
+    for day in (1, 2):
+        file_handler.load_file(FileType.ARTICLES, date_str=f'2026-01-0{day}',
+                               base_name='articles')
+
+    assert list(FileHandler._read_cache) == [paths[1]]
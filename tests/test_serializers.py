@@ -0,0 +1,116 @@
+"""
+Tests for the JSON serializers and the files FileHandler writes with them.
+"""
+import json
+
+import pytest
+
+from nl_utils.file_handler import FileHandler, FileType
+from nl_utils.serializers import JSONSerializer, available_backends, zstd_available
+
+CONTENT = {
+    'groups': [
+        {'group_id': 1, 'details': {'group_name': 'Ísland á HM', 'score': 0.25}},
+        {'group_id': 2, 'details': {'group_name': 'Quote "and" \\ slash', 'tags': []}}
+    ],
+    'empty': {},
+    'flag': True,
+    'missing': None
+}
+
+DATE = '2026-01-01'
+
+
+@pytest.mark.parametrize('backend', available_backends())
+@pytest.mark.parametrize('indent', [None, 2, 4])
+@pytest.mark.parametrize('ensure_ascii', [False, True])
+def test_round_trip(backend, indent, ensure_ascii):
+    serializer = JSONSerializer(backend)
+
+    data = serializer.dumps(CONTENT, indent=indent, ensure_ascii=ensure_ascii)
+
+    assert isinstance(data, bytes)
+    assert serializer.loads(data) == CONTENT
+    assert serializer.loads(data.decode('utf-8')) == CONTENT
+
+
+@pytest.mark.parametrize('backend', available_backends())
+@pytest.mark.parametrize('indent', [None, 2])
+def test_backends_write_the_same_json(backend, indent):
+    separators = None if indent is not None else (',', ':')
+    expected = json.dumps(CONTENT, ensure_ascii=False, indent=indent, separators=separators)
+
+    assert JSONSerializer(backend).dumps(CONTENT, indent=indent).decode('utf-8') == expected
+
+
+@pytest.mark.parametrize('backend', available_backends())
+@pytest.mark.parametrize('indent', [None, 2, 4])
+@pytest.mark.parametrize('ensure_ascii', [False, True])
+def test_non_finite_floats_are_written_as_null(backend, indent, ensure_ascii):
+    content = {'score': float('nan'), 'bounds': [float('-inf'), 0.5, float('inf')]}
+
+    data = JSONSerializer(backend).dumps(content, indent=indent, ensure_ascii=ensure_ascii)
+
+    def reject(token):
+        raise AssertionError(f"Invalid JSON token written: {token}")
+
+    expected = {'score': None, 'bounds': [None, 0.5, None]}
+    assert json.loads(data, parse_constant=reject) == expected
+    assert JSONSerializer(backend).loads(data) == expected
+
+
+def test_ensure_ascii_escapes_non_ascii():
+    data = JSONSerializer().dumps({'name': 'Ísland'}, ensure_ascii=True)
+
+    assert data == b'{"name":"\\u00cdsland"}'
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        JSONSerializer('yaml')
+
+
+def test_saved_outputs_are_indented():
+    file_handler = FileHandler()
+
+    path = file_handler.save_file(CONTENT, FileType.ARTICLE_GROUPS,
+                                  date_str=DATE, base_name='article_groups')
+
+    assert path.read_text(encoding='utf-8') == json.dumps(CONTENT, ensure_ascii=False, indent=2)
+    assert file_handler.load_file(FileType.ARTICLE_GROUPS, date_str=DATE,
+                                  base_name='article_groups') == CONTENT
+
+
+def test_compact_save_round_trip():
+    file_handler = FileHandler()
+
+    path = file_handler.save_file(CONTENT, FileType.JSON, base_name='cache', indent=None)
+
+    assert b'\n' not in path.read_bytes()
+    assert file_handler.load_file(FileType.JSON, base_name='cache') == CONTENT
+
+
+@pytest.mark.skipif(not zstd_available(), reason="zstandard is not installed")
+def test_compressed_save_round_trip():
+    file_handler = FileHandler()
+
+    path = file_handler.save_file(CONTENT, FileType.JSON, base_name='cache', compressed=True)
+    compressed_path = path.with_name(path.name + '.zst')
+
+    assert compressed_path.exists() and not path.exists()
+    assert file_handler.file_exists(FileType.JSON, base_name='cache')
+    assert file_handler.load_file(FileType.JSON, base_name='cache') == CONTENT
+
+    # Saving the plain variant removes the compressed one
+    file_handler.save_file(CONTENT, FileType.JSON, base_name='cache', compressed=False)
+    assert path.exists() and not compressed_path.exists()
+
+
+def test_export_json():
+    file_handler = FileHandler()
+    file_handler.save_file(CONTENT, FileType.JSON, base_name='cache', indent=None)
+
+    output_path = file_handler.export_json(FileType.JSON, base_name='cache')
+
+    assert output_path.name == 'cache.pretty.json'
+    assert json.loads(output_path.read_text(encoding='utf-8')) == CONTENT
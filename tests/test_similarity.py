@@ -0,0 +1,40 @@
+"""
+Tests for sharing fitted similarity models between stages.
+"""
+import pytest
+
+# The strategies package also imports the BERT strategy
+pytest.importorskip('sentence_transformers')
+
+from nl_article_processor.similarity_strategies import LSASimilarity  # noqa: E402
+
+ARTICLES = [
+    {'article_id': 'a', 'article_lemmas': ['ríkisstjórn', 'fundur']},
+    {'article_id': 'b', 'article_lemmas': ['eldgos', 'reykjanes']},
+    {'article_id': 'a', 'article_lemmas': ['ríkisstjórn', 'fundur']}
+]
+
+
+def test_corpus_has_one_document_per_article():
+    assert LSASimilarity.build_corpus(ARTICLES) == ['ríkisstjórn fundur', 'eldgos reykjanes']
+
+
+def test_stages_share_the_corpus_hash():
+    # The article group stage passes its params dict, the Matcher the defaults
+    grouping = LSASimilarity(params={'n_components': 80, 'random_state': 42,
+                                     'metrics_params': {'sample_size': 10}})
+    matching = LSASimilarity(params=dict(LSASimilarity.DEFAULT_PARAMS))
+    implicit = LSASimilarity(params={})
+    for strategy in (grouping, matching, implicit):
+        strategy.set_corpus(LSASimilarity.build_corpus(ARTICLES))
+
+    assert grouping.get_corpus_hash() == matching.get_corpus_hash() == implicit.get_corpus_hash()
+
+
+def test_model_parameters_change_the_hash():
+    first = LSASimilarity(params={'n_components': 80})
+    second = LSASimilarity(params={'n_components': 40})
+    for strategy in (first, second):
+        strategy.set_corpus(LSASimilarity.build_corpus(ARTICLES))
+
+    assert first.get_corpus_hash() != second.get_corpus_hash()
@@ -0,0 +1,102 @@
+"""
+Tests for the stage manifest and atomic file writes.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from nl_utils.file_handler import atomic_path
+from nl_utils.stage_manifest import StageManifest
+
+DATE = '2026-01-01'
+
+
+@pytest.fixture
+def output(workdir):
+    path = Path('out') / 'articles.json'
+    path.parent.mkdir()
+    path.write_text('[1, 2, 3]', encoding='utf-8')
+    return path
+
+
+def test_recorded_stage_is_complete(output):
+    manifest = StageManifest(DATE)
+
+    entry = manifest.record('scraping', [output], 1.23456, rows=3, inputs_hash='abc')
+
+    assert entry['rows'] == 3
+    assert entry['duration'] == 1.235
+    assert entry['outputs'][str(output)] == {
+        'sha256': StageManifest.file_hash(output), 'size': output.stat().st_size}
+    assert StageManifest(DATE).get('scraping')['inputs_hash'] == 'abc'
+    assert StageManifest(DATE).is_complete('scraping')
+
+
+def test_unrecorded_stage_is_not_complete():
+    assert StageManifest(DATE).get('scraping') is None
+    assert not StageManifest(DATE).is_complete('scraping')
+
+
+def test_changed_output_is_not_complete(output):
+    manifest = StageManifest(DATE)
+    manifest.record('scraping', [output], 1.0)
+
+    # Same size, different content
+    output.write_text('[1, 2, 4]', encoding='utf-8')
+
+    assert not manifest.is_complete('scraping')
+
+
+def test_missing_output_is_not_complete(output):
+    manifest = StageManifest(DATE)
+    manifest.record('scraping', [output], 1.0)
+
+    output.unlink()
+
+    assert not manifest.is_complete('scraping')
+
+
+def test_record_requires_outputs():
+    with pytest.raises(FileNotFoundError):
+        StageManifest(DATE).record('scraping', [Path('missing.json')], 1.0)
+
+
+def test_concurrent_records_are_all_kept(output):
+    stages = [f'stage_{i}' for i in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda stage: StageManifest(DATE).record(stage, [output], 1.0), stages))
+
+    assert sorted(StageManifest(DATE).load()) == stages
+
+
+def test_manifests_are_per_date(output):
+    StageManifest(DATE).record('scraping', [output], 1.0)
+
+    assert StageManifest('2026-01-02').get('scraping') is None
+
+
+def test_atomic_path_replaces_file(workdir):
+    path = workdir / 'nested' / 'file.txt'
+
+    with atomic_path(path) as temp_path:
+        assert temp_path != path and temp_path.parent == path.parent
+        temp_path.write_text('new', encoding='utf-8')
+        assert not path.exists()
+
+    assert path.read_text(encoding='utf-8') == 'new'
+    assert list(path.parent.iterdir()) == [path]
+
+
+def test_atomic_path_keeps_old_file_on_error(workdir):
+    path = workdir / 'file.txt'
+    path.write_text('old', encoding='utf-8')
+
+    with pytest.raises(RuntimeError):
+        with atomic_path(path) as temp_path:
+            temp_path.write_text('partial', encoding='utf-8')
+            raise RuntimeError("interrupted")
+
+    assert path.read_text(encoding='utf-8') == 'old'
+    assert list(workdir.iterdir()) == [path]